@@ -7,16 +7,25 @@ manipulating, propogating, and outputting molecular mechanics data.
 from mmlib import analyze
 from mmlib import constants
 from mmlib import energy
+from mmlib import energy_jax
+from mmlib import energy_jax_test
 from mmlib import energy_test
 from mmlib import fileio
 from mmlib import fileio_test
 from mmlib import geomcalc
 from mmlib import geomcalc_test
 from mmlib import gradient
+from mmlib import gradient_test
 from mmlib import molecule
+from mmlib import molecule_test
+from mmlib import nonbonded
+from mmlib import nonbonded_cuda
+from mmlib import nonbonded_cuda_test
+from mmlib import nonbonded_test
 from mmlib import optimize
 from mmlib import param
 from mmlib import param_test
 from mmlib import simulate
 from mmlib import test
 from mmlib import topology
+from mmlib import topology_test
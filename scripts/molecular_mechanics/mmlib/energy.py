@@ -6,8 +6,8 @@ components, and total energy member data for mmlib.molecule.Molecule
 objects.
 """
 
-import itertools
 import math
+import numpy
 
 from mmlib import constants as const
 from mmlib import geomcalc
@@ -141,125 +141,146 @@ def GetEKineticI(mass, vels):
   return 0.5 * const.KIN2KCAL * e_kin_i
 
 
-def GetEBonds(bonds):
-  """Update bond length values and compute bond energy of system.
-  
-  For all bonds in a molecule, update the distance between atoms ij, and add the
-      energy to the total molecular bond energy [kcal/mol].
+def GetEBonds(r_ij, r_eq, k_b):
+  """Calculate bond stretch energy of system.
   
   Args:
-    bonds (mmlib.molecule.Bond*): Array of Bond objects containing atomic
-        indices and molecular mechanics parameters.
+    r_ij (float*): Array of bond lengths [Angstrom].
+    r_eq (float*): Array of equilibrium bond lengths [Angstrom].
+    k_b (float*): Array of bond spring constants [kcal/(mol*A^2)].
 
   Returns:
     e_bonds (float): Bond energy [kcal/mol] of all bonds.
   """
-  e_bonds = 0.0
-  for bond in bonds:
-    bond.GetEnergy()
-    e_bonds += bond.energy
-  return e_bonds
+  return numpy.sum(GetEBond(r_ij, r_eq, k_b))
 
 
-def GetEAngles(angles):
-  """Update bond angle values and compute angle energy of system.
-  
-  For all angles in a molecule, update the angle between atoms ijk, and add the
-  energy to the total molecular angle energy [kcal/mol].
+def GetEAngles(a_ijk, a_eq, k_a):
+  """Calculate angle bend energy of system.
   
   Args:
-    angles (mmlib.molecule.Angle*): Array of Angle objects containing atomic
-        indices and molecular mechanics parameters.
+    a_ijk (float*): Array of bond angles [degrees].
+    a_eq (float*): Array of equilibrium bond angles [degrees].
+    k_a (float*): Array of angle spring constants [kcal/(mol*rad^2)].
 
   Returns:
     e_angles (float): Angle energy [kcal/mol] of all bond angles.
   """
-  e_angles = 0.0
-  for angle in angles:
-    angle.GetEnergy()
-    e_angles += angle.energy
-  return e_angles
+  return numpy.sum(GetEAngle(a_ijk, a_eq, k_a))
 
 
-def GetETorsions(torsions):
-  """Update torsion angle values and compute torsion energy of system.
-  
-  For all torsions in a molecule, update the torsion between atoms ijkl, and add
-  the energy to the total molecular torsion energy [kcal/mol].
+def GetETorsions(t_ijkl, v_n, gamma, nfold, paths):
+  """Calculate torsion strain energy of system.
   
   Args:
-    torsions (mmlib.molecule.Torsion*): Array of Torsion objects containing
-        atomic indices and molecular mechanics parameters.
+    t_ijkl (float*): Array of torsion angles [degrees].
+    v_n (float*): Array of torsion half-barrier heights [kcal/mol].
+    gamma (float*): Array of torsion barrier offsets [degrees].
+    nfold (float*): Array of torsion barrier frequencies.
+    paths (float*): Array of unique paths through torsions.
 
   Returns:
     e_torsions (float): Torsion energy [kcal/mol] of all torsion angles.
   """
-  e_torsions = 0.0
-  for torsion in torsions:
-    torsion.GetEnergy()
-    e_torsions += torsion.energy
-  return e_torsions
+  return numpy.sum(
+      v_n * (1.0 + numpy.cos(const.DEG2RAD * (nfold*t_ijkl - gamma))) / paths)
 
 
-def GetEOutofplanes(outofplanes):
-  """Update outofplane values and compute outofplane energy of system.
-  
-  For all outofplanes in molecule, update outofplane between atoms ijkl, and add
-  the energy to the total molecular outofplane energy [kcal/mol].
+def GetEOutofplanes(o_ijkl, v_n):
+  """Calculate outofplane bend energy of system.
   
   Args:
-    outofplanes (mmlib.molecule.Outofplane*): Array of Outofplane objects
-        containing atomic indices and molecular mechanics parameters.
+    o_ijkl (float*): Array of outofplane angles [degrees].
+    v_n (float*): Array of outofplane half-barrier heights [kcal/mol].
 
   Return:
     e_outofplanes (float): Outofplane [kcal/mol] of all outofplane angles.
   """
-  e_outofplanes = 0.0
-  for outofplane in outofplanes:
-    outofplane.GetEnergy()
-    e_outofplanes += outofplane.energy
-  return e_outofplanes
+  return numpy.sum(
+      v_n * (1.0 + numpy.cos(const.DEG2RAD * (2.0 * o_ijkl - 180.0))))
 
 
-def GetENonbonded(atoms, nonints, dielectric):
+def GetENonbonded(coords, charge, attype_id, lj_a, lj_b, nonint_mask,
+                  dielectric):
   """Calculate non-bonded interaction energy between all atom pairs.
   
   Computes van der waals and electrostatic energy [kcal/mol] components
-  between all pairs of non-bonded atoms in a system.
+  between all pairs of non-bonded atoms in a system. Pair energies are
+  evaluated as NxN arrays, with excluded pairs placed at infinite separation.
+  Van der waals coefficients are gathered from tables of vdw type pairs, so
+  no powers of vdw radii are computed per pair.
   
   Args:
-    atoms (mmlib.molecule.Atom*): Array of Atom objects containing Cartesian
-        coordinates and molecular mechanics parameters.
-    nonints (set(int, int)): Set of atomic index pairs of atoms without
-        nonbonded interactions due to covalent (near-)adjacency.
+    coords (float**): Nx3 array of atomic coordinates [Angstrom].
+    charge (float*): Array of atomic partial charges [e].
+    attype_id (int*): Array of atomic vdw type indices.
+    lj_a (float**): TxT array of repulsive vdw coefficients [kcal*A^12/mol].
+    lj_b (float**): TxT array of attractive vdw coefficients [kcal*A^6/mol].
+    nonint_mask (bool**): NxN array, True for atom pairs (including self
+        pairs) without nonbonded interactions.
     dielectric (float): Dielectric constant of molecule.
 
   Returns:
     e_vdw (float): Van der waals energy [kcal/mol] of molecule.
     e_elst (float): Electrostatic energy [kcal/mol] of molecule.
   """
-  e_vdw, e_elst = 0.0, 0.0
-  for i, j in itertools.combinations(range(len(atoms)), 2):
-    if (i, j) in nonints:
-      continue
-    atom1, atom2 = atoms[i], atoms[j]
-    r_ij = geomcalc.GetRij(atom1.coords, atom2.coords)
-    eps_ij = atom1.sreps * atom2.sreps
-    ro_ij = atom1.ro + atom2.ro
-    e_elst += GetEElstIJ(r_ij, atom1.charge, atom2.charge, dielectric)
-    e_vdw += GetEVdwIJ(r_ij, eps_ij, ro_ij)
+  r_ij = geomcalc.GetRijMatrix(coords)
+  r_ij[nonint_mask] = float('inf')
+  ir2_ij = 1.0 / (r_ij * r_ij)
+  ir6_ij = ir2_ij * ir2_ij * ir2_ij
+  lj_a_ij = lj_a[attype_id][:, attype_id]
+  lj_b_ij = lj_b[attype_id][:, attype_id]
+  q_i = charge[:, numpy.newaxis]
+
+  # Each pair appears twice in the symmetric NxN arrays.
+  e_vdw = 0.5 * numpy.sum((lj_a_ij * ir6_ij
+                           - lj_b_ij) * ir6_ij,
+                          dtype=numpy.float64)
+  e_elst = 0.5 * numpy.sum(GetEElstIJ(r_ij, q_i, charge, dielectric),
+                           dtype=numpy.float64)
   return e_vdw, e_elst
 
 
-def GetEBound(atoms, k_box, boundary, origin, boundary_type):
-  """Compute total boundary energy of system.
+def GetENonbondedPairs(coords, charge, attype_id, lj_a, lj_b, pairs, rcut,
+                       dielectric):
+  """Calculate non-bonded interaction energy of atom pairs within a cutoff.
+  
+  Computes van der waals and electrostatic energy [kcal/mol] components of
+  listed atom pairs closer than 'rcut'. Interactions are truncated at 'rcut'
+  without shifting or switching.
   
-  For all atoms in molecule, add the boundary energy to the total boundary
-  energy [kcal/mol].
+  Args:
+    coords (float**): Nx3 array of atomic coordinates [Angstrom].
+    charge (float*): Array of atomic partial charges [e].
+    attype_id (int*): Array of atomic vdw type indices.
+    lj_a (float**): TxT array of repulsive vdw coefficients [kcal*A^12/mol].
+    lj_b (float**): TxT array of attractive vdw coefficients [kcal*A^6/mol].
+    pairs (int**): Mx2 array of atomic indices of interacting atom pairs,
+        including all pairs within 'rcut'.
+    rcut (float): Cutoff distance [Angstrom] of nonbonded interactions.
+    dielectric (float): Dielectric constant of molecule.
+
+  Returns:
+    e_vdw (float): Van der waals energy [kcal/mol] of molecule.
+    e_elst (float): Electrostatic energy [kcal/mol] of molecule.
+  """
+  r_ij = geomcalc.GetRijArray(coords[pairs[:, 0]], coords[pairs[:, 1]])
+  within = r_ij < rcut
+  i, j, r_ij = pairs[within, 0], pairs[within, 1], r_ij[within]
+  ir6_ij = r_ij**-6
+  t_i, t_j = attype_id[i], attype_id[j]
+  e_vdw = numpy.sum((lj_a[t_i, t_j] * ir6_ij - lj_b[t_i, t_j]) * ir6_ij,
+                    dtype=numpy.float64)
+  e_elst = numpy.sum(GetEElstIJ(r_ij, charge[i], charge[j], dielectric),
+                     dtype=numpy.float64)
+  return e_vdw, e_elst
+
+
+def GetEBound(coords, k_box, boundary, origin, boundary_type):
+  """Compute total boundary energy of system.
   
   Args:
-    atoms (mmlib.molecule.Atom*): Array of Atom objects containing Cartesian
-        coordinates.
+    coords (float**): Nx3 array of atomic coordinates [Angstrom].
     k_box (float): Spring constant [kcal/(mol*A^2)] of molecule boundary.
     boundary (float): Distance [Angstrom] from origin to molecule boundary.
     origin (float*): Cartesian coordinates of molecule origin.
@@ -268,18 +289,25 @@ def GetEBound(atoms, k_box, boundary, origin, boundary_type):
   Returns:
     e_bound (float): Boundary energy [kcal/mol] of molecule.
   """
-  e_bound = 0.0
-  for atom in atoms:
-    e_bound += GetEBoundI(k_box, boundary, atom.coords, origin, boundary_type)
-  return e_bound
+  d_io = numpy.asarray(coords, dtype=float) - numpy.asarray(origin, dtype=float)
+  if boundary_type == 'cube':
+    d_io = numpy.abs(d_io)
+  elif boundary_type == 'sphere':
+    d_io = numpy.sqrt(numpy.sum(d_io**2, axis=1))
+  else:
+    return 0.0
+  d_io = d_io[d_io >= boundary]
+  return float(k_box * numpy.sum((d_io - boundary)**2))
 
 
-def GetEKinetic(atoms, kintype=None):
+def GetEKinetic(mass, vels, pvels, kintype=None):
   """Compute kinetic energy of all atoms in molecule.
   
   Args:
-    atoms (mmlib.molecule.Atom*): Array of Atom objects containing (float) 3
-        cartesian velocities [Angstrom/ps].
+    mass (float*): Array of atomic masses [g/mol].
+    vels (float**): Nx3 array of atomic velocities [Angstrom/ps].
+    pvels (float**): Nx3 array of atomic velocities [Angstrom/ps] at previous
+        time step.
     kintype (str): Type of kinetic energy to be computed:
       'nokinetic': Do nothing (ke = 0.0).
       'leapfrog': Average of current and previous velocities.
@@ -290,16 +318,12 @@ def GetEKinetic(atoms, kintype=None):
   """
   if kintype == 'nokinetic':
     return 0.0
-  
-  e_kinetic = 0.0
+
+  vels = numpy.asarray(vels, dtype=float)
   if kintype == 'leapfrog':
-    for atom in atoms:
-      vels = 0.5 * (atom.vels + atom.pvels)
-      e_kinetic += GetEKineticI(atom.mass, vels)
-  else:
-    for atom in atoms:
-      e_kinetic += GetEKineticI(atom.mass, atom.vels)
-  return e_kinetic
+    vels = 0.5 * (vels + pvels)
+  v2 = numpy.sum(vels**2, axis=1)
+  return float(0.5 * const.KIN2KCAL * numpy.dot(mass, v2))
 
 
 def GetTemperature(e_kinetic, n_atoms):
@@ -0,0 +1,239 @@
+"""Functions for computing molecular mechanics energy gradients by autodiff.
+
+Expresses all potential energy components of a molecule as pure jax functions
+of atomic coordinates, so that the energy gradient can be found by reverse-mode
+automatic differentiation, at the cost of a few energy evaluations for any
+number of atoms.
+
+jax is optional. If it is not installed, JAX is False and 'autodiff' gradients
+are unavailable. Energies and gradients are evaluated with 64-bit jax arrays,
+enabled only for the duration of each call.
+"""
+
+import numpy
+
+from mmlib import constants as const
+
+try:
+  import jax
+  import jax.numpy as jnp
+except ImportError:
+  jax = None
+
+# Whether automatic differentiation gradients are available.
+JAX = jax is not None
+
+if JAX:
+  try:
+    _EnableX64 = jax.enable_x64
+  except AttributeError:
+    from jax.experimental import enable_x64 as _EnableX64
+
+# Order of energy components in the output of GetETerms, matching the first
+# rows of mmlib.molecule.Molecule.g_terms.
+ETERMS = ('bonds', 'angles', 'torsions', 'outofplanes', 'vdw', 'elst', 'bound')
+
+def GetParams(mol):
+  """Gather static molecular mechanics parameters of a molecule into arrays.
+
+  Arrays are copied to the jax device once, so that a molecule can reuse them
+  for every autodiff gradient.
+
+  Args:
+    mol (mmlib.molecule.Molecule): Molecule object with topology and
+        parameter data.
+
+  Returns:
+    params (dict(str: float*)): Device arrays of atomic indices and parameters
+        of all energy terms, keyed by name.
+
+  Raises:
+    ImportError: If jax is not installed.
+  """
+  if not JAX:
+    raise ImportError("jax is required for 'autodiff' gradients.")
+  with _EnableX64(True):
+    return jax.device_put({
+        'bond_idx': mol.bond_idx,
+        'k_b': mol.bond_k_b,
+        'r_eq': mol.bond_r_eq,
+        'angle_idx': mol.angle_idx,
+        'k_a': mol.angle_k_a,
+        'a_eq': mol.angle_a_eq,
+        'torsion_idx': mol.torsion_idx,
+        'v_n': mol.torsion_v_n,
+        'gam': mol.torsion_gam,
+        'n': mol.torsion_n,
+        'paths': mol.torsion_paths,
+        'outofplane_idx': mol.outofplane_idx,
+        'v_n_oop': mol.outofplane_v_n,
+        'charge': mol.charge,
+        'ro': mol.ro,
+        'sreps': mol.sreps,
+        'nonint_mask': mol.nonint_mask})
+
+
+def GetSettings(mol):
+  """Gather scalar settings of a molecule that complete GetParams.
+
+  Args:
+    mol (mmlib.molecule.Molecule): Molecule object with simulation settings.
+
+  Returns:
+    settings (dict(str: float)): Dielectric constant, boundary spring
+        constant, boundary size and origin, keyed by name.
+  """
+  return {
+      'dielectric': mol.dielectric,
+      'k_box': mol.k_box,
+      'boundary': mol.boundary,
+      'origin': numpy.array(mol.origin, dtype=float)}
+
+
+def _GetUnit(vec):
+  """Normalize last axis of array of vectors."""
+  return vec / jnp.linalg.norm(vec, axis=-1, keepdims=True)
+
+
+def _GetDot(vec_i, vec_j):
+  """Dot product along last axis of arrays of vectors."""
+  return jnp.sum(vec_i * vec_j, axis=-1)
+
+
+def GetEBonds(coords, idx, k_b, r_eq):
+  """Calculate bond stretch energy [kcal/mol] of all bonds."""
+  r_ij = jnp.linalg.norm(coords[idx[:, 1]] - coords[idx[:, 0]], axis=-1)
+  return jnp.sum(k_b * (r_ij - r_eq)**2)
+
+
+def GetEAngles(coords, idx, k_a, a_eq):
+  """Calculate angle bend energy [kcal/mol] of all bond angles."""
+  v_ji = coords[idx[:, 0]] - coords[idx[:, 1]]
+  v_jk = coords[idx[:, 2]] - coords[idx[:, 1]]
+  # Arctangent form stays differentiable near 0 and 180 degrees.
+  sin_ijk = jnp.linalg.norm(jnp.cross(v_ji, v_jk), axis=-1)
+  a_ijk = const.RAD2DEG * jnp.arctan2(sin_ijk, _GetDot(v_ji, v_jk))
+  return jnp.sum(k_a * (const.DEG2RAD * (a_ijk - a_eq))**2)
+
+
+def GetETorsions(coords, idx, v_n, gam, n, paths):
+  """Calculate torsion strain energy [kcal/mol] of all torsion angles."""
+  v_ij = coords[idx[:, 1]] - coords[idx[:, 0]]
+  v_jk = coords[idx[:, 2]] - coords[idx[:, 1]]
+  v_kl = coords[idx[:, 3]] - coords[idx[:, 2]]
+  n_ijk = jnp.cross(v_ij, v_jk)
+  n_jkl = jnp.cross(v_jk, v_kl)
+  r_jk = jnp.linalg.norm(v_jk, axis=-1)
+  t_ijkl = const.RAD2DEG * jnp.arctan2(
+      r_jk * _GetDot(v_ij, n_jkl), _GetDot(n_ijk, n_jkl))
+  return jnp.sum(
+      v_n * (1.0 + jnp.cos(const.DEG2RAD * (n*t_ijkl - gam))) / paths)
+
+
+def GetEOutofplanes(coords, idx, v_n):
+  """Calculate outofplane bend energy [kcal/mol] of all outofplane angles."""
+  u_ki = _GetUnit(coords[idx[:, 0]] - coords[idx[:, 2]])
+  u_kj = _GetUnit(coords[idx[:, 1]] - coords[idx[:, 2]])
+  u_kl = _GetUnit(coords[idx[:, 3]] - coords[idx[:, 2]])
+  cp_kikj = jnp.cross(u_ki, u_kj)
+  sin_oijkl = _GetDot(cp_kikj, u_kl) / jnp.linalg.norm(cp_kikj, axis=-1)
+  o_ijkl = const.RAD2DEG * jnp.arcsin(jnp.clip(sin_oijkl, -1.0, 1.0))
+  return jnp.sum(
+      v_n * (1.0 + jnp.cos(const.DEG2RAD * (2.0*o_ijkl - 180.0))))
+
+
+def GetENonbonded(coords, charge, ro, sreps, nonint_mask, dielectric):
+  """Calculate van der waals and electrostatic energy [kcal/mol] of system."""
+  dr_ij = coords[:, jnp.newaxis, :] - coords[jnp.newaxis, :, :]
+  # Masked pairs are moved to unit distance before the square root, so that
+  # zero self distances do not produce undefined derivatives.
+  r2_ij = jnp.where(nonint_mask, 1.0, jnp.sum(dr_ij**2, axis=-1))
+  r_ij = jnp.sqrt(r2_ij)
+  sr6_ij = (jnp.add.outer(ro, ro)**2 / r2_ij)**3
+  e_vdw_ij = jnp.outer(sreps, sreps) * (sr6_ij**2 - 2.0*sr6_ij)
+  e_elst_ij = const.CEU2KCAL * jnp.outer(charge, charge) / (dielectric * r_ij)
+  e_vdw = 0.5 * jnp.sum(jnp.where(nonint_mask, 0.0, e_vdw_ij))
+  e_elst = 0.5 * jnp.sum(jnp.where(nonint_mask, 0.0, e_elst_ij))
+  return e_vdw, e_elst
+
+
+def GetEBound(coords, k_box, boundary, origin, boundary_type):
+  """Calculate boundary energy [kcal/mol] of all atoms."""
+  if boundary_type == 'cube':
+    d_io = jnp.abs(coords - origin)
+  elif boundary_type == 'sphere':
+    # Atoms at the origin are given unit distance before the square root, so
+    # that they do not produce undefined derivatives.
+    r2_io = jnp.sum((coords - origin)**2, axis=-1)
+    d_io = jnp.where(r2_io > 0.0, jnp.sqrt(jnp.where(r2_io > 0.0, r2_io, 1.0)),
+                     0.0)
+  else:
+    return 0.0
+  return jnp.sum(jnp.where(d_io >= boundary, k_box * (d_io - boundary)**2, 0.0))
+
+
+def _GetETerms(coords, params, boundary_type):
+  """Calculate all potential energy components as a jax array."""
+  e_vdw, e_elst = GetENonbonded(
+      coords, params['charge'], params['ro'], params['sreps'],
+      params['nonint_mask'], params['dielectric'])
+  return jnp.stack([
+      GetEBonds(coords, params['bond_idx'], params['k_b'], params['r_eq']),
+      GetEAngles(coords, params['angle_idx'], params['k_a'], params['a_eq']),
+      GetETorsions(coords, params['torsion_idx'], params['v_n'],
+                   params['gam'], params['n'], params['paths']),
+      GetEOutofplanes(coords, params['outofplane_idx'], params['v_n_oop']),
+      e_vdw,
+      e_elst,
+      GetEBound(coords, params['k_box'], params['boundary'], params['origin'],
+                boundary_type)])
+
+
+def GetETerms(coords, params, boundary_type):
+  """Calculate all potential energy components of a molecule.
+
+  Args:
+    coords (float**): Nx3 array of atomic coordinates [Angstrom].
+    params (dict(str: float*)): Molecule parameter arrays from GetParams,
+        with settings from GetSettings.
+    boundary_type (str): Molecular boundary type ('sphere' or 'cube').
+
+  Returns:
+    e_terms (float*): Energy [kcal/mol] of each component, in order of
+        ETERMS.
+
+  Raises:
+    ImportError: If jax is not installed.
+  """
+  if not JAX:
+    raise ImportError("jax is required for 'autodiff' gradients.")
+  with _EnableX64(True):
+    return numpy.asarray(_GetETerms(coords, params, boundary_type))
+
+
+if JAX:
+  _GetGTerms = jax.jit(
+      jax.jacrev(_GetETerms), static_argnames=('boundary_type',))
+
+
+def GetGTerms(coords, params, boundary_type):
+  """Calculate gradient of all potential energy components by autodiff.
+
+  Args:
+    coords (float**): Nx3 array of atomic coordinates [Angstrom].
+    params (dict(str: float*)): Molecule parameter arrays from GetParams,
+        with settings from GetSettings.
+    boundary_type (str): Molecular boundary type ('sphere' or 'cube').
+
+  Returns:
+    g_terms (float***): Kx(Nx3) array of gradients [kcal/(mol*A)] of each
+        energy component, in order of ETERMS.
+
+  Raises:
+    ImportError: If jax is not installed.
+  """
+  if not JAX:
+    raise ImportError("jax is required for 'autodiff' gradients.")
+  with _EnableX64(True):
+    return numpy.asarray(
+        _GetGTerms(coords, params, boundary_type=boundary_type))
@@ -0,0 +1,110 @@
+"""Classes and functions for unit testing the mmlib energy_jax module."""
+
+import numpy
+import unittest
+
+from mmlib import constants as const
+from mmlib import energy
+from mmlib import energy_jax
+from mmlib import geomcalc
+from mmlib import test
+
+def _GetParams():
+  """Build parameter arrays of a four-atom chain with every energy term."""
+  return {
+      'bond_idx': numpy.array([[0, 1], [1, 2], [2, 3]]),
+      'k_b': numpy.array([300.0, 250.0, 300.0]),
+      'r_eq': numpy.array([1.1, 1.5, 1.2]),
+      'angle_idx': numpy.array([[0, 1, 2], [1, 2, 3]]),
+      'k_a': numpy.array([40.0, 50.0]),
+      'a_eq': numpy.array([109.5, 120.0]),
+      'torsion_idx': numpy.array([[0, 1, 2, 3]]),
+      'v_n': numpy.array([1.4]),
+      'gam': numpy.array([30.0]),
+      'n': numpy.array([3.0]),
+      'paths': numpy.array([2.0]),
+      'outofplane_idx': numpy.array([[0, 3, 1, 2]]),
+      'v_n_oop': numpy.array([2.5]),
+      'charge': numpy.array([0.3, -0.2, 0.1, -0.2]),
+      'ro': numpy.array([1.2, 1.6, 1.6, 1.5]),
+      'sreps': numpy.sqrt(numpy.array([0.02, 0.1, 0.1, 0.2])),
+      'nonint_mask': numpy.array([[1, 1, 1, 0], [1, 1, 1, 1],
+                                  [1, 1, 1, 1], [0, 1, 1, 1]], dtype=bool),
+      'dielectric': 1.5,
+      'k_box': 250.0,
+      'boundary': 2.0,
+      'origin': numpy.zeros(const.NUMDIM)}
+
+
+@unittest.skipUnless(energy_jax.JAX, 'jax is not installed')
+class TestGetETerms(unittest.TestCase):
+  """Unit tests for mmlib.energy_jax.GetETerms method."""
+
+  def testEnergyComponents(self):
+    """Asserts energy components equal to scalar energy functions."""
+    c = test.CHAIN_COORDS
+    e_terms = energy_jax.GetETerms(c, _GetParams(), 'sphere')
+    r_03 = geomcalc.GetRij(c[0], c[3])
+    ref_terms = [
+        (energy.GetEBond(geomcalc.GetRij(c[0], c[1]), 1.1, 300.0)
+         + energy.GetEBond(geomcalc.GetRij(c[1], c[2]), 1.5, 250.0)
+         + energy.GetEBond(geomcalc.GetRij(c[2], c[3]), 1.2, 300.0)),
+        (energy.GetEAngle(geomcalc.GetAijk(c[0], c[1], c[2]), 109.5, 40.0)
+         + energy.GetEAngle(geomcalc.GetAijk(c[1], c[2], c[3]), 120.0, 50.0)),
+        energy.GetETorsion(
+            geomcalc.GetTijkl(c[0], c[1], c[2], c[3]), 1.4, 30.0, 3.0, 2.0),
+        energy.GetEOutofplane(geomcalc.GetOijkl(c[0], c[3], c[1], c[2]), 2.5),
+        energy.GetEVdwIJ(r_03, 0.02**0.5 * 0.2**0.5, 2.7),
+        energy.GetEElstIJ(r_03, 0.3, -0.2, 1.5),
+        sum(energy.GetEBoundI(250.0, 2.0, c[i], numpy.zeros(3), 'sphere')
+            for i in range(4))]
+    test.assertListAlmostEqual(self, numpy.asarray(e_terms), ref_terms)
+
+
+@unittest.skipUnless(energy_jax.JAX, 'jax is not installed')
+class TestGetGTerms(unittest.TestCase):
+  """Unit tests for mmlib.energy_jax.GetGTerms method."""
+
+  def _AssertNumericalGradient(self, boundary_type):
+    coords, params = test.CHAIN_COORDS, _GetParams()
+    g_terms = energy_jax.GetGTerms(coords, params, boundary_type)
+    for i in range(len(coords)):
+      for j in range(const.NUMDIM):
+        coords_p, coords_m = numpy.copy(coords), numpy.copy(coords)
+        coords_p[i][j] += 0.5 * const.NUMDISP
+        coords_m[i][j] -= 0.5 * const.NUMDISP
+        e_p = numpy.asarray(
+            energy_jax.GetETerms(coords_p, params, boundary_type))
+        e_m = numpy.asarray(
+            energy_jax.GetETerms(coords_m, params, boundary_type))
+        for k in range(len(energy_jax.ETERMS)):
+          self.assertAlmostEqual(
+              g_terms[k][i][j], (e_p[k] - e_m[k]) / const.NUMDISP, places=5)
+
+  def testSphereNumericalGradient(self):
+    """Asserts autodiff gradient equal to numerical gradient in sphere."""
+    self._AssertNumericalGradient('sphere')
+
+  def testCubeNumericalGradient(self):
+    """Asserts autodiff gradient equal to numerical gradient in cube."""
+    self._AssertNumericalGradient('cube')
+
+  def testScopedX64(self):
+    """Asserts 64-bit jax arrays enabled only within gradient call."""
+    x64 = energy_jax.jax.config.jax_enable_x64
+    g_terms = energy_jax.GetGTerms(test.CHAIN_COORDS, _GetParams(), 'sphere')
+    self.assertEqual(g_terms.dtype, numpy.float64)
+    self.assertEqual(energy_jax.jax.config.jax_enable_x64, x64)
+
+
+def suite():
+  """Builds a test suite of all unit tests in energy_jax_test module."""
+  test_classes = (
+      TestGetETerms,
+      TestGetGTerms)
+
+  suite = unittest.TestSuite()
+  for test_class in test_classes:
+    tests = unittest.TestLoader().loadTestsFromTestCase(test_class)
+    suite.addTests(tests)
+  return suite
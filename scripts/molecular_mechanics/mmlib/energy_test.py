@@ -1,8 +1,10 @@
 """Classes and functions for unit testing the mmlib energy module."""
 
+import numpy
 import unittest
 
 from mmlib import energy
+from mmlib import topology
 
 class TestGetEBond(unittest.TestCase):
   """Unit tests for mmlib.energy.GetEBond method."""
@@ -193,6 +195,135 @@ class TestGetEElstIJ(unittest.TestCase):
     self.assertAlmostEqual(energy.GetEElstIJ(*params), -8.8550333)
 
 
+class TestGetEBonds(unittest.TestCase):
+  """Unit tests for mmlib.energy.GetEBonds method."""
+
+  def testSumOfBonds(self):
+    """Asserts sum of single bond energies."""
+    r_ij, r_eq, k_b = [2.5, 1.5, 1.0], [2.0, 2.0, 1.0], [5.0, 5.0, 1.0]
+    params = numpy.array(r_ij), numpy.array(r_eq), numpy.array(k_b)
+    self.assertAlmostEqual(energy.GetEBonds(*params),
+                           sum(map(energy.GetEBond, r_ij, r_eq, k_b)))
+
+
+class TestGetEAngles(unittest.TestCase):
+  """Unit tests for mmlib.energy.GetEAngles method."""
+
+  def testSumOfAngles(self):
+    """Asserts sum of single angle energies."""
+    a_ijk, a_eq = [138.5, 48.5, 146.6], [93.5, 93.5, 146.6]
+    k_a = [4.6, 4.6, 1.0]
+    params = numpy.array(a_ijk), numpy.array(a_eq), numpy.array(k_a)
+    self.assertAlmostEqual(energy.GetEAngles(*params),
+                           sum(map(energy.GetEAngle, a_ijk, a_eq, k_a)))
+
+
+class TestGetETorsions(unittest.TestCase):
+  """Unit tests for mmlib.energy.GetETorsions method."""
+
+  def testSumOfTorsions(self):
+    """Asserts sum of single torsion energies."""
+    values = ([93.5, -165.0, 60.0], [1.0, 1.0, 0.3], [4.7, 15.0, 0.0],
+              [1, 1, 3], [1, 2, 9])
+    params = [numpy.array(value) for value in values]
+    self.assertAlmostEqual(energy.GetETorsions(*params),
+                           sum(map(energy.GetETorsion, *values)))
+
+
+class TestGetEOutofplanes(unittest.TestCase):
+  """Unit tests for mmlib.energy.GetEOutofplanes method."""
+
+  def testSumOfOutofplanes(self):
+    """Asserts sum of single outofplane energies."""
+    o_ijkl, v_n = [0.0, 30.0, -75.0], [2.5, 2.5, 0.3]
+    params = numpy.array(o_ijkl), numpy.array(v_n)
+    self.assertAlmostEqual(energy.GetEOutofplanes(*params),
+                           sum(map(energy.GetEOutofplane, o_ijkl, v_n)))
+
+
+class TestGetENonbonded(unittest.TestCase):
+  """Unit tests for mmlib.energy.GetENonbonded method."""
+
+  def setUp(self):
+    self.coords = numpy.array(
+        [[0.0, 0.0, 0.0], [3.0, 0.0, 0.0], [0.0, 4.0, 0.0]])
+    self.charge = numpy.array([0.4, -0.2, -0.2])
+    self.attype_id, self.lj_a, self.lj_b = topology.GetVdwTypes(
+        numpy.array([1.5, 1.2, 1.2]), numpy.sqrt(numpy.array([0.2, 0.1, 0.1])))
+    self.nonint_mask = numpy.identity(3, dtype=bool)
+
+  def testAllPairs(self):
+    """Asserts sum of pair energies when no pairs are excluded."""
+    params = (self.coords, self.charge, self.attype_id, self.lj_a, self.lj_b,
+              self.nonint_mask, 1.0)
+    e_vdw, e_elst = energy.GetENonbonded(*params)
+    self.assertAlmostEqual(e_vdw, -0.1382913)
+    self.assertAlmostEqual(e_elst, -12.8397983)
+
+  def testExcludedPair(self):
+    """Asserts excluded pair does not contribute to energy."""
+    self.nonint_mask[0][1] = self.nonint_mask[1][0] = True
+    params = (self.coords, self.charge, self.attype_id, self.lj_a, self.lj_b,
+              self.nonint_mask, 1.0)
+    e_vdw, e_elst = energy.GetENonbonded(*params)
+    self.assertAlmostEqual(e_vdw, energy.GetEVdwIJ(4.0, 0.02**0.5, 2.7)
+                           + energy.GetEVdwIJ(5.0, 0.1, 2.4))
+    self.assertAlmostEqual(e_elst, energy.GetEElstIJ(4.0, 0.4, -0.2, 1.0)
+                           + energy.GetEElstIJ(5.0, -0.2, -0.2, 1.0))
+
+
+class TestGetEBound(unittest.TestCase):
+  """Unit tests for mmlib.energy.GetEBound method."""
+
+  def setUp(self):
+    self.coords = numpy.array(
+        [[0.5, 0.0, 0.0], [3.0, -1.0, 0.0], [-2.0, 2.5, 1.0]])
+    self.origin = [0.5, 0.5, 0.0]
+
+  def _AssertSumOfAtoms(self, boundary_type):
+    e_bound = energy.GetEBound(self.coords, 10.0, 2.0, self.origin,
+                               boundary_type)
+    self.assertGreater(e_bound, 0.0)
+    self.assertAlmostEqual(e_bound, sum(
+        energy.GetEBoundI(10.0, 2.0, coords, self.origin, boundary_type)
+        for coords in self.coords))
+
+  def testSphere(self):
+    """Asserts sum of single atom energies in sphere with list origin."""
+    self._AssertSumOfAtoms('sphere')
+
+  def testCube(self):
+    """Asserts sum of single atom energies in cube with list origin."""
+    self._AssertSumOfAtoms('cube')
+
+
+class TestGetEKinetic(unittest.TestCase):
+  """Unit tests for mmlib.energy.GetEKinetic method."""
+
+  def setUp(self):
+    self.mass = numpy.array([12.0, 1.0])
+    self.vels = numpy.array([[0.1, -0.2, 0.3], [1.0, 0.0, 2.0]])
+    self.pvels = numpy.array([[0.3, 0.0, 0.1], [0.0, 2.0, 0.0]])
+
+  def testCurrentVelocities(self):
+    """Asserts sum of single atom energies with current velocities."""
+    self.assertAlmostEqual(
+        energy.GetEKinetic(self.mass, self.vels, self.pvels),
+        sum(map(energy.GetEKineticI, self.mass, self.vels)))
+
+  def testLeapfrog(self):
+    """Asserts sum of single atom energies with average velocities."""
+    vels = 0.5 * (self.vels + self.pvels)
+    self.assertAlmostEqual(
+        energy.GetEKinetic(self.mass, self.vels, self.pvels, 'leapfrog'),
+        sum(map(energy.GetEKineticI, self.mass, vels)))
+
+  def testNoKinetic(self):
+    """Asserts zero energy without kinetic energy."""
+    self.assertEqual(
+        energy.GetEKinetic(self.mass, self.vels, self.pvels, 'nokinetic'), 0.0)
+
+
 def suite():
   """Builds a test suite of all unit tests in energy_test module."""
   test_classes = (
@@ -201,7 +332,14 @@ def suite():
       TestGetETorsion,
       TestGetEOutofplane,
       TestGetEVdwIJ,
-      TestGetEElstIJ)
+      TestGetEElstIJ,
+      TestGetEBonds,
+      TestGetEAngles,
+      TestGetETorsions,
+      TestGetEOutofplanes,
+      TestGetENonbonded,
+      TestGetEBound,
+      TestGetEKinetic)
   
   suite = unittest.TestSuite()
   for test_class in test_classes:
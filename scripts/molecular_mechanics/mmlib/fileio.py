@@ -132,11 +132,14 @@ def _AreAllType(type, values):
   return True
 
 
-def GetAtomFromXyzq(row):
+def GetAtomFromXyzq(row, mol=None, index=0):
   """Parses and validates a row of input from xyzq file into an Atom object.
 
   Args:
     row (str*): Array of strings from row of xyzq file.
+    mol (mmlib.molecule.Molecule): Molecule with allocated per-atom arrays to
+        hold atom data (default: new single-row array block).
+    index (int): Row of atom data in per-atom arrays of 'mol'.
 
   Returns:
     atom (mmlib.molecule.Atom): Atom object.
@@ -161,21 +164,18 @@ def GetAtomFromXyzq(row):
   if not _IsType(float, charge):
     raise ValueError('Atomic charge must be numeric value: %s' % charge)
 
-  return molecule.Atom(type_, numpy.fromiter(coords, float), float(charge))
+  return molecule.Atom(type_, numpy.fromiter(coords, float), float(charge),
+                       mol=mol, index=index)
 
 
-def GetAtomsFromXyzq(rows):
-  """Parses molecular geometry data from xyzq file.
-  
-  First line contains (int) number of atoms. Second line is ignored comment.
-  Each line afterward (3 to [n+2]) contains atom type, (float) 3 xyz Cartesian
-  coordinates [Angstrom], and (float) charge [e].
+def GetNumAtomsFromXyzq(rows):
+  """Parses and validates number of atoms from xyzq file.
 
   Args:
     rows (str**): 2d array of string from xyzq input file.
 
   Returns:
-    atoms (mmlib.molecule.Atom*): Array of molecule's Atom objects.
+    n_atoms (int): Number of atoms in molecule.
 
   Raises:
     EOFError: If input is empty or of insufficient size.
@@ -194,17 +194,44 @@ def GetAtomsFromXyzq(rows):
     raise EOFError('XYZQ file does not contain enough lines for stated number '
                    'of atoms: %i' % n_atoms)
 
+  return n_atoms
+
+
+def GetAtomsFromXyzq(rows, mol=None):
+  """Parses molecular geometry data from xyzq file.
+  
+  First line contains (int) number of atoms. Second line is ignored comment.
+  Each line afterward (3 to [n+2]) contains atom type, (float) 3 xyz Cartesian
+  coordinates [Angstrom], and (float) charge [e].
+
+  Args:
+    rows (str**): 2d array of string from xyzq input file.
+    mol (mmlib.molecule.Molecule): Molecule with per-atom arrays allocated for
+        all atoms, to be filled in place (default: one array block per atom).
+
+  Returns:
+    atoms (mmlib.molecule.Atom*): Array of molecule's Atom objects.
+
+  Raises:
+    EOFError: If input is empty or of insufficient size.
+    IndexError: If first line is empty.
+  """
+  n_atoms = GetNumAtomsFromXyzq(rows)
+
   atoms = []
-  for row in rows[2:n_atoms+2]:
-    atoms.append(GetAtomFromXyzq(row))
+  for i, row in enumerate(rows[2:n_atoms+2]):
+    atoms.append(GetAtomFromXyzq(row, mol, i))
   return atoms
 
 
-def GetAtomFromPrm(row):
+def GetAtomFromPrm(row, mol=None, index=0):
   """Parses atom row into an Atom object.
 
   Args:
     row (str*): Array of strings from line of prm file.
+    mol (mmlib.molecule.Molecule): Molecule with allocated per-atom arrays to
+        hold atom data (default: new single-row array block).
+    index (int): Row of atom data in per-atom arrays of 'mol'.
 
   Returns:
     atom (mmlib.molecule.Atom): Atom object with attributes from row.
@@ -236,7 +263,7 @@ def GetAtomFromPrm(row):
         'Atomic epsilon must be non-negative numeric value: %s' % eps)
 
   return molecule.Atom(type_, numpy.fromiter(coords, float), float(charge), 
-                       float(ro), float(eps))
+                       float(ro), float(eps), mol, index)
 
 
 def GetBondFromPrm(row):
@@ -387,11 +414,25 @@ def GetOutofplaneFromPrm(row):
       int(at1)-1, int(at2)-1, int(at3)-1, int(at4)-1, float(v_n))
 
 
-def GetAtomsFromPrm(rows):
+def GetNumAtomsFromPrm(rows):
+  """Counts atom rows in prm file.
+
+  Args:
+    rows (str**): 2d array of strings from lines of prm file.
+
+  Returns:
+    n_atoms (int): Number of atoms in molecule.
+  """
+  return sum(1 for row in rows if row and row[0].upper() == 'ATOM')
+
+
+def GetAtomsFromPrm(rows, mol=None):
   """Parses atom rows into an array of Atom objects.
 
   Args:
     rows (str**): 2d array of strings from lines of prm file.
+    mol (mmlib.molecule.Molecule): Molecule with per-atom arrays allocated for
+        all atoms, to be filled in place (default: one array block per atom).
 
   Returns:
     atoms (mmlib.molecule.Atom*): Array of Atom object with parameters from
@@ -400,7 +441,7 @@ def GetAtomsFromPrm(rows):
   atoms = []
   for row in rows:
     if row and row[0].upper() == 'ATOM':
-      atoms.append(GetAtomFromPrm(row))
+      atoms.append(GetAtomFromPrm(row, mol, len(atoms)))
   return atoms
 
 
@@ -510,6 +551,10 @@ def GetSimData(sim):
       sim.mol.GetVolume()
     elif kwarg == 'origin':
       sim.mol.origin = list(map(float, kwargarr[:const.NUMDIM]))
+    elif kwarg == 'cutoff':
+      sim.mol.rcut = float(kwargval)
+    elif kwarg == 'cutoffbuffer':
+      sim.mol.rbuf = float(kwargval)
     elif kwarg == 'totaltime':
       sim.tottime = float(kwargval)
     elif kwarg == 'totalconf':
@@ -563,6 +608,10 @@ def GetOptData(opt):
     kwargarr = infile_array[q][1:]
     if kwarg == 'molecule':
       opt.mol = molecule.Molecule(os.path.realpath(kwargval))
+    elif kwarg == 'cutoff':
+      opt.mol.rcut = float(kwargval)
+    elif kwarg == 'cutoffbuffer':
+      opt.mol.rbuf = float(kwargval)
     elif kwarg == 'opttype':
       opt.opt_type = kwargval.lower()
     elif kwarg == 'optcriteria':
@@ -1046,7 +1095,7 @@ def ValidateInput(program_path, argv):
     FileNotFoundError: If input file is not in file system path.
   """
   if (len(argv) < 2):
-    program_name = program_path.split('/')[-1]
+    program_name = os.path.basename(program_path)
     if program_name in _PROGRAM_MESSAGES:
       print('\nUsage: python %s INPUT_FILE\n' % program_name)
       print('INPUT_FILE: %s' % _PROGRAM_MESSAGES[program_name])
@@ -1,5 +1,8 @@
 """Classes and functions for unit testing the mmlib fileio module."""
 
+import os
+import tempfile
+import types
 import unittest
 
 from mmlib import fileio
@@ -108,6 +111,19 @@ class TestGetAtomsFromXyzq(unittest.TestCase):
                   molecule.Atom('H4', [0.523, -100.12, 5.5], -0.27)]
     test.assertObjectArrayEqual(self, test_output, ref_output)
 
+  def testMoleculeArrays(self):
+    """Asserts atom data written in place to per-atom arrays of molecule."""
+    param = [['2'], [], ['N*', '1.0', '0.1', '-.2', '+0.553'],
+             ['H4', '0.523', '-100.12', '5.5', '-0.27']]
+    mol = molecule._AtomArrays(2)
+    test_output = fileio.GetAtomsFromXyzq(param, mol)
+    ref_output = [molecule.Atom('N*', [1.0, 0.1, -0.2], 0.553),
+                  molecule.Atom('H4', [0.523, -100.12, 5.5], -0.27)]
+    test.assertObjectArrayEqual(self, test_output, ref_output)
+    test.assertListAlmostEqual(self, mol.coords, [[1.0, 0.1, -0.2],
+                                                  [0.523, -100.12, 5.5]])
+    test.assertListAlmostEqual(self, mol.charge, [0.553, -0.27])
+
 
 class TestGetAtomFromPrm(unittest.TestCase):
   """Unit tests for mmlib.fileio.GetAtomFromPrm method."""
@@ -483,6 +499,61 @@ class TestValidateInput(unittest.TestCase):
   pass
 
 
+class _InputFileTestCase(unittest.TestCase):
+  """Shared input files of a one-atom molecule for input file parsers."""
+
+  def setUp(self):
+    self.tmp_dir = tempfile.TemporaryDirectory()
+    with open(os.path.join(self.tmp_dir.name, 'mol.xyzq'), 'w') as mol_file:
+      mol_file.write('1\n\nHA 0.0 0.0 0.0 0.0\n')
+
+  def tearDown(self):
+    self.tmp_dir.cleanup()
+
+  def _GetInput(self, lines):
+    """Write input file lines and return object with input file paths."""
+    infile = os.path.join(self.tmp_dir.name, 'input.txt')
+    with open(infile, 'w') as in_file:
+      in_file.write('\n'.join(['molecule mol.xyzq'] + lines) + '\n')
+    return types.SimpleNamespace(infile=infile, indir=self.tmp_dir.name)
+
+
+class TestGetSimData(_InputFileTestCase):
+  """Unit tests for mmlib.fileio.GetSimData method."""
+
+  def testCutoff(self):
+    """Asserts nonbonded cutoff read from CUTOFF keyword."""
+    sim = self._GetInput(['CUTOFF 8.5'])
+    fileio.GetSimData(sim)
+    self.assertEqual(sim.mol.rcut, 8.5)
+    self.assertEqual(sim.mol.rbuf, 2.0)
+
+  def testCutoffBuffer(self):
+    """Asserts neighbor list buffer read from CUTOFFBUFFER keyword."""
+    sim = self._GetInput(['CUTOFFBUFFER 1.5'])
+    fileio.GetSimData(sim)
+    self.assertIsNone(sim.mol.rcut)
+    self.assertEqual(sim.mol.rbuf, 1.5)
+
+
+class TestGetOptData(_InputFileTestCase):
+  """Unit tests for mmlib.fileio.GetOptData method."""
+
+  def testCutoff(self):
+    """Asserts nonbonded cutoff read from CUTOFF keyword."""
+    opt = self._GetInput(['CUTOFF 8.5'])
+    fileio.GetOptData(opt)
+    self.assertEqual(opt.mol.rcut, 8.5)
+    self.assertEqual(opt.mol.rbuf, 2.0)
+
+  def testCutoffBuffer(self):
+    """Asserts neighbor list buffer read from CUTOFFBUFFER keyword."""
+    opt = self._GetInput(['CUTOFFBUFFER 1.5'])
+    fileio.GetOptData(opt)
+    self.assertIsNone(opt.mol.rcut)
+    self.assertEqual(opt.mol.rbuf, 1.5)
+
+
 def suite():
   """Builds a test suite of all unit tests in fileio_test module."""
   test_classes = (
@@ -504,7 +575,9 @@ def suite():
       TestGetPrintAnglesString,
       TestGetPrintTorsionsString,
       TestGetPrintOutofplanesString,
-      TestValidateInput)
+      TestValidateInput,
+      TestGetSimData,
+      TestGetOptData)
   
   suite = unittest.TestSuite()
   for test_class in test_classes:
@@ -39,6 +39,19 @@ def GetRij(coords_i, coords_j):
                    (coords_j[2] - coords_i[2])**2)
 
 
+def GetRijMatrix(coords):
+  """Calculate distances between all pairs of 3d cartesian points.
+
+  Args:
+    coords (float**): Nx3 array of cartesian coordinates [Angstrom] of points.
+
+  Returns:
+    r_ij (float**): NxN array of distances [Angstrom] between points i and j.
+  """
+  dr_ij = coords[:, numpy.newaxis, :] - coords[numpy.newaxis, :, :]
+  return numpy.sqrt(numpy.sum(dr_ij**2, axis=2))
+
+
 def GetUij(coords_i, coords_j, r_ij=None):
   """Calculate 3d unit vector from cartesian points i to j.
   
@@ -191,6 +204,128 @@ def GetOijkl(coords_i, coords_j, coords_k, coords_l, r_ki=None, r_kj=None,
   return const.RAD2DEG * math.asin(dp_kikj_kl)
 
 
+def GetRijArray(coords_i, coords_j):
+  """Calculate distances between arrays of 3d cartesian points.
+
+  Args:
+    coords_i (float**): Mx3 array of cartesian coordinates [Angstrom] of
+        points i.
+    coords_j (float**): Mx3 array of cartesian coordinates [Angstrom] of
+        points j.
+
+  Returns:
+    r_ij (float*): Array of M distances [Angstrom] between points i and j.
+  """
+  return numpy.sqrt(numpy.sum((coords_j - coords_i)**2, axis=1))
+
+
+def GetUijArray(coords_i, coords_j, r_ij=None):
+  """Calculate 3d unit vectors from arrays of cartesian points i to j.
+
+  Gives zero vectors where i and j are the same point.
+
+  Args:
+    coords_i (float**): Mx3 array of cartesian coordinates [Angstrom] of
+        points i.
+    coords_j (float**): Mx3 array of cartesian coordinates [Angstrom] of
+        points j.
+    r_ij (float*): Array of M distances from i to j [Angstrom], if provided.
+
+  Returns:
+    u_ij (float**): Mx3 array of unit vectors from points i to j.
+  """
+  if r_ij is None:
+    r_ij = GetRijArray(coords_i, coords_j)
+  r_ij = r_ij[:, numpy.newaxis]
+  dr_ij = coords_j - coords_i
+  return numpy.divide(dr_ij, r_ij, out=numpy.zeros(dr_ij.shape),
+                      where=(r_ij > 0.0))
+
+
+def GetUcpArray(uvec_i, uvec_j):
+  """Calculate unit cross products between arrays of 3d unit vectors.
+
+  Gives zero vectors where vectors i and j are parallel.
+
+  Args:
+    uvec_i (float**): Mx3 array of unit vectors i.
+    uvec_j (float**): Mx3 array of unit vectors j.
+
+  Returns:
+    ucp (float**): Mx3 array of normalized cross products between unit
+        vectors i and j.
+  """
+  cp = numpy.cross(uvec_i, uvec_j)
+  sin_ij = numpy.sqrt(numpy.sum(cp**2, axis=1))[:, numpy.newaxis]
+  return numpy.divide(cp, sin_ij, out=numpy.zeros(cp.shape),
+                      where=(sin_ij > 0.0))
+
+
+def GetAijkArray(coords_i, coords_j, coords_k):
+  """Calculate angles between arrays of 3 3d cartesian points.
+
+  Args:
+    coords_i (float**): Mx3 array of cartesian coordinates of points i.
+    coords_j (float**): Mx3 array of cartesian coordinates of points j.
+    coords_k (float**): Mx3 array of cartesian coordinates of points k.
+
+  Returns:
+    a_ijk (float*): Array of M angles [degrees] between unit vectors ji and
+        jk.
+  """
+  u_ji = GetUijArray(coords_j, coords_i)
+  u_jk = GetUijArray(coords_j, coords_k)
+  dp_jijk = numpy.clip(numpy.sum(u_ji * u_jk, axis=1), -1.0, 1.0)
+  return const.RAD2DEG * numpy.arccos(dp_jijk)
+
+
+def GetTijklArray(coords_i, coords_j, coords_k, coords_l):
+  """Calculate torsion angles between arrays of 4 3d cartesian points.
+
+  Uses the arctangent of the sine and cosine of each torsion, which keeps
+  full precision near 0 and 180 degrees.
+
+  Args:
+    coords_i (float**): Mx3 array of cartesian coordinates of points i.
+    coords_j (float**): Mx3 array of cartesian coordinates of points j.
+    coords_k (float**): Mx3 array of cartesian coordinates of points k.
+    coords_l (float**): Mx3 array of cartesian coordinates of points l.
+
+  Returns:
+    t_ijkl (float*): Array of M signed angles [degrees] between planes ijk
+        and jkl.
+  """
+  v_ij = coords_j - coords_i
+  v_jk = coords_k - coords_j
+  v_kl = coords_l - coords_k
+  cp_ijjk = numpy.cross(v_ij, v_jk)
+  cp_jkkl = numpy.cross(v_jk, v_kl)
+  r_jk = numpy.sqrt(numpy.sum(v_jk**2, axis=1))
+  sin_ijkl = r_jk * numpy.sum(v_ij * cp_jkkl, axis=1)
+  cos_ijkl = numpy.sum(cp_ijjk * cp_jkkl, axis=1)
+  return const.RAD2DEG * numpy.arctan2(sin_ijkl, cos_ijkl)
+
+
+def GetOijklArray(coords_i, coords_j, coords_k, coords_l):
+  """Calculate outofplane angles between arrays of 4 3d cartesian points.
+
+  Args:
+    coords_i (float**): Mx3 array of cartesian coordinates of points i.
+    coords_j (float**): Mx3 array of cartesian coordinates of points j.
+    coords_k (float**): Mx3 array of cartesian coordinates of points k.
+    coords_l (float**): Mx3 array of cartesian coordinates of points l.
+
+  Returns:
+    o_ijkl (float*): Array of M signed angles [degrees] between planes ijk
+        and vectors kl.
+  """
+  u_kikj = GetUcpArray(GetUijArray(coords_k, coords_i),
+                       GetUijArray(coords_k, coords_j))
+  u_kl = GetUijArray(coords_k, coords_l)
+  dp_kikj_kl = numpy.clip(numpy.sum(u_kikj * u_kl, axis=1), -1.0, 1.0)
+  return const.RAD2DEG * numpy.arcsin(dp_kikj_kl)
+
+
 def GetVolume(boundary, boundary_type):
   """Calculate volume of molecular system based on boundary type
   
@@ -161,6 +161,29 @@ class TestGetRij(unittest.TestCase):
     self.assertAlmostEqual(geomcalc.GetRij(*params), 12.1693138)
 
 
+class TestGetRijMatrix(unittest.TestCase):
+  """Unit tests for mmlib.geomcalc.GetRijMatrix method."""
+
+  def testSinglePoint(self):
+    """Asserts zero self distance for a single point."""
+    params = numpy.array([ARBITRARY_XYZ1])
+    test.assertListAlmostEqual(self, geomcalc.GetRijMatrix(params), [[0.0]])
+
+  def testArbitrary(self):
+    """Asserts pairwise values match GetRij for arbitrary points."""
+    params = numpy.array([ORIGIN, ARBITRARY_XYZ1, ARBITRARY_XYZ2])
+    reference = [[geomcalc.GetRij(c_i, c_j) for c_j in params]
+                 for c_i in params]
+    test.assertListAlmostEqual(self, geomcalc.GetRijMatrix(params), reference)
+
+  def testSymmetric(self):
+    """Asserts same value for inverted order of point pairs."""
+    params = numpy.array([ARBITRARY_XYZ1, ARBITRARY_XYZ2])
+    r_ij = geomcalc.GetRijMatrix(params)
+    self.assertAlmostEqual(r_ij[0][1], 12.1693138)
+    self.assertAlmostEqual(r_ij[1][0], 12.1693138)
+
+
 class TestGetUij(unittest.TestCase):
   """Unit tests for mmlib.geomcalc.GetUij method."""
 
@@ -491,18 +514,100 @@ class TestGetOijkl(unittest.TestCase):
     self.assertAlmostEqual(geomcalc.GetOijkl(*params), -28.81956723)
 
 
+class TestGetRijArray(unittest.TestCase):
+  """Unit tests for mmlib.geomcalc.GetRijArray method."""
+
+  def testArbitrary(self):
+    """Asserts values match GetRij for arbitrary point pairs."""
+    params = (numpy.array([ORIGIN, ARBITRARY_XYZ1, ARBITRARY_XYZ2]),
+              numpy.array([ORIGIN, ARBITRARY_XYZ2, ARBITRARY_XYZ1]))
+    reference = [geomcalc.GetRij(c_i, c_j) for c_i, c_j in zip(*params)]
+    test.assertListAlmostEqual(self, geomcalc.GetRijArray(*params), reference)
+
+
+class TestGetUijArray(unittest.TestCase):
+  """Unit tests for mmlib.geomcalc.GetUijArray method."""
+
+  def testArbitrary(self):
+    """Asserts values match GetUij, with zero vector for same points."""
+    params = (numpy.array([ARBITRARY_XYZ1, ARBITRARY_XYZ1, ARBITRARY_XYZ2]),
+              numpy.array([ARBITRARY_XYZ1, ARBITRARY_XYZ2, ARBITRARY_XYZ1]))
+    reference = [geomcalc.GetUij(c_i, c_j) for c_i, c_j in zip(*params)]
+    test.assertListAlmostEqual(self, geomcalc.GetUijArray(*params), reference)
+
+
+class TestGetUcpArray(unittest.TestCase):
+  """Unit tests for mmlib.geomcalc.GetUcpArray method."""
+
+  def testArbitrary(self):
+    """Asserts values match GetUcp, with zero vector for parallel vectors."""
+    params = (numpy.array([UNIT_VECTOR_12, UNIT_VECTOR_12, POSITIVE_UNIT_X]),
+              numpy.array([UNIT_VECTOR_21, POSITIVE_UNIT_Z, POSITIVE_UNIT_Y]))
+    reference = [geomcalc.GetUcp(u_i, u_j) for u_i, u_j in zip(*params)]
+    test.assertListAlmostEqual(self, geomcalc.GetUcpArray(*params), reference)
+
+
+class TestGetAijkArray(unittest.TestCase):
+  """Unit tests for mmlib.geomcalc.GetAijkArray method."""
+
+  def testArbitrary(self):
+    """Asserts values match GetAijk for arbitrary and linear points."""
+    params = (numpy.array([ARBITRARY_XYZ1, ARBITRARY_XYZ2, POSITIVE_UNIT_X]),
+              numpy.array([ARBITRARY_XYZ2, ARBITRARY_XYZ3, ORIGIN]),
+              numpy.array([ARBITRARY_XYZ3, ARBITRARY_XYZ4, NEGATIVE_UNIT_X]))
+    reference = [geomcalc.GetAijk(*coords) for coords in zip(*params)]
+    test.assertListAlmostEqual(self, geomcalc.GetAijkArray(*params), reference)
+
+
+class TestGetTijklArray(unittest.TestCase):
+  """Unit tests for mmlib.geomcalc.GetTijklArray method."""
+
+  def testArbitrary(self):
+    """Asserts values match GetTijkl for arbitrary and planar points."""
+    params = (
+        numpy.array([ARBITRARY_XYZ1, ARBITRARY_XYZ2, POSITIVE_UNIT_X,
+                     POSITIVE_UNIT_X]),
+        numpy.array([ARBITRARY_XYZ2, ARBITRARY_XYZ3, ORIGIN, ORIGIN]),
+        numpy.array([ARBITRARY_XYZ3, ARBITRARY_XYZ4, POSITIVE_UNIT_Y,
+                     POSITIVE_UNIT_Y]),
+        numpy.array([ARBITRARY_XYZ4, ARBITRARY_XYZ5, NEGATIVE_UNIT_Z,
+                     ARBITRARY_UNIT_XY1]))
+    reference = [geomcalc.GetTijkl(*coords) for coords in zip(*params)]
+    test.assertListAlmostEqual(self, geomcalc.GetTijklArray(*params), reference)
+
+
+class TestGetOijklArray(unittest.TestCase):
+  """Unit tests for mmlib.geomcalc.GetOijklArray method."""
+
+  def testArbitrary(self):
+    """Asserts values match GetOijkl for arbitrary and in-plane points."""
+    params = (numpy.array([ARBITRARY_XYZ1, ARBITRARY_XYZ3, ARBITRARY_XY1]),
+              numpy.array([ARBITRARY_XYZ2, ARBITRARY_XYZ2, ARBITRARY_XY2]),
+              numpy.array([ARBITRARY_XYZ3, ARBITRARY_XYZ4, ARBITRARY_XY3]),
+              numpy.array([ARBITRARY_XYZ4, ARBITRARY_XYZ5, ARBITRARY_XY4]))
+    reference = [geomcalc.GetOijkl(*coords) for coords in zip(*params)]
+    test.assertListAlmostEqual(self, geomcalc.GetOijklArray(*params), reference)
+
+
 def suite():
   """Builds a test suite of all unit tests in geomcalc_test module."""
   test_classes = (
       TestGetR2ij,
       TestGetRij,
+      TestGetRijMatrix,
       TestGetUij,
       TestGetUdp,
       TestGetUcp,
       TestGetCp,
       TestGetAijk,
       TestGetTijkl,
-      TestGetOijkl)
+      TestGetOijkl,
+      TestGetRijArray,
+      TestGetUijArray,
+      TestGetUcpArray,
+      TestGetAijkArray,
+      TestGetTijklArray,
+      TestGetOijklArray)
   
   suite = unittest.TestSuite()
   for test_class in test_classes:
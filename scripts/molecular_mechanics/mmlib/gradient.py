@@ -6,7 +6,6 @@ gradient components, and total energy gradient member data for
 mmlib.molecule.Molecule objects.
 """
 
-import itertools
 import math
 import numpy
 
@@ -130,246 +129,309 @@ def GetGMagBoundI(k_box, bound, coord, origin, boundtype):
   return g_bound_i
 
 
-def GetGDirInter(coords1, coords2, r_12=None):
-  """Calculate direction of energy gradient between atom pair.
-  
+def _AddGradients(g_term, idx, g_objects):
+  """Sum gradients of atoms in bonded objects into atomic gradients.
+
   Args:
-    coords1 (float*): 3 Cartesian coordinates [Angstrom] of atom1.
-    coords2 (float*): 3 Cartesian coordiantes [Angstrom] of atom2.
-    r_ij (float): Distance between atom1 and atom2 (default None).
-  
-  Returns:
-    gdir1 (float*), gdir2 (float*): unit vectors in the direction of max
-        increasing inter-atomic distance.
+    g_term (float**): Nx3 array of atomic gradients [kcal/(mol*A)] to fill.
+    idx (int**): MxK array of K atomic indices of M objects.
+    g_objects (float***): MxKx3 array of gradients [kcal/(mol*A)] of the K
+        atoms of each object.
   """
-  gdir1 = geomcalc.GetUij(coords2, coords1, r_12)
-  gdir2 = -1.0 * gdir1
-  return gdir1, gdir2
+  n_atoms = len(g_term)
+  flat_idx = idx.ravel()
+  flat_g = g_objects.reshape(-1, const.NUMDIM)
+  for j in range(const.NUMDIM):
+    g_term[:, j] = numpy.bincount(flat_idx, weights=flat_g[:, j],
+                                  minlength=n_atoms)
 
 
-def GetGDirAngle(coords1, coords2, coords3, r_21=None, r_23=None):
-  """Calculate direction of energy gradients between bond angle atoms.
-  
-  Args:
-    coords1 (float*): 3 cartesian coordinates [Angstrom] of atom1.
-    coords2 (float*): 3 cartesian coordinates [Angstrom] of atom2.
-    coords3 (float*): 3 cartesian coordinates [Angstrom] of atom3.
-    r_21 (float): Distance between atom2 and atom1 (default None).
-    r_23 (float): Distance between atom2 and atom3 (default None).
+def _GetDot(vec_i, vec_j):
+  """Dot products of rows of two Mx3 arrays of vectors."""
+  return numpy.sum(vec_i * vec_j, axis=1)[:, numpy.newaxis]
 
-  Returns:
-    gdir1 (float*), gdir2 (float*), gdir3 (float*): vectors in the direction of
-        max increasing bond angle.
-  """
-  u_21 = geomcalc.GetUij(coords2, coords1, r_21)
-  u_23 = geomcalc.GetUij(coords2, coords3, r_23)
-  cp = geomcalc.GetUcp(u_21, u_23)
-  gdir1 = geomcalc.GetUcp(u_21, cp) / r_21
-  gdir3 = geomcalc.GetUcp(cp, u_23) / r_23
-  gdir2 = -1.0 * (gdir1 + gdir3)
-  return gdir1, gdir2, gdir3
-
-
-def GetGDirTorsion(coords1, coords2, coords3, coords4, r_12=None, r_23=None,
-                   r_34=None):
-  """Calculate direction of energy gradients between torsion atoms.
-  
-  Args:
-    coords1 (float*): 3 cartesian coordinates [Angstrom] of atom1.
-    coords2 (float*): 3 cartesian coordinates [Angstrom] of atom2.
-    coords3 (float*): 3 cartesian coordinates [Angstrom] of atom3.
-    coords4 (float*): 3 cartesian coordinates [Angstrom] of atom4.
-    r_12 (float): Distance between atom1 and atom2 (default None).
-    r_23 (float): Distance between atom2 and atom3 (default None).
-    r_34 (float): Distance between atom3 and atom4 (default None).
-  
-  Returns:
-    gdir1 (float*), gdir2 (float*), gdir3 (float*), gdir4 (float*): Vectors in
-        the direction of max increasing torsion angle.
-  """
-  u_21 = geomcalc.GetUij(coords2, coords1, r_12)
-  u_34 = geomcalc.GetUij(coords3, coords4, r_34)
-  u_23 = geomcalc.GetUij(coords2, coords3, r_23)
-  u_32 = -1.0 * u_23
-  a_123 = geomcalc.GetAijk(coords1, coords2, coords3, r_12, r_23)
-  a_432 = geomcalc.GetAijk(coords4, coords3, coords2, r_34, r_23)
-  s_123 = math.sin(const.DEG2RAD * a_123)
-  s_432 = math.sin(const.DEG2RAD * a_432)
-  c_123 = math.cos(const.DEG2RAD * a_123)
-  c_432 = math.cos(const.DEG2RAD * a_432)
-  gdir1 = geomcalc.GetUcp(u_21, u_23) / (r_12*s_123)
-  gdir4 = geomcalc.GetUcp(u_34, u_32) / (r_34*s_432)
-  gdir2 = (r_12/r_23*c_123 - 1.0)*gdir1 - (r_34/r_23*c_432)*gdir4
-  gdir3 = (r_34/r_23*c_432 - 1.0)*gdir4 - (r_12/r_23*c_123)*gdir1
-  return gdir1, gdir2, gdir3, gdir4
-
-
-def GetGDirOutofplane(coords1, coords2, coords3, coords4, oop, r_31=None,
-                      r_32=None, r_34=None):
-  """Calculate direction of energy gradients between outofplane atoms.
-  
-  Args:
-    coords1 (float*): 3 cartesian coordinates [Angstrom] of atom1.
-    coords2 (float*): 3 cartesian coordinates [Angstrom] of atom2.
-    coords3 (float*): 3 cartesian coordinates [Angstrom] of atom3.
-    coords4 (float*): 3 cartesian coordinates [Angstrom] of atom4.
-    oop (float): Out-of-plane angles bewteen atoms 1, 2, 3, and 4.
-    r_31 (float): Distance between atom3 and atom1 (default None).
-    r_32 (float): Distance between atom3 and atom2 (default None).
-    r_34 (float): Distance between atom3 and atom4 (default None).
-  
-  Returns:
-    gdir1 (float*), gdir2 (float*), gdir3 (float*), gdir4 (float*): Vectors in
-        the direction of max increasing outofplane angle.
-  """
-  u_31 = geomcalc.GetUij(coords3, coords1, r_31)
-  u_32 = geomcalc.GetUij(coords3, coords2, r_32)
-  u_34 = geomcalc.GetUij(coords3, coords4, r_34)
-  cp_3234 = geomcalc.GetCp(u_32, u_34)
-  cp_3431 = geomcalc.GetCp(u_34, u_31)
-  cp_3132 = geomcalc.GetCp(u_31, u_32)
-  a_132 = geomcalc.GetAijk(coords1, coords3, coords2)
-  s_132 = math.sin(const.DEG2RAD * a_132)
-  c_132 = math.cos(const.DEG2RAD * a_132)
-  c_oop = math.cos(const.DEG2RAD * oop)
-  t_oop = math.tan(const.DEG2RAD * oop)
-  gdir1 = ((1.0 / r_31) * (cp_3234 / (c_oop*s_132)
-      - (t_oop/s_132**2) * (u_31 - c_132*u_32)))
-  gdir2 = ((1.0 / r_32) * (cp_3431 / (c_oop*s_132)
-      - (t_oop/s_132**2) * (u_32 - c_132*u_31)))
-  gdir4 = ((1.0 / r_34) * (cp_3132 / (c_oop*s_132) - (t_oop*u_34)))
-  gdir3 = -1.0 * (gdir1 + gdir2 + gdir4)
-  return gdir1, gdir2, gdir3, gdir4
-
-
-def GetGBonds(g_bonds, bonds, atoms):
+
+def GetGBonds(g_bonds, coords, bond_idx, r_ij, r_eq, k_b):
   """Calculate bond length energy gradients for all bonds.
   
   Args:
     g_bonds (float**): Nx3 array of molecule's atomic bond gradients
         [kcal/(mol*A)].
-    bonds (mmlib.molecule.Bond*): Array of molecule's Bond objects.
-    atoms (mmlib.molecule.Atom*): Array of molecule's Atom objects.
+    coords (float**): Nx3 array of atomic coordinates [Angstrom].
+    bond_idx (int**): Mx2 array of bonded atomic indices.
+    r_ij (float*): Array of bond lengths [Angstrom].
+    r_eq (float*): Array of equilibrium bond lengths [Angstrom].
+    k_b (float*): Array of bond spring constants [kcal/(mol*A^2)].
   """
-  g_bonds.fill(0.0)
-  for bond in bonds:
-    bond.GetGradientMagnitude()
-    c1 = atoms[bond.at1].coords
-    c2 = atoms[bond.at2].coords
-    dir1, dir2 = GetGDirInter(c1, c2, bond.r_ij)
-    g_bonds[bond.at1] += bond.grad_mag * dir1
-    g_bonds[bond.at2] += bond.grad_mag * dir2
+  c1, c2 = coords[bond_idx.T]
+  g_mag = GetGMagBond(r_ij, r_eq, k_b)[:, numpy.newaxis]
+  g1 = g_mag * geomcalc.GetUijArray(c2, c1, r_ij)
+  _AddGradients(g_bonds, bond_idx, numpy.stack((g1, -g1), axis=1))
 
 
-def GetGAngles(g_angles, angles, atoms, bond_graph):
+def GetGAngles(g_angles, coords, angle_idx, a_ijk, a_eq, k_a):
   """Calculate angle bend energy gradients for all angles.
   
   Args:
     g_angles (float**): Nx3 array of molecule's atomic angle gradients
         [kcal/(mol*A)].
-    angles (mmlib.molecule.Angle*): Array of molecule's Angle objects.
-    atoms (mmlib.molecule.Atom*): Array of molecule's Atom objects.
-    bond_graph (int:(int:float)): Dictionary of bond connectivity.
+    coords (float**): Nx3 array of atomic coordinates [Angstrom].
+    angle_idx (int**): Mx3 array of angle atomic indices.
+    a_ijk (float*): Array of bond angles [degrees].
+    a_eq (float*): Array of equilibrium bond angles [degrees].
+    k_a (float*): Array of angle spring constants [kcal/(mol*rad^2)].
   """
-  g_angles.fill(0.0)
-  for angle in angles:
-    angle.GetGradientMagnitude()
-    c1 = atoms[angle.at1].coords
-    c2 = atoms[angle.at2].coords
-    c3 = atoms[angle.at3].coords
-    r12 = bond_graph[angle.at1][angle.at2]
-    r23 = bond_graph[angle.at2][angle.at3]
-    dir1, dir2, dir3 = GetGDirAngle(c1, c2, c3, r12, r23)
-    g_angles[angle.at1] += angle.grad_mag * dir1
-    g_angles[angle.at2] += angle.grad_mag * dir2
-    g_angles[angle.at3] += angle.grad_mag * dir3
-
-
-def GetGTorsions(g_torsions, torsions, atoms, bond_graph):
+  c1, c2, c3 = coords[angle_idx.T]
+  r_21 = geomcalc.GetRijArray(c2, c1)[:, numpy.newaxis]
+  r_23 = geomcalc.GetRijArray(c2, c3)[:, numpy.newaxis]
+  u_21 = geomcalc.GetUijArray(c2, c1)
+  u_23 = geomcalc.GetUijArray(c2, c3)
+  cp = geomcalc.GetUcpArray(u_21, u_23)
+  g_mag = GetGMagAngle(a_ijk, a_eq, k_a)[:, numpy.newaxis]
+  g1 = g_mag * geomcalc.GetUcpArray(u_21, cp) / r_21
+  g3 = g_mag * geomcalc.GetUcpArray(cp, u_23) / r_23
+  _AddGradients(g_angles, angle_idx, numpy.stack((g1, -(g1 + g3), g3), axis=1))
+
+
+def GetGTorsions(g_torsions, coords, torsion_idx, t_ijkl, v_n, gamma, nfold,
+                 paths):
   """Calculate torsion strain energy gradients for all torsions.
   
   Args:
     g_torsions (float**): Nx3 array of molecule's atomic torsion gradients
         [kcal/(mol*A)].
-    torsions (mmlib.molecule.Angle*): Array of molecule's Torsion objects.
-    atoms (mmlib.molecule.Atom*): Array of molecule's Atom objects.
-    bond_graph (int:(int:float)): Dictionary of bond connectivity.
+    coords (float**): Nx3 array of atomic coordinates [Angstrom].
+    torsion_idx (int**): Mx4 array of torsion atomic indices.
+    t_ijkl (float*): Array of torsion angles [degrees].
+    v_n (float*): Array of torsion half-barrier heights [kcal/mol].
+    gamma (float*): Array of torsion barrier offsets [degrees].
+    nfold (float*): Array of torsion barrier frequencies.
+    paths (float*): Array of unique paths through torsions.
   """
-  g_torsions.fill(0.0)
-  for torsion in torsions:
-    torsion.GetGradientMagnitude()
-    c1 = atoms[torsion.at1].coords
-    c2 = atoms[torsion.at2].coords
-    c3 = atoms[torsion.at3].coords
-    c4 = atoms[torsion.at4].coords
-    r12 = bond_graph[torsion.at1][torsion.at2]
-    r23 = bond_graph[torsion.at2][torsion.at3]
-    r34 = bond_graph[torsion.at3][torsion.at4]
-    dir1, dir2, dir3, dir4 = GetGDirTorsion(c1, c2, c3, c4, r12, r23, r34)
-    g_torsions[torsion.at1] += torsion.grad_mag * dir1
-    g_torsions[torsion.at2] += torsion.grad_mag * dir2
-    g_torsions[torsion.at3] += torsion.grad_mag * dir3
-    g_torsions[torsion.at4] += torsion.grad_mag * dir4
-
-
-def GetGOutofplanes(g_outofplanes, outofplanes, atoms, bond_graph):
+  c1, c2, c3, c4 = coords[torsion_idx.T]
+  r_12 = geomcalc.GetRijArray(c1, c2)[:, numpy.newaxis]
+  r_23 = geomcalc.GetRijArray(c2, c3)[:, numpy.newaxis]
+  r_34 = geomcalc.GetRijArray(c3, c4)[:, numpy.newaxis]
+  u_21 = geomcalc.GetUijArray(c2, c1)
+  u_23 = geomcalc.GetUijArray(c2, c3)
+  u_34 = geomcalc.GetUijArray(c3, c4)
+  c_123 = numpy.clip(_GetDot(u_21, u_23), -1.0, 1.0)
+  c_432 = numpy.clip(-_GetDot(u_34, u_23), -1.0, 1.0)
+  s_123 = numpy.sqrt(1.0 - c_123**2)
+  s_432 = numpy.sqrt(1.0 - c_432**2)
+  g_mag = (-v_n * nfold * numpy.sin(const.DEG2RAD * (nfold*t_ijkl - gamma))
+           / paths)[:, numpy.newaxis]
+  g1 = g_mag * geomcalc.GetUcpArray(u_21, u_23) / (r_12*s_123)
+  g4 = g_mag * geomcalc.GetUcpArray(u_34, -u_23) / (r_34*s_432)
+  g2 = (r_12/r_23*c_123 - 1.0)*g1 - (r_34/r_23*c_432)*g4
+  g3 = (r_34/r_23*c_432 - 1.0)*g4 - (r_12/r_23*c_123)*g1
+  _AddGradients(g_torsions, torsion_idx, numpy.stack((g1, g2, g3, g4), axis=1))
+
+
+def GetGOutofplanes(g_outofplanes, coords, outofplane_idx, o_ijkl, v_n):
   """Calculate outofplane bend energy gradients for all outofplanes.
   
   Args:
     g_outofplanes (float**): Nx3 array of molecule's atomic outofplane gradients
         [kcal/(mol*A)].
-    outofplanes (mmlib.molecule.Angle*): Array of molecule's Outofplane objects.
-    atoms (mmlib.molecule.Atom*): Array of molecule's Atom objects.
-    bond_graph (int:(int:float)): Dictionary of bond connectivity.
+    coords (float**): Nx3 array of atomic coordinates [Angstrom].
+    outofplane_idx (int**): Mx4 array of outofplane atomic indices.
+    o_ijkl (float*): Array of outofplane angles [degrees].
+    v_n (float*): Array of outofplane half-barrier heights [kcal/mol].
+  """
+  c1, c2, c3, c4 = coords[outofplane_idx.T]
+  r_31 = geomcalc.GetRijArray(c3, c1)[:, numpy.newaxis]
+  r_32 = geomcalc.GetRijArray(c3, c2)[:, numpy.newaxis]
+  r_34 = geomcalc.GetRijArray(c3, c4)[:, numpy.newaxis]
+  u_31 = geomcalc.GetUijArray(c3, c1)
+  u_32 = geomcalc.GetUijArray(c3, c2)
+  u_34 = geomcalc.GetUijArray(c3, c4)
+  c_132 = numpy.clip(_GetDot(u_31, u_32), -1.0, 1.0)
+  s_132 = numpy.sqrt(1.0 - c_132**2)
+  oop = const.DEG2RAD * o_ijkl[:, numpy.newaxis]
+  c_oop = numpy.cos(oop)
+  t_oop = numpy.tan(oop)
+  g_mag = -2.0 * v_n[:, numpy.newaxis] * numpy.sin(2.0*oop - math.pi)
+  g1 = g_mag / r_31 * (numpy.cross(u_32, u_34) / (c_oop*s_132)
+      - (t_oop/s_132**2) * (u_31 - c_132*u_32))
+  g2 = g_mag / r_32 * (numpy.cross(u_34, u_31) / (c_oop*s_132)
+      - (t_oop/s_132**2) * (u_32 - c_132*u_31))
+  g4 = g_mag / r_34 * (numpy.cross(u_31, u_32) / (c_oop*s_132) - t_oop*u_34)
+  _AddGradients(g_outofplanes, outofplane_idx,
+                numpy.stack((g1, g2, -(g1 + g2 + g4), g4), axis=1))
+
+
+def GetGNonbonded(g_vdw, g_elst, coords, charge, attype_id, lj_a, lj_b,
+                  nonint_mask, dielectric):
+  """Calculate non-bonded energy gradients between all nonbonded atom pairs.
+  
+  Computes van der waals and electrostatic energy gradient [kcal/(mol*A)]
+  components between all pairs of non-bonded atoms in a system. Pair gradients
+  are evaluated as NxN arrays, with excluded pairs placed at infinite
+  separation. Van der waals coefficients are gathered from tables of vdw type
+  pairs, so no powers of vdw radii are computed per pair.
+
+  Args:
+    g_vdw (float**): Nx3 array of molecule's van der waals gradients.
+    g_elst (float**): Nx3 array of molecule's electrostatic gradients.
+    coords (float**): Nx3 array of atomic coordinates [Angstrom].
+    charge (float*): Array of atomic partial charges [e].
+    attype_id (int*): Array of atomic vdw type indices.
+    lj_a (float**): TxT array of repulsive vdw coefficients [kcal*A^12/mol].
+    lj_b (float**): TxT array of attractive vdw coefficients [kcal*A^6/mol].
+    nonint_mask (bool**): NxN array, True for atom pairs (including self
+        pairs) without nonbonded interactions.
+    dielectric (float): Dielectric constant of molecule.
+  """
+  dr_ij = coords[:, numpy.newaxis, :] - coords[numpy.newaxis, :, :]
+  r2_ij = numpy.sum(dr_ij**2, axis=2)
+  r2_ij[nonint_mask] = float('inf')
+  r_ij = numpy.sqrt(r2_ij)
+  ir2_ij = 1.0 / r2_ij
+  ir6_ij = ir2_ij * ir2_ij * ir2_ij
+  lj_a_ij = lj_a[attype_id][:, attype_id]
+  lj_b_ij = lj_b[attype_id][:, attype_id]
+  q_i = charge[:, numpy.newaxis]
+
+  # Gradient magnitudes divided by r_ij scale the unnormalized dr_ij vectors.
+  g_vdw_ij = (6.0 * lj_b_ij
+              - 12.0 * lj_a_ij * ir6_ij) * ir6_ij * ir2_ij
+  g_elst_ij = GetGMagElstIJ(r_ij, q_i, charge, dielectric) / r_ij
+  numpy.einsum('ij,ijk->ik', g_vdw_ij, dr_ij, out=g_vdw)
+  numpy.einsum('ij,ijk->ik', g_elst_ij, dr_ij, out=g_elst)
+
+
+def GetGNonbondedPairs(g_vdw, g_elst, coords, charge, attype_id, lj_a, lj_b,
+                       pairs, rcut, dielectric):
+  """Calculate non-bonded energy gradients of atom pairs within a cutoff.
+  
+  Computes van der waals and electrostatic energy gradient [kcal/(mol*A)]
+  components of listed atom pairs closer than 'rcut'. Interactions are
+  truncated at 'rcut' without shifting or switching.
+
+  Args:
+    g_vdw (float**): Nx3 array of molecule's van der waals gradients.
+    g_elst (float**): Nx3 array of molecule's electrostatic gradients.
+    coords (float**): Nx3 array of atomic coordinates [Angstrom].
+    charge (float*): Array of atomic partial charges [e].
+    attype_id (int*): Array of atomic vdw type indices.
+    lj_a (float**): TxT array of repulsive vdw coefficients [kcal*A^12/mol].
+    lj_b (float**): TxT array of attractive vdw coefficients [kcal*A^6/mol].
+    pairs (int**): Mx2 array of atomic indices of interacting atom pairs,
+        including all pairs within 'rcut'.
+    rcut (float): Cutoff distance [Angstrom] of nonbonded interactions.
+    dielectric (float): Dielectric constant of molecule.
+  """
+  dr_ij = coords[pairs[:, 0]] - coords[pairs[:, 1]]
+  r2_ij = numpy.sum(dr_ij**2, axis=1)
+  within = r2_ij < rcut**2
+  pairs, dr_ij, r2_ij = pairs[within], dr_ij[within], r2_ij[within]
+  i, j = pairs[:, 0], pairs[:, 1]
+  r_ij = numpy.sqrt(r2_ij)
+  ir2_ij = 1.0 / r2_ij
+  ir6_ij = ir2_ij * ir2_ij * ir2_ij
+  t_i, t_j = attype_id[i], attype_id[j]
+
+  g_vdw_ij = ((6.0 * lj_b[t_i, t_j] - 12.0 * lj_a[t_i, t_j] * ir6_ij)
+              * ir6_ij * ir2_ij)[:, numpy.newaxis] * dr_ij
+  g_elst_ij = (GetGMagElstIJ(r_ij, charge[i], charge[j], dielectric)
+               / r_ij)[:, numpy.newaxis] * dr_ij
+  _AddGradients(g_vdw, pairs, numpy.stack((g_vdw_ij, -g_vdw_ij), axis=1))
+  _AddGradients(g_elst, pairs, numpy.stack((g_elst_ij, -g_elst_ij), axis=1))
+
+
+def GetEGNonbonded(g_vdw, g_elst, coords, charge, attype_id, lj_a, lj_b,
+                   nonint_mask, dielectric):
+  """Calculate non-bonded energy and gradients between all atom pairs.
+  
+  Combines mmlib.energy.GetENonbonded and GetGNonbonded, with pair distances
+  and inverse powers evaluated once as NxN arrays for both pair energies and
+  gradients.
+
+  Args:
+    g_vdw (float**): Nx3 array of molecule's van der waals gradients.
+    g_elst (float**): Nx3 array of molecule's electrostatic gradients.
+    coords (float**): Nx3 array of atomic coordinates [Angstrom].
+    charge (float*): Array of atomic partial charges [e].
+    attype_id (int*): Array of atomic vdw type indices.
+    lj_a (float**): TxT array of repulsive vdw coefficients [kcal*A^12/mol].
+    lj_b (float**): TxT array of attractive vdw coefficients [kcal*A^6/mol].
+    nonint_mask (bool**): NxN array, True for atom pairs (including self
+        pairs) without nonbonded interactions.
+    dielectric (float): Dielectric constant of molecule.
+
+  Returns:
+    e_vdw (float): Van der waals energy [kcal/mol] of molecule.
+    e_elst (float): Electrostatic energy [kcal/mol] of molecule.
   """
-  g_outofplanes.fill(0.0)
-  for outofplane in outofplanes:
-    outofplane.GetGradientMagnitude()
-    c1 = atoms[outofplane.at1].coords
-    c2 = atoms[outofplane.at2].coords
-    c3 = atoms[outofplane.at3].coords
-    c4 = atoms[outofplane.at4].coords
-    r31 = bond_graph[outofplane.at3][outofplane.at1]
-    r32 = bond_graph[outofplane.at3][outofplane.at2]
-    r34 = bond_graph[outofplane.at3][outofplane.at4]
-    dir1, dir2, dir3, dir4 = GetGDirOutofplane(
-        c1, c2, c3, c4, outofplane.o_ijkl, r31, r32, r34)
-    g_outofplanes[outofplane.at1] += outofplane.grad_mag * dir1
-    g_outofplanes[outofplane.at2] += outofplane.grad_mag * dir2
-    g_outofplanes[outofplane.at3] += outofplane.grad_mag * dir3
-    g_outofplanes[outofplane.at4] += outofplane.grad_mag * dir4
-
-
-def GetGNonbonded(g_vdw, g_elst, atoms, nonints, dielectric):
-    """Calculate non-bonded energy gradients between all nonbonded atom pairs.
-    
-    Computes van der waals and electrostatic energy gradient [kcal/(mol*A)]
-    components between all pairs of non-bonded atoms in a system.
-
-    Args:
-      g_vdw (float**): Nx3 array of molecule's van der waals gradients.
-      g_elst (float**): Nx3 array of molecule's electrostatic gradients.
-      atoms (mmlib.molecule.Atom*): Array of molecule's Atom objects.
-      nonints (set(int, int)): Set of atomic index pairs of atoms without
-          nonbonded interactions due to covalent (near-)ajecency.
-      dielectric (float): Dielectric constant of molecule.
-    """
-    g_vdw.fill(0.0)
-    g_elst.fill(0.0)
-    for i, j in itertools.combinations(range(len(atoms)), 2):
-      if (i, j) in nonints:
-        continue
-      atom1, atom2 = atoms[i], atoms[j]
-      r_ij = geomcalc.GetRij(atom1.coords, atom2.coords)
-      dir1, dir2 = GetGDirInter(atom1.coords, atom2.coords, r_ij)
-      eps_ij = atom1.sreps * atom2.sreps
-      ro_ij = atom1.ro + atom2.ro
-      g_elst_mag = GetGMagElstIJ(r_ij, atom1.charge, atom2.charge, dielectric)
-      g_vdw_mag = GetGMagVdwIJ(r_ij, eps_ij, ro_ij)
-      g_vdw[i] += g_vdw_mag * dir1
-      g_vdw[j] += g_vdw_mag * dir2
-      g_elst[i] += g_elst_mag * dir1
-      g_elst[j] += g_elst_mag * dir2
+  dr_ij = coords[:, numpy.newaxis, :] - coords[numpy.newaxis, :, :]
+  r2_ij = numpy.sum(dr_ij**2, axis=2)
+  r2_ij[nonint_mask] = float('inf')
+  ir2_ij = 1.0 / r2_ij
+  ir6_ij = ir2_ij * ir2_ij * ir2_ij
+  a_ir6_ij = lj_a[attype_id][:, attype_id] * ir6_ij
+  lj_b_ij = lj_b[attype_id][:, attype_id]
+  e_elst_ij = (const.CEU2KCAL / dielectric * charge[:, numpy.newaxis]
+               * charge * numpy.sqrt(ir2_ij))
+
+  g_vdw_ij = (6.0 * lj_b_ij - 12.0 * a_ir6_ij) * ir6_ij * ir2_ij
+  g_elst_ij = -e_elst_ij * ir2_ij
+  numpy.einsum('ij,ijk->ik', g_vdw_ij, dr_ij, out=g_vdw)
+  numpy.einsum('ij,ijk->ik', g_elst_ij, dr_ij, out=g_elst)
+
+  # Each pair appears twice in the symmetric NxN arrays.
+  e_vdw = 0.5 * numpy.sum((a_ir6_ij - lj_b_ij) * ir6_ij, dtype=numpy.float64)
+  e_elst = 0.5 * numpy.sum(e_elst_ij, dtype=numpy.float64)
+  return e_vdw, e_elst
+
+
+def GetEGNonbondedPairs(g_vdw, g_elst, coords, charge, attype_id, lj_a, lj_b,
+                        pairs, rcut, dielectric):
+  """Calculate non-bonded energy and gradients of atom pairs within a cutoff.
+  
+  Combines mmlib.energy.GetENonbondedPairs and GetGNonbondedPairs, with pair
+  distances and inverse powers evaluated once for both pair energies and
+  gradients.
+
+  Args:
+    g_vdw (float**): Nx3 array of molecule's van der waals gradients.
+    g_elst (float**): Nx3 array of molecule's electrostatic gradients.
+    coords (float**): Nx3 array of atomic coordinates [Angstrom].
+    charge (float*): Array of atomic partial charges [e].
+    attype_id (int*): Array of atomic vdw type indices.
+    lj_a (float**): TxT array of repulsive vdw coefficients [kcal*A^12/mol].
+    lj_b (float**): TxT array of attractive vdw coefficients [kcal*A^6/mol].
+    pairs (int**): Mx2 array of atomic indices of interacting atom pairs,
+        including all pairs within 'rcut'.
+    rcut (float): Cutoff distance [Angstrom] of nonbonded interactions.
+    dielectric (float): Dielectric constant of molecule.
+
+  Returns:
+    e_vdw (float): Van der waals energy [kcal/mol] of molecule.
+    e_elst (float): Electrostatic energy [kcal/mol] of molecule.
+  """
+  dr_ij = coords[pairs[:, 0]] - coords[pairs[:, 1]]
+  r2_ij = numpy.sum(dr_ij**2, axis=1)
+  within = r2_ij < rcut**2
+  pairs, dr_ij, r2_ij = pairs[within], dr_ij[within], r2_ij[within]
+  i, j = pairs[:, 0], pairs[:, 1]
+  ir2_ij = 1.0 / r2_ij
+  ir6_ij = ir2_ij * ir2_ij * ir2_ij
+  t_i, t_j = attype_id[i], attype_id[j]
+  a_ir6_ij = lj_a[t_i, t_j] * ir6_ij
+  lj_b_ij = lj_b[t_i, t_j]
+  e_elst_ij = (const.CEU2KCAL / dielectric * charge[i] * charge[j]
+               * numpy.sqrt(ir2_ij))
+
+  g_vdw_ij = ((6.0 * lj_b_ij - 12.0 * a_ir6_ij)
+              * ir6_ij * ir2_ij)[:, numpy.newaxis] * dr_ij
+  g_elst_ij = (-e_elst_ij * ir2_ij)[:, numpy.newaxis] * dr_ij
+  _AddGradients(g_vdw, pairs, numpy.stack((g_vdw_ij, -g_vdw_ij), axis=1))
+  _AddGradients(g_elst, pairs, numpy.stack((g_elst_ij, -g_elst_ij), axis=1))
+
+  e_vdw = numpy.sum((a_ir6_ij - lj_b_ij) * ir6_ij, dtype=numpy.float64)
+  e_elst = numpy.sum(e_elst_ij, dtype=numpy.float64)
+  return e_vdw, e_elst
 
 
 def GetGBound(g_bound, atoms, k_box, boundary, origin, boundary_type):
@@ -454,12 +516,14 @@ def GetGNumerical(mol):
       mol.atoms[i].coords[j] = qm
       mol.UpdateInternals()
       mol.GetEnergy()
-      em_bond, em_ang, em_tor, em_oop, em_vdw, e_elst, em_bound = (
+      em_bond, em_ang, em_tor, em_oop, em_vdw, em_elst, em_bound = (
           mol.e_bonds, mol.e_angles, mol.e_torsions, mol.e_outofplanes,
           mol.e_vdw, mol.e_elst, mol.e_bound)
 
       # Return to original coordinate and compute all gradient components.
       mol.atoms[i].coords[j] = q
+      mol.UpdateInternals()
+      disp = const.NUMDISP
       mol.g_bonds[i][j] = (ep_bond - em_bond) / disp
       mol.g_angles[i][j] = (ep_ang - em_ang) / disp
       mol.g_torsions[i][j] = (ep_tor - em_tor) / disp
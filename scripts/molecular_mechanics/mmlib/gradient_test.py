@@ -1,15 +1,95 @@
-"""Classes and functions for unit tetsing the mmlib molecule module."""
+"""Classes and functions for unit testing the mmlib gradient module."""
 
+import numpy
 import unittest
 
-class Test(unittest.TestCase):
-  """Unit tests for mmlib. method."""
+from mmlib import constants as const
+from mmlib import energy
+from mmlib import geomcalc
+from mmlib import gradient
+from mmlib import test
+
+class _BondedTestCase(unittest.TestCase):
+  """Shared finite difference check of bonded energy gradients."""
+
+  def _AssertNumericalGradient(self, get_e, get_g):
+    coords = test.CHAIN_COORDS
+    g_test = numpy.zeros(coords.shape)
+    get_g(g_test, coords)
+    g_ref = numpy.zeros(coords.shape)
+    for i in range(len(coords)):
+      for j in range(const.NUMDIM):
+        coords_p, coords_m = numpy.copy(coords), numpy.copy(coords)
+        coords_p[i][j] += 0.5 * const.NUMDISP
+        coords_m[i][j] -= 0.5 * const.NUMDISP
+        g_ref[i][j] = (get_e(coords_p) - get_e(coords_m)) / const.NUMDISP
+    test.assertListAlmostEqual(self, g_test, g_ref)
+
+
+class TestGetGBonds(_BondedTestCase):
+  """Unit tests for mmlib.gradient.GetGBonds method."""
+
+  def testNumericalGradient(self):
+    """Asserts gradient equal to numerical gradient of bond energy."""
+    idx = numpy.array([[0, 1], [1, 2], [2, 3]])
+    k_b, r_eq = numpy.array([300.0, 250.0, 300.0]), numpy.array([1.1, 1.5, 1.2])
+    self._AssertNumericalGradient(
+        lambda c: energy.GetEBonds(
+            geomcalc.GetRijArray(*c[idx.T]), r_eq, k_b),
+        lambda g, c: gradient.GetGBonds(
+            g, c, idx, geomcalc.GetRijArray(*c[idx.T]), r_eq, k_b))
+
+
+class TestGetGAngles(_BondedTestCase):
+  """Unit tests for mmlib.gradient.GetGAngles method."""
+
+  def testNumericalGradient(self):
+    """Asserts gradient equal to numerical gradient of angle energy."""
+    idx = numpy.array([[0, 1, 2], [1, 2, 3]])
+    k_a, a_eq = numpy.array([40.0, 50.0]), numpy.array([109.5, 120.0])
+    self._AssertNumericalGradient(
+        lambda c: energy.GetEAngles(
+            geomcalc.GetAijkArray(*c[idx.T]), a_eq, k_a),
+        lambda g, c: gradient.GetGAngles(
+            g, c, idx, geomcalc.GetAijkArray(*c[idx.T]), a_eq, k_a))
+
+
+class TestGetGTorsions(_BondedTestCase):
+  """Unit tests for mmlib.gradient.GetGTorsions method."""
+
+  def testNumericalGradient(self):
+    """Asserts gradient equal to numerical gradient of torsion energy."""
+    idx = numpy.array([[0, 1, 2, 3]])
+    params = (numpy.array([1.4]), numpy.array([30.0]), numpy.array([3.0]),
+              numpy.array([2.0]))
+    self._AssertNumericalGradient(
+        lambda c: energy.GetETorsions(
+            geomcalc.GetTijklArray(*c[idx.T]), *params),
+        lambda g, c: gradient.GetGTorsions(
+            g, c, idx, geomcalc.GetTijklArray(*c[idx.T]), *params))
+
+
+class TestGetGOutofplanes(_BondedTestCase):
+  """Unit tests for mmlib.gradient.GetGOutofplanes method."""
+
+  def testNumericalGradient(self):
+    """Asserts gradient equal to numerical gradient of outofplane energy."""
+    idx = numpy.array([[0, 3, 1, 2]])
+    v_n = numpy.array([2.5])
+    self._AssertNumericalGradient(
+        lambda c: energy.GetEOutofplanes(
+            geomcalc.GetOijklArray(*c[idx.T]), v_n),
+        lambda g, c: gradient.GetGOutofplanes(
+            g, c, idx, geomcalc.GetOijklArray(*c[idx.T]), v_n))
 
 
 def suite():
-  """Builds a test suite of all unit test in _test module."""
+  """Builds a test suite of all unit tests in gradient_test module."""
   test_classes = (
-    Test)
+      TestGetGBonds,
+      TestGetGAngles,
+      TestGetGTorsions,
+      TestGetGOutofplanes)
 
   suite = unittest.TestSuite()
   for test_class in test_classes:
@@ -10,17 +10,76 @@ import os
 
 from mmlib import constants as const
 from mmlib import energy
+from mmlib import energy_jax
 from mmlib import fileio
 from mmlib import geomcalc
 from mmlib import gradient
+from mmlib import nonbonded
+from mmlib import nonbonded_cuda
 from mmlib import param
 from mmlib import topology
 
+# Per-atom data stored as contiguous arrays (structure of arrays), with NUMDIM
+# cartesian components per atom for vector fields and one value for scalars.
+_ATOM_VECTOR_FIELDS = ('coords', 'vels', 'accs', 'pvels', 'paccs')
+_ATOM_SCALAR_FIELDS = ('charge', 'ro', 'eps', 'sreps', 'mass', 'covrad')
+
+def _AllocAtomArrays(data, n_atoms, dtype=numpy.float64):
+  """Allocate zeroed per-atom data arrays as attributes of an object.
+
+  Args:
+    data (object): Object to hold arrays, e.g. mmlib.molecule.Molecule.
+    n_atoms (int): Number of atoms (array rows) to allocate.
+    dtype (type): Floating point type of array elements.
+  """
+  for field in _ATOM_VECTOR_FIELDS:
+    setattr(data, field, numpy.zeros((n_atoms, const.NUMDIM), dtype=dtype))
+  for field in _ATOM_SCALAR_FIELDS:
+    setattr(data, field, numpy.zeros(n_atoms, dtype=dtype))
+
+
+def _AtomArrayProperty(field, doc):
+  """Build property forwarding an Atom attribute to its row of an array.
+
+  Args:
+    field (str): Name of per-atom array attribute of Atom data owner.
+    doc (str): Docstring of property.
+
+  Returns:
+    prop (property): Get / set access to row '_index' of '_mol.[field]'.
+  """
+  def Get(atom):
+    return getattr(atom._mol, field)[atom._index]
+
+  def Set(atom, value):
+    getattr(atom._mol, field)[atom._index] = value
+
+  return property(Get, Set, doc=doc)
+
+
+class _AtomArrays:
+  """Per-atom data arrays for Atom objects not yet owned by a Molecule.
+
+  Args:
+    n_atoms (int): Number of atoms (array rows) to allocate.
+  """
+  def __init__(self, n_atoms):
+    _AllocAtomArrays(self, n_atoms)
+
+
 class Atom:
   """Atom class for atomic geometry and parameter data.
   
   Initialize attributes to corresponding specified argument values, look up in
   parameter tables, or set to zero.
+
+  Numeric data is not stored on the Atom itself, but in row '_index' of the
+  per-atom arrays of '_mol'. An Atom created without a molecule owns a
+  single-row array block instead.
+
+  Molecule nonbonded parameter tables are built from atomic charges, radii
+  and epsilons on load. After assigning 'charge', 'ro' or 'eps' of an atom in
+  a loaded Molecule, call Molecule.UpdateNonbondedParams.
   
   Args / Attributes:
     type_ (str): AMBER94 mm atom type.
@@ -30,6 +89,11 @@ class Atom:
     eps (float): vdw epsilon [kcal/mol].
     mass (float): atomic mass [g/mol].
 
+  Args:
+    mol (mmlib.molecule.Molecule): Molecule with allocated per-atom arrays to
+        hold atom data (default: new single-row array block).
+    index (int): Row of atom data in per-atom arrays of 'mol', if given.
+
   Attributes:
     covrad (float): covalent radius [Angstrom].
     sreps (float): square root of vdw epsilon [(kcal/mol)^0.5].
@@ -38,86 +102,60 @@ class Atom:
     pvels (float*): NUMDIM previous 'vels' [Angstrom/ps].
     paccs (float*): NUMDIM previous 'accs' [Angstrom/(ps^2)].
   """
-  def __init__(self, type_, coords, charge, ro=None, eps=None):
-    self.SetType(type_)
-    self.SetCoords(coords)
-    self.SetCharge(charge)
-
-    # Look up non-bonded parameters if not provided.
-    if ro == None or eps == None:
-      ro, eps = param.GetVdwParam(self.type_)
-
-    self.SetRo(ro)
-    self.SetEps(eps)
-
-    self.SetElement(param.GetElement(type_))
-    self.SetMass(param.GetMass(self.element))
-    self.SetCovRad(param.GetCovRad(self.element))
-
-    self.SetVels(numpy.zeros(const.NUMDIM))
-    self.SetAccs(numpy.zeros(const.NUMDIM))
-    self.SetPVels(numpy.zeros(const.NUMDIM))
-    self.SetPAccs(numpy.zeros(const.NUMDIM))
+  __slots__ = ('_mol', '_index', 'type_', 'element')
+
+  coords = _AtomArrayProperty(
+      'coords', 'NUMDIM cartesian coordinates [Angstrom].')
+  charge = _AtomArrayProperty('charge', 'Atomic partial charge [e].')
+  ro = _AtomArrayProperty('ro', 'Van der waals radius [Angstrom].')
+  sreps = _AtomArrayProperty(
+      'sreps', 'Square root of vdw epsilon [(kcal/mol)^0.5].')
+  mass = _AtomArrayProperty('mass', 'Atomic mass [g/mol].')
+  covrad = _AtomArrayProperty('covrad', 'Covalent radius [Angstrom].')
+  vels = _AtomArrayProperty('vels', 'NUMDIM velocities [Angstrom/ps].')
+  accs = _AtomArrayProperty('accs', 'NUMDIM accelerations [A/(ps^2)].')
+  pvels = _AtomArrayProperty('pvels', 'NUMDIM previous velocities [A/ps].')
+  paccs = _AtomArrayProperty(
+      'paccs', 'NUMDIM previous accelerations [A/(ps^2)].')
+
+  def __init__(self, type_, coords, charge, ro=None, eps=None, mol=None,
+               index=0):
+    if mol is None:
+      mol, index = _AtomArrays(1), 0
+    self._mol = mol
+    self._index = index
 
-  def SetType(self, type_):
-    """Set new (str) atom type."""
     self.type_ = type_
-
-  def SetCoords(self, coords):
-    """Set new (float*) coodinates [Angstrom]."""
     self.coords = coords
-
-  def SetCoord(self, index, coord):
-    """Set new (float) ith coordinate [Angstrom]."""
-    self.coords[index] = coords
-
-  def SetCharge(self, charge):
-    """Set new (float) partial charge [e]."""
     self.charge = charge
 
-  def SetRo(self, ro):
-    """Set new (float) vdw radius [Angstrom]."""
-    self.ro = ro
+    # Look up non-bonded parameters if not provided.
+    if ro == None or eps == None:
+      ro, eps = param.GetVdwParam(self.type_)
 
-  def SetEps(self, eps):
-    """Set new (float) vdw epsilon [kcal/mol]."""
+    self.ro = ro
     self.eps = eps
-    self.sreps = math.sqrt(eps)
-
-  def SetElement(self, element):
-    """Set new (str) atomic element."""
-    self.element = element
 
-  def SetMass(self, mass):
-    """Set new (float) atomic mass [g/mol]."""
-    self.mass = mass
+    self.element = param.GetElement(type_)
+    self.mass = param.GetMass(self.element)
+    self.covrad = param.GetCovRad(self.element)
 
-  def SetCovRad(self, covrad):
-    """Set new (float) covalent radius [Angstrom]."""
-    self.covrad = covrad
+  @property
+  def eps(self):
+    """Van der waals epsilon [kcal/mol]."""
+    return self._mol.eps[self._index]
 
-  def SetVels(self, vels):
-    """Set new (float*) velocities [Angstrom/ps]."""
-    self.vels = vels
-
-  def SetAccs(self, accs):
-    """Set new (float*) accelerations [Angstrom/(ps^2)]."""
-    self.accs = accs
-
-  def SetPVels(self, pvels):
-    """Set new (float*) velocities [Angstrom/ps]."""
-    self.pvels = pvels
-
-  def SetPAccs(self, paccs):
-    """Set new (float*) accelerations [Angstrom/(ps^2)]."""
-    self.paccs = paccs
+  @eps.setter
+  def eps(self, eps):
+    self._mol.eps[self._index] = eps
+    self._mol.sreps[self._index] = math.sqrt(eps)
 
 
 class Bond:
   """Bond class for bond geometry and parameter data.
   
-  Initialize attributes to specified argument values. Change by calling
-  appropriate 'Set[Param]' function.
+  Initialize attributes to specified argument values. Change by assigning
+  attributes directly.
   
   Args / Attributes:
     at1 (int): Atom1 atomic index in Molecule.
@@ -130,32 +168,16 @@ class Bond:
     energy (float): Energy of bond [kcal/mol].
     grad_mag (float): Energy gradient magnitude of bond [kcal/(mol*A)].
   """
+  __slots__ = ('at1', 'at2', 'k_b', 'r_eq', 'r_ij', 'energy', 'grad_mag')
+
   def __init__(self, at1, at2, k_b, r_eq, r_ij=None):
-    self.SetAt1(at1)
-    self.SetAt2(at2)
-    self.SetKb(k_b)
-    self.SetReq(r_eq)
-    self.SetRij(r_ij)
-
-  def SetAt1(self, at1):
-    """Set new (int) atomic index 1."""
     self.at1 = at1
-
-  def SetAt2(self, at2):
-    """Set new (int) atomice index 2."""
     self.at2 = at2
-
-  def SetKb(self, k_b):
-    """Set new (float)  [kcal/(mol*A^2)]."""
     self.k_b = k_b
-
-  def SetReq(self, r_eq):
-    """Set new (float)  [Angstrom]."""
     self.r_eq = r_eq
-
-  def SetRij(self, r_ij):
-    """Set new (float)  [Angstrom]."""
     self.r_ij = r_ij
+    self.energy = 0.0
+    self.grad_mag = 0.0
 
   def GetEnergy(self):
     """Calculate bond energy (float) [kcal/mol]."""
@@ -169,8 +191,8 @@ class Bond:
 class Angle:
   """Angle class for angle geometry and parameter data.
   
-  Initialize attributes to specified argument values. Change by calling
-  appropriate 'Set[Param]' function.
+  Initialize attributes to specified argument values. Change by assigning
+  attributes directly.
   
   Args / Attributes:
     at1 (int): Atom1 atomic index in Molecule.
@@ -184,37 +206,18 @@ class Angle:
     energy (float): Energy of angle [kcal/mol].
     grad_mag (float): Energy gradient magnitude of angle [kcal/(mol*A)].
   """
+  __slots__ = ('at1', 'at2', 'at3', 'k_a', 'a_eq', 'a_ijk', 'energy',
+               'grad_mag')
+
   def __init__(self, at1, at2, at3, k_a, a_eq, a_ijk=None):
-    self.SetAt1(at1)
-    self.SetAt2(at2)
-    self.SetAt3(at3)
-    self.SetKa(k_a)
-    self.SetAeq(a_eq)
-    self.SetAijk(a_ijk)
-
-  def SetAt1(self, at1):
-    """Set new (int) atomic index 1."""
     self.at1 = at1
-
-  def SetAt2(self, at2):
-    """Set new (int) atomic index 2."""
     self.at2 = at2
-
-  def SetAt3(self, at3):
-    """Set new (int) atomic index 3."""
     self.at3 = at3
-
-  def SetKa(self, k_a):
-    """Set new (float) k_a [kcal/(mol*rad^2)]."""
     self.k_a = k_a
-
-  def SetAeq(self, a_eq):
-    """Set new (float) a_eq [degrees]."""
     self.a_eq = a_eq
-
-  def SetAijk(self, a_ijk):
-    """Set new (float) a_ijk [degrees]."""
     self.a_ijk = a_ijk
+    self.energy = 0.0
+    self.grad_mag = 0.0
 
   def GetEnergy(self):
     """Get energy (float) [kcal/mol]."""
@@ -228,8 +231,8 @@ class Angle:
 class Torsion:
   """Torsion class for torsion geometry and parameter data.
   
-  Initialize attributes to specified argument values. Change
-  by calling appropriate 'set_[param]' function.
+  Initialize attributes to specified argument values. Change by assigning
+  attributes directly.
   
   Args / Attributes:
     at1 (int): Atom1 atomic index in Molecule.
@@ -244,54 +247,23 @@ class Torsion:
 
   Attributes:
     energy (float): Energy of torsion [kcal/mol].
-    grad (float): Energy gradient magnitude of torsion [kcal/(mol*A)].
+    grad_mag (float): Energy gradient magnitude of torsion [kcal/(mol*A)].
   """
+  __slots__ = ('at1', 'at2', 'at3', 'at4', 'v_n', 'gam', 'n', 'paths',
+               't_ijkl', 'energy', 'grad_mag')
+
   def __init__(self, at1, at2, at3, at4, v_n, gamma, nfold, paths, t_ijkl=None):
-    self.SetAt1(at1)
-    self.SetAt2(at2)
-    self.SetAt3(at3)
-    self.SetAt4(at4)
-    self.SetVn(v_n)
-    self.SetGamma(gamma)
-    self.SetNfold(nfold)
-    self.SetPaths(paths)
-    self.SetTijkl(t_ijkl)
-
-  def SetAt1(self, at1):
-    """Set new (int) atomic index 1."""
     self.at1 = at1
-
-  def SetAt2(self, at2):
-    """Set new (int) atomic index 2."""
     self.at2 = at2
-
-  def SetAt3(self, at3):
-    """Set new (int) atomic index 3."""
     self.at3 = at3
-
-  def SetAt4(self, at4):
-    """Set new (int) atomic index 4."""
     self.at4 = at4
-
-  def SetVn(self, v_n):
-    """Set new (float) v_n [kcal/mol]."""
     self.v_n = v_n
-
-  def SetGamma(self, gamma):
-    """Set new (float) gamma [degrees]."""
     self.gam = gamma
-
-  def SetNfold(self, nfold):
-    """Set new (int) nfold."""
     self.n = nfold
-
-  def SetPaths(self, paths):
-    """Set new (int) paths."""
     self.paths = paths
-
-  def SetTijkl(self, t_ijkl):
-    """Set new (float) t_ijkl [degrees]."""
     self.t_ijkl = t_ijkl
+    self.energy = 0.0
+    self.grad_mag = 0.0
 
   def GetEnergy(self):
     """Get energy (float) [kcal/mol]."""
@@ -307,8 +279,8 @@ class Torsion:
 class Outofplane:
   """Outofplane class for outofplane geometry and parameter data.
   
-  Initialize attributes to specified argument values. Change by calling
-  appropriate 'set_[param]' function.
+  Initialize attributes to specified argument values. Change by assigning
+  attributes directly.
   
   Args / Attributes:
     at1 (int): Atom1 atomic index in Molecule.
@@ -320,39 +292,20 @@ class Outofplane:
 
   Attributes:
     energy (float): Energy of outofplane [kcal/mol].
-    grad (float): Energy gradient magnitude of outofplane [kcal/(mol*A)].
+    grad_mag (float): Energy gradient magnitude of outofplane [kcal/(mol*A)].
   """
+  __slots__ = ('at1', 'at2', 'at3', 'at4', 'v_n', 'o_ijkl', 'energy',
+               'grad_mag')
+
   def __init__(self, at1, at2, at3, at4, v_n, o_ijkl=None):
-    self.SetAt1(at1)
-    self.SetAt2(at2)
-    self.SetAt3(at3)
-    self.SetAt4(at4)
-    self.SetVn(v_n)
-    self.SetOijkl(o_ijkl)
-
-  def SetAt1(self, at1):
-    """Set new (int) atomic index 1."""
     self.at1 = at1
-
-  def SetAt2(self, at2):
-    """Set new (int) atomic index 2."""
     self.at2 = at2
-
-  def SetAt3(self, at3):
-    """Set new (int) atomic index 3."""
     self.at3 = at3
-
-  def SetAt4(self, at4):
-    """Set new (int) atomic index 4."""
     self.at4 = at4
-
-  def SetVn(self, v_n):
-    """Set new (float) v_n [kcal/mol]."""
     self.v_n = v_n
-
-  def SetOijkl(self, o_ijkl):
-    """Set new (float) o_ijkl [degrees]."""
     self.o_ijkl = o_ijkl
+    self.energy = 0.0
+    self.grad_mag = 0.0
 
   def GetEnergy(self):
     """Get energy (float) [kcal/mol]."""
@@ -380,12 +333,21 @@ class Molecule:
   
   Args:
     infile_name (str): xyzq or prm input file with molecule data.
+    high_precision (bool): Store per-atom data in 64-bit floats if True
+        (default), or in 32-bit floats, halving memory traffic of nonbonded
+        interactions, if False. Energies and gradients are always accumulated
+        in 64-bit floats. Numerical gradients are sensitive to 32-bit
+        coordinate rounding.
   
   Attributes:
     infile (str): Absolute path to 'infile_name'
     indir (str): Absolute path to infile directory.
     filetype (str): Input file format: 'xyzq' or 'prm'.
     name (str): Name of molecule from input file name.
+    dtype (type): Floating point type of per-atom data arrays.
+    use_gpu (bool): Evaluate nonbonded terms with CUDA kernels (needs cupy).
+        Default = True for molecules of at least
+        mmlib.nonbonded_cuda.GPU_MIN_ATOMS atoms if a GPU is available.
 
     atoms (mmlib.molecule.Atom*): Array of Atom objects.
     bonds (mmlib.molecule.Bond*): Array of Bond objects.
@@ -399,12 +361,67 @@ class Molecule:
     n_torsions (int): Number of torsions.
     n_outofplanes (int): Number of outofplanes.
 
+    coords (float**): Nx3 array of atomic coordinates [Angstrom].
+    vels (float**): Nx3 array of atomic velocities [Angstrom/ps].
+    accs (float**): Nx3 array of atomic accelerations [Angstrom/(ps^2)].
+    pvels (float**): Nx3 array of previous atomic velocities [Angstrom/ps].
+    paccs (float**): Nx3 array of previous atomic accelerations
+        [Angstrom/(ps^2)].
+    charge (float*): Array of atomic partial charges [e].
+    ro (float*): Array of atomic vdw radii [Angstrom].
+    eps (float*): Array of atomic vdw epsilons [kcal/mol].
+    sreps (float*): Array of square roots of atomic vdw epsilons
+        [(kcal/mol)^0.5].
+    mass (float*): Array of atomic masses [g/mol].
+    covrad (float*): Array of atomic covalent radii [Angstrom].
+
     nonints (set(int, int)): Array of covalently bonded atomic indices.
+    nonint_mask (bool**): NxN array, True for atom pairs (including self
+        pairs) without nonbonded interactions.
+    attype_id (int*): Array of atomic vdw type indices, shared by atoms with
+        identical vdw parameters. Built with 'lj_a' and 'lj_b' from 'ro' and
+        'sreps' on load, and rebuilt only by UpdateNonbondedParams.
+    lj_a (float**): TxT array of repulsive vdw coefficients [kcal*A^12/mol]
+        for each pair of vdw types.
+    lj_b (float**): TxT array of attractive vdw coefficients [kcal*A^6/mol]
+        for each pair of vdw types.
+    nonint_indptr (int*): Array of N+1 offsets of each atom's row in
+        'nonint_idx'.
+    nonint_idx (int*): Concatenated sorted arrays of atomic indices without
+        nonbonded interactions with each atom (including itself).
     bond_graph (dict(int:dict(int: float))): Nested dictionary keyed by atom
         pair indices with bond length as value.
 
+    bond_idx (int**): Mx2 array of atomic indices of bonds.
+    bond_k_b, bond_r_eq (float*): Arrays of bond parameters.
+    bond_r_ij (float*): Array of current bond lengths [Angstrom].
+    angle_idx (int**): Mx3 array of atomic indices of angles.
+    angle_k_a, angle_a_eq (float*): Arrays of angle parameters.
+    angle_a_ijk (float*): Array of current bond angles [degrees].
+    torsion_idx (int**): Mx4 array of atomic indices of torsions.
+    torsion_v_n, torsion_gam, torsion_n, torsion_paths (float*): Arrays of
+        torsion parameters.
+    torsion_t_ijkl (float*): Array of current torsion angles [degrees].
+    outofplane_idx (int**): Mx4 array of atomic indices of outofplanes.
+    outofplane_v_n (float*): Array of outofplane parameters.
+    outofplane_o_ijkl (float*): Array of current outofplane angles [degrees].
+    Bonded object attributes of current geometry are only updated from these
+    arrays by UpdateBondedObjects.
+
     dielectric (float): Dielectric constant. Default = 1.0 (free space).
-    mass (float): Sum of all atomic masses.
+    rcut (float): Cutoff distance [Angstrom] of nonbonded interactions, which
+        are truncated beyond it, or None (default) for all atom pairs.
+        Autodiff gradients require None.
+    rbuf (float): Buffer distance [Angstrom] of neighbor list beyond 'rcut'.
+        Default = 2.0.
+    nl_pairs (int**): Mx2 array of atomic indices of interacting atom pairs
+        within 'nl_radius' at the last neighbor list update.
+    nl_coords (float**): Nx3 array of atomic coordinates [Angstrom] at the
+        last neighbor list update, or None if no list has been built.
+    nl_radius (float): Neighbor list radius [Angstrom] ('rcut' + 'rbuf') at
+        the last neighbor list update.
+    xyzq (float**): Nx4 array into which compiled nonbonded kernels pack
+        'coords' and 'charge' before each evaluation.
     k_box (float): Spring constant [kcal/(mol*A^2)] of boundary potential.
     boundary (float): (spherical / cubic) dimensions of system [Angstrom].
     boundary_type (str): Type of boundary shape, 'cube', 'sphere', or 'none'.
@@ -413,9 +430,14 @@ class Molecule:
     temperature (float): Instantaneous kinetic temperature [K].
     pressure (float): Instantaneous kinetic pressure [Pa].
     virial (float): Instantaneous Clausius virial.
+    grad_type (str): Type of gradient computed by GetGradient: 'analytic'
+        (default), 'autodiff', or 'numerical'. Set by SetGradType.
    
     e_{type} (float): {Type} energy [kcal/mol].
     g_{type} (float**): {Type} energy gradient [kcal/(mol*A)].
+    g_terms (float***): 10x(Nx3) array holding all 'g_{type}' arrays as rows,
+        in order of bonds, angles, torsions, outofplanes, vdw, elst, bound,
+        bonded, nonbonded, and total.
     type values include:
       bonds: Bond displacement.
       angles: Angle bend.
@@ -430,11 +452,12 @@ class Molecule:
       kinetic: Energy of motion (no gradient).
       total: Sum of all energy terms.
   """
-  def __init__(self, infile_name):
+  def __init__(self, infile_name, high_precision=True):
     self.infile = os.path.realpath(infile_name)
     self.indir = os.path.dirname(self.infile)
-    self.filetype = self.infile.split('.')[-1]
+    self.filetype = os.path.splitext(self.infile)[1].lstrip('.')
     self.name = os.path.splitext(os.path.basename(self.infile))[0]
+    self.dtype = numpy.float64 if high_precision else numpy.float32
 
     self.atoms = []
     self.bonds = []
@@ -448,11 +471,22 @@ class Molecule:
     self.n_torsions = 0
     self.n_outofplanes = 0
 
+    self.attype_id = numpy.zeros(0, dtype=numpy.int32)
+    self.lj_a = numpy.zeros((0, 0))
+    self.lj_b = numpy.zeros((0, 0))
+
     self.nonints = set()
+    self.nonint_mask = numpy.zeros((0, 0), dtype=bool)
+    self.nonint_indptr = numpy.zeros(1, dtype=int)
+    self.nonint_idx = numpy.zeros(0, dtype=int)
     self.bond_graph = dict()
 
     self.dielectric = 1.0
-    self.mass = 0.0
+    self.rcut = None
+    self.rbuf = 2.0
+    self.nl_pairs = numpy.zeros((0, 2), dtype=int)
+    self.nl_coords = None
+    self.nl_radius = 0.0
     self.k_box = 250.0
     self.boundary = 1.0E10
     self.boundary_type = 'sphere'
@@ -480,69 +514,156 @@ class Molecule:
       self.GetTopology()
     elif (self.filetype == 'prm'):
       self.ReadInPrm()
-      self.UpdateInternals()
+    self.GetBondedArrays()
+    self.UpdateInternals()
+
+    self.use_gpu = (nonbonded_cuda.CUPY
+                    and self.n_atoms >= nonbonded_cuda.GPU_MIN_ATOMS)
+    self._gpu_data = None
+    self._jax_params = None
+    self.xyzq = numpy.empty((self.n_atoms, const.NUMDIM + 1),
+                            dtype=self.dtype)
         
-    self.g_bonds = numpy.zeros((self.n_atoms, const.NUMDIM))
-    self.g_angles = numpy.zeros((self.n_atoms, const.NUMDIM))
-    self.g_torsions = numpy.zeros((self.n_atoms, const.NUMDIM))
-    self.g_outofplanes = numpy.zeros((self.n_atoms, const.NUMDIM))
-    self.g_vdw = numpy.zeros((self.n_atoms, const.NUMDIM))
-    self.g_elst = numpy.zeros((self.n_atoms, const.NUMDIM))
-    self.g_bound = numpy.zeros((self.n_atoms, const.NUMDIM))
-    self.g_bonded = numpy.zeros((self.n_atoms, const.NUMDIM))
-    self.g_nonbonded = numpy.zeros((self.n_atoms, const.NUMDIM))
-    self.g_total = numpy.zeros((self.n_atoms, const.NUMDIM))
+    # Gradient components are views into rows of a single array.
+    self.g_terms = numpy.zeros((10, self.n_atoms, const.NUMDIM))
+    (self.g_bonds, self.g_angles, self.g_torsions, self.g_outofplanes,
+     self.g_vdw, self.g_elst, self.g_bound,
+     self.g_bonded, self.g_nonbonded, self.g_total) = self.g_terms
+    self.SetGradType('analytic')
 
   def ReadInXYZQ(self):
     """Read in xyzq data from .xyzq input file."""
     input_rows = fileio.GetFileStringArray(self.infile)
-    self.atoms = fileio.GetAtomsFromXyzq(input_rows)
-    self.n_atoms = len(self.atoms)
+    self.n_atoms = fileio.GetNumAtomsFromXyzq(input_rows)
+    _AllocAtomArrays(self, self.n_atoms, self.dtype)
+    self.atoms = fileio.GetAtomsFromXyzq(input_rows, self)
+    self.UpdateNonbondedParams()
 
   def ReadInPrm(self):
     """Read in prm data from .prm input file."""
     input_rows = fileio.GetFileStringArray(self.infile)
 
-    self.atoms = fileio.GetAtomsFromPrm(input_rows)
+    self.n_atoms = fileio.GetNumAtomsFromPrm(input_rows)
+    _AllocAtomArrays(self, self.n_atoms, self.dtype)
+    self.atoms = fileio.GetAtomsFromPrm(input_rows, self)
     self.bonds = fileio.GetBondsFromPrm(input_rows)
     self.angles = fileio.GetAnglesFromPrm(input_rows)
     self.torsions = fileio.GetTorsionsFromPrm(input_rows)
     self.outofplanes = fileio.GetOutofplanesFromPrm(input_rows)
 
-    self.n_atoms = len(self.atoms)
     self.n_bonds = len(self.bonds)
     self.n_angles = len(self.angles)
     self.n_torsions = len(self.torsions)
     self.n_outofplanes = len(self.outofplanes)
+    self.UpdateNonbondedParams()
 
     self.bond_graph = topology.GetBondGraphFromBonds(self.bonds, self.n_atoms)
     self.nonints = topology.GetNonints(self.bonds, self.angles, self.torsions)
+    self.nonint_mask = topology.GetNonintMask(self.nonints, self.n_atoms)
+    self.nonint_indptr, self.nonint_idx = topology.GetNonintLists(
+        self.nonints, self.n_atoms)
+
+  def UpdateNonbondedParams(self):
+    """Rebuild vdw type tables and drop cached copies of nonbonded parameters.
+
+    Called on load. Must be called again after assigning atomic charges, vdw
+    radii or vdw epsilons of a loaded molecule, or energies and gradients keep
+    using the previous parameters.
+    """
+    self.attype_id, self.lj_a, self.lj_b = topology.GetVdwTypes(
+        self.ro, self.sreps)
+    self._gpu_data = None
+    self._jax_params = None
 
   def GetTopology(self):
     """Determine bonded topology of molecules from coordinates."""
-    self.bond_graph = topology.GetBondGraph(self.atoms)
+    self.bond_graph = topology.GetBondGraph(self.coords, self.covrad)
     self.bonds = topology.GetBonds(self.atoms, self.bond_graph)
     self.angles = topology.GetAngles(self.atoms, self.bond_graph)
     self.torsions = topology.GetTorsions(self.atoms, self.bond_graph)
     self.outofplanes = topology.GetOutofplanes(self.atoms, self.bond_graph)
     self.nonints = topology.GetNonints(self.bonds, self.angles, self.torsions)
+    self.nonint_mask = topology.GetNonintMask(self.nonints, self.n_atoms)
+    self.nonint_indptr, self.nonint_idx = topology.GetNonintLists(
+        self.nonints, self.n_atoms)
 
     self.n_bonds = len(self.bonds)
     self.n_angles = len(self.angles)
     self.n_torsions = len(self.torsions)
     self.n_outofplanes = len(self.outofplanes)
 
+  def GetBondedArrays(self):
+    """Gather atomic indices and parameters of bonded terms into arrays."""
+    self.bond_idx, self.bond_k_b, self.bond_r_eq = topology.GetBondArrays(
+        self.bonds)
+    self.angle_idx, self.angle_k_a, self.angle_a_eq = topology.GetAngleArrays(
+        self.angles)
+    (self.torsion_idx, self.torsion_v_n, self.torsion_gam, self.torsion_n,
+     self.torsion_paths) = topology.GetTorsionArrays(self.torsions)
+    self.outofplane_idx, self.outofplane_v_n = topology.GetOutofplaneArrays(
+        self.outofplanes)
+
+  def _GetGpuData(self):
+    """Upload static nonbonded parameters to the GPU on first use."""
+    if self._gpu_data is None:
+      self._gpu_data = nonbonded_cuda.NonbondedData(
+          self.charge, self.attype_id, self.lj_a, self.lj_b,
+          self.nonint_indptr, self.nonint_idx)
+    return self._gpu_data
+
+  def _GetJaxParams(self):
+    """Copy static autodiff parameters to the jax device on first use."""
+    if self._jax_params is None:
+      self._jax_params = energy_jax.GetParams(self)
+    return dict(self._jax_params, **energy_jax.GetSettings(self))
+
   def GetEnergy(self, kintype=None):
-    """Calculate (float) energy [kcal/mol] and all energy components."""
-    self.e_bonds = energy.GetEBonds(self.bonds)
-    self.e_angles = energy.GetEAngles(self.angles)
-    self.e_torsions = energy.GetETorsions(self.torsions)
-    self.e_outofplanes = energy.GetEOutofplanes(self.outofplanes)
-    self.e_vdw, self.e_elst = energy.GetENonbonded(self.atoms, self.nonints,
-                                                   self.dielectric)
-    self.e_bound = energy.GetEBound(self.atoms, self.k_box, self.boundary,
+    """Calculate (float) energy [kcal/mol] and all energy components.
+
+    Args:
+      kintype (str): Type of kinetic energy (see mmlib.energy.GetEKinetic).
+    """
+    self._GetEBonded()
+    if self.rcut is not None:
+      self.UpdateNeighborList()
+      if nonbonded.NUMBA:
+        self.e_vdw, self.e_elst = nonbonded.GetENonbondedPairs(
+            self.coords, self.charge, self.attype_id, self.lj_a, self.lj_b,
+            self.nl_pairs, self.rcut, self.dielectric, xyzq=self.xyzq)
+      else:
+        self.e_vdw, self.e_elst = energy.GetENonbondedPairs(
+            self.coords, self.charge, self.attype_id, self.lj_a, self.lj_b,
+            self.nl_pairs, self.rcut, self.dielectric)
+    elif self.use_gpu:
+      self.e_vdw, self.e_elst = nonbonded_cuda.GetENonbonded(
+          self.coords, self._GetGpuData(), self.dielectric)
+    elif nonbonded.NUMBA:
+      self.e_vdw, self.e_elst = nonbonded.GetENonbonded(
+          self.coords, self.charge, self.attype_id, self.lj_a, self.lj_b,
+          self.nonint_indptr, self.nonint_idx, self.dielectric,
+          xyzq=self.xyzq)
+    else:
+      self.e_vdw, self.e_elst = energy.GetENonbonded(
+          self.coords, self.charge, self.attype_id, self.lj_a, self.lj_b,
+          self.nonint_mask, self.dielectric)
+    self._SumEnergies(kintype)
+
+  def _GetEBonded(self):
+    """Calculate bonded energy components from current internal coordinates."""
+    self.e_bonds = energy.GetEBonds(
+        self.bond_r_ij, self.bond_r_eq, self.bond_k_b)
+    self.e_angles = energy.GetEAngles(
+        self.angle_a_ijk, self.angle_a_eq, self.angle_k_a)
+    self.e_torsions = energy.GetETorsions(
+        self.torsion_t_ijkl, self.torsion_v_n, self.torsion_gam,
+        self.torsion_n, self.torsion_paths)
+    self.e_outofplanes = energy.GetEOutofplanes(
+        self.outofplane_o_ijkl, self.outofplane_v_n)
+
+  def _SumEnergies(self, kintype):
+    """Calculate boundary and kinetic energy, and sum all energy components."""
+    self.e_bound = energy.GetEBound(self.coords, self.k_box, self.boundary,
                                     self.origin, self.boundary_type)
-    self.e_kinetic = energy.GetEKinetic(self.atoms, kintype)
 
     self.e_bonded = (
         self.e_bonds +
@@ -559,60 +680,216 @@ class Molecule:
         self.e_nonbonded +
         self.e_bound)
 
+    self.GetEKinetic(kintype)
+
+  def GetEKinetic(self, kintype=None):
+    """Calculate (float) kinetic energy [kcal/mol] and update total energy.
+
+    Potential energy components are not recomputed, so that kinetic energy can
+    follow velocity updates without another pass over atom pairs.
+
+    Args:
+      kintype (str): Type of kinetic energy (see mmlib.energy.GetEKinetic).
+    """
+    self.e_kinetic = energy.GetEKinetic(self.mass, self.vels, self.pvels,
+                                        kintype)
     self.e_total = (
         self.e_potential +
         self.e_kinetic)
 
-  def GetGradient(self, grad_type='analytic'):
-    """Calculate analytical or numerical gradient of energy.
+  def SetGradType(self, grad_type):
+    """Bind gradient method used by GetGradient to a gradient type.
     
     Args:
       grad_type (str): Type of gradient:
         'analytic': (default) exact, based on analytic derivatives.
+        'autodiff': exact, based on automatic differentiation (needs jax).
         'numerical': approximate, based on numerical derivatives.
+
+    Raises:
+      ValueError: If 'grad_type' is unexpected, or is 'autodiff' while 'rcut'
+          is set.
     """
-    if (grad_type == 'analytic'):
-      self.GetAnalyticGradient()
-    elif (grad_type == 'numerical'):
-      self.GetNumericalGradient()
-    else:
+    grad_fns = {
+        'analytic': self.GetAnalyticGradient,
+        'autodiff': self.GetAutodiffGradient,
+        'numerical': self.GetNumericalGradient}
+    if grad_type not in grad_fns:
       raise ValueError('Unexpected gradient type: %s\n'
-                       "Use 'analytic' or 'numerical'." % grad_type)
+                       "Use 'analytic', 'autodiff', or 'numerical'."
+                       % grad_type)
+    if grad_type == 'autodiff':
+      self._CheckAutodiffCutoff()
+    self.grad_type = grad_type
+    self._grad_fn = grad_fns[grad_type]
+
+  def GetGradient(self, grad_type=None):
+    """Calculate analytical or numerical gradient of energy.
+    
+    Args:
+      grad_type (str): Type of gradient (see SetGradType), which also becomes
+          the molecule's gradient type. Default = current 'grad_type'.
+    """
+    if grad_type is not None and grad_type != self.grad_type:
+      self.SetGradType(grad_type)
+    self._grad_fn()
+    self._SumGradients()
 
-    self.g_bonded.fill(0.0)
-    self.g_bonded += self.g_bonds
-    self.g_bonded += self.g_angles
-    self.g_bonded += self.g_torsions
-    self.g_bonded += self.g_outofplanes
+  def _SumGradients(self):
+    """Sum energy gradient components into bonded, nonbonded, and total."""
+    numpy.sum(self.g_terms[0:4], axis=0, out=self.g_bonded)
+    numpy.sum(self.g_terms[4:6], axis=0, out=self.g_nonbonded)
+    numpy.sum(self.g_terms[0:7], axis=0, out=self.g_total)
 
-    self.g_nonbonded.fill(0.0)
-    self.g_nonbonded += self.g_vdw
-    self.g_nonbonded += self.g_elst
+  def GetEnergyAndGradient(self, kintype=None):
+    """Calculate energy and gradient, and all of their components.
 
-    self.g_total.fill(0.0)
-    self.g_total += self.g_bonded
-    self.g_total += self.g_nonbonded
-    self.g_total += self.g_bound
+    Equivalent to GetEnergy followed by GetGradient. For analytic gradients,
+    nonbonded pair energies and gradients are computed together in a single
+    pass over atom pairs.
+
+    Args:
+      kintype (str): Type of kinetic energy (see mmlib.energy.GetEKinetic).
+    """
+    if self.grad_type != 'analytic':
+      self.GetEnergy(kintype)
+      self.GetGradient()
+      return
+    self._GetEBonded()
+    self._GetGBonded()
+    if self.rcut is not None:
+      self.UpdateNeighborList()
+      if nonbonded.NUMBA:
+        self.e_vdw, self.e_elst = nonbonded.GetEGNonbondedPairs(
+            self.g_vdw, self.g_elst, self.coords, self.charge, self.attype_id,
+            self.lj_a, self.lj_b, self.nl_pairs, self.rcut, self.dielectric,
+            xyzq=self.xyzq)
+      else:
+        self.e_vdw, self.e_elst = gradient.GetEGNonbondedPairs(
+            self.g_vdw, self.g_elst, self.coords, self.charge, self.attype_id,
+            self.lj_a, self.lj_b, self.nl_pairs, self.rcut, self.dielectric)
+    elif self.use_gpu:
+      self.e_vdw, self.e_elst = nonbonded_cuda.GetEGNonbonded(
+          self.g_vdw, self.g_elst, self.coords, self._GetGpuData(),
+          self.dielectric)
+    elif nonbonded.NUMBA:
+      self.e_vdw, self.e_elst = nonbonded.GetEGNonbonded(
+          self.g_vdw, self.g_elst, self.coords, self.charge, self.attype_id,
+          self.lj_a, self.lj_b, self.nonint_indptr, self.nonint_idx,
+          self.dielectric, xyzq=self.xyzq)
+    else:
+      self.e_vdw, self.e_elst = gradient.GetEGNonbonded(
+          self.g_vdw, self.g_elst, self.coords, self.charge, self.attype_id,
+          self.lj_a, self.lj_b, self.nonint_mask, self.dielectric)
+    self._SumEnergies(kintype)
+    self._SumGradients()
 
   def GetAnalyticGradient(self):
     """Calculate analytic (float**) gradient [kcal/(mol*A)] of energy."""
-    gradient.GetGBonds(self.g_bonds, self.bonds, self.atoms)
-    gradient.GetGAngles(self.g_angles, self.angles, self.atoms, self.bond_graph)
+    self._GetGBonded()
+    if self.rcut is not None:
+      self.UpdateNeighborList()
+      if nonbonded.NUMBA:
+        nonbonded.GetGNonbondedPairs(
+            self.g_vdw, self.g_elst, self.coords, self.charge, self.attype_id,
+            self.lj_a, self.lj_b, self.nl_pairs, self.rcut, self.dielectric,
+            xyzq=self.xyzq)
+      else:
+        gradient.GetGNonbondedPairs(
+            self.g_vdw, self.g_elst, self.coords, self.charge, self.attype_id,
+            self.lj_a, self.lj_b, self.nl_pairs, self.rcut, self.dielectric)
+    elif self.use_gpu:
+      nonbonded_cuda.GetGNonbonded(
+          self.g_vdw, self.g_elst, self.coords, self._GetGpuData(),
+          self.dielectric)
+    elif nonbonded.NUMBA:
+      nonbonded.GetGNonbonded(
+          self.g_vdw, self.g_elst, self.coords, self.charge, self.attype_id,
+          self.lj_a, self.lj_b, self.nonint_indptr, self.nonint_idx,
+          self.dielectric, xyzq=self.xyzq)
+    else:
+      gradient.GetGNonbonded(
+          self.g_vdw, self.g_elst, self.coords, self.charge, self.attype_id,
+          self.lj_a, self.lj_b, self.nonint_mask, self.dielectric)
+
+  def _GetGBonded(self):
+    """Calculate bonded gradient components at current internal coordinates."""
+    gradient.GetGBonds(
+        self.g_bonds, self.coords, self.bond_idx, self.bond_r_ij,
+        self.bond_r_eq, self.bond_k_b)
+    gradient.GetGAngles(
+        self.g_angles, self.coords, self.angle_idx, self.angle_a_ijk,
+        self.angle_a_eq, self.angle_k_a)
     gradient.GetGTorsions(
-        self.g_torsions, self.torsions, self.atoms, self.bond_graph)
+        self.g_torsions, self.coords, self.torsion_idx, self.torsion_t_ijkl,
+        self.torsion_v_n, self.torsion_gam, self.torsion_n, self.torsion_paths)
     gradient.GetGOutofplanes(
-        self.g_outofplanes, self.outofplanes, self.atoms, self.bond_graph)
+        self.g_outofplanes, self.coords, self.outofplane_idx,
+        self.outofplane_o_ijkl, self.outofplane_v_n)
+
+  def _CheckAutodiffCutoff(self):
+    """Raise ValueError if nonbonded cutoff is set, unsupported by autodiff."""
+    if self.rcut is not None:
+      raise ValueError("'autodiff' gradients do not support nonbonded "
+                       'cutoff: %s\nSet rcut to None.' % self.rcut)
+
+  def GetAutodiffGradient(self):
+    """Calculate autodiff (float**) gradient [kcal/(mol*A)] of energy.
+
+    Raises:
+      ValueError: If 'rcut' is set, since autodiff sums all atom pairs.
+    """
+    self._CheckAutodiffCutoff()
+    self.g_terms[0:7] = energy_jax.GetGTerms(
+        self.coords, self._GetJaxParams(), self.boundary_type)
 
   def GetNumericalGradient(self):
     """Calculate numerical (float**) gradient [kcal/(mol*A)] of energy."""
     gradient.GetGNumerical(self)
 
+  def UpdateNeighborList(self):
+    """Rebuild neighbor list if stale for current coordinates and cutoff.
+
+    The list of pairs within 'rcut' + 'rbuf' holds all pairs within 'rcut'
+    until some atom moves more than 'rbuf' / 2 from its position at the last
+    update.
+    """
+    r_list = self.rcut + self.rbuf
+    if self.nl_coords is not None and self.nl_radius == r_list:
+      disp2 = numpy.sum((self.coords - self.nl_coords)**2, axis=1)
+      if numpy.max(disp2, initial=0.0) <= (0.5 * self.rbuf)**2:
+        return
+    self.nl_pairs = topology.GetNeighborPairs(
+        self.coords, r_list, self.nonint_indptr, self.nonint_idx)
+    self.nl_coords = self.coords.copy()
+    self.nl_radius = r_list
+
   def UpdateInternals(self):
     """Update current values of internal degrees of freedom."""
-    topology.UpdateBonds(self.bonds, self.atoms, self.bond_graph)
-    topology.UpdateAngles(self.angles, self.atoms, self.bond_graph)
-    topology.UpdateTorsions(self.torsions, self.atoms, self.bond_graph)
-    topology.UpdateOutofplanes(self.outofplanes, self.atoms, self.bond_graph)
+    self.bond_r_ij = geomcalc.GetRijArray(*self.coords[self.bond_idx.T])
+    self.angle_a_ijk = geomcalc.GetAijkArray(*self.coords[self.angle_idx.T])
+    self.torsion_t_ijkl = geomcalc.GetTijklArray(
+        *self.coords[self.torsion_idx.T])
+    self.outofplane_o_ijkl = geomcalc.GetOijklArray(
+        *self.coords[self.outofplane_idx.T])
+
+  def UpdateBondedObjects(self):
+    """Copy current internal coordinates and energies to bonded objects."""
+    for bond, r_ij in zip(self.bonds, self.bond_r_ij.tolist()):
+      bond.r_ij = r_ij
+      self.bond_graph[bond.at1][bond.at2] = r_ij
+      self.bond_graph[bond.at2][bond.at1] = r_ij
+      bond.GetEnergy()
+    for angle, a_ijk in zip(self.angles, self.angle_a_ijk.tolist()):
+      angle.a_ijk = a_ijk
+      angle.GetEnergy()
+    for torsion, t_ijkl in zip(self.torsions, self.torsion_t_ijkl.tolist()):
+      torsion.t_ijkl = t_ijkl
+      torsion.GetEnergy()
+    for outofplane, o_ijkl in zip(self.outofplanes,
+                                  self.outofplane_o_ijkl.tolist()):
+      outofplane.o_ijkl = o_ijkl
+      outofplane.GetEnergy()
 
   def GetTemperature(self):
     """Calculate instantaneous kinetic temperature [K] of system."""
@@ -630,6 +907,7 @@ class Molecule:
 
   def PrintData(self):
     """Print energy / geometry / topology data of molecule to screen."""
+    self.UpdateBondedObjects()
     self.PrintEnergy()
     self.PrintGeom()
     self.PrintBonds()
@@ -663,5 +941,5 @@ class Molecule:
 
   def PrintGradient(self):
     """Print gradient data to screen."""
-    comment = mol.grad_type + ' total gradient'
-    print(fileio.GetPrintGradientString(mol.atoms, self.g_total, comment))
+    comment = self.grad_type + ' total gradient'
+    print(fileio.GetPrintGradientString(self.atoms, self.g_total, comment))
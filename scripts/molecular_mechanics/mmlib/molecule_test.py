@@ -1,15 +1,201 @@
-"""Classes and functions for unit tetsing the mmlib molecule module."""
+"""Classes and functions for unit testing the mmlib molecule module."""
 
+import numpy
+import os
+import tempfile
 import unittest
+from unittest import mock
 
-class Test(unittest.TestCase):
-  """Unit tests for mmlib. method."""
+from mmlib import energy_jax
+from mmlib import molecule
+from mmlib import nonbonded
+from mmlib import test
+
+# Largest absolute differences of single from double precision energy
+# [kcal/mol] and gradient [kcal/(mol*A)] of the benzene dimer.
+_SINGLE_E_TOL = 1.0e-4
+_SINGLE_G_TOL = 2.0e-3
+
+# Benzene dimer, with all bonded term types and intermolecular atom pairs.
+_XYZQ = """24
+benzene dimer
+CA     -3.45860      1.02677      0.00000   -0.0800
+CA     -2.21965      1.73788      0.00000   -0.0800
+CA     -0.99800      1.00991      0.00000   -0.0800
+CA     -1.05338     -0.37280      0.00000   -0.0800
+CA     -2.27650     -1.06687      0.00000   -0.0800
+CA     -3.51279     -0.38080      0.00000   -0.0800
+HA     -4.48441     -0.92011      0.00000    0.0800
+HA     -4.39504      1.59896      0.00000    0.0800
+HA     -2.11917      2.80374      0.00000    0.0800
+HA     -0.03542      1.56600      0.00000    0.0800
+HA     -0.07631     -0.93140      0.00000    0.0800
+HA     -2.28067     -2.16889     -0.00000    0.0800
+CA      0.49495      8.57680     -0.74942   -0.0800
+CA      0.98994      8.50273     -2.11559   -0.0800
+CA      0.16562      7.40172      0.00000   -0.0800
+CA      0.33873      6.12702     -0.64052   -0.0800
+CA      0.83516      6.05958     -2.00977   -0.0800
+CA      1.16204      7.24302     -2.75136   -0.0800
+HA      1.54103      7.16442     -3.80023    0.0800
+HA      1.22287      9.46044     -2.62914    0.0800
+HA      0.09876      5.18508     -0.10563    0.0800
+HA      0.97050      5.08524     -2.50763    0.0800
+HA      0.36667      9.56753     -0.26876    0.0800
+HA     -0.21271      7.50106      1.04975    0.0800
+"""
+
+class _MoleculeTestCase(unittest.TestCase):
+  """Shared benzene dimer input file for mmlib.molecule unit tests."""
+
+  def setUp(self):
+    self.tmp_dir = tempfile.TemporaryDirectory()
+    self.infile_name = os.path.join(self.tmp_dir.name, 'benzene_2.xyzq')
+    with open(self.infile_name, 'w') as infile:
+      infile.write(_XYZQ)
+
+  def tearDown(self):
+    self.tmp_dir.cleanup()
+
+
+class TestUpdateNonbondedParams(_MoleculeTestCase):
+  """Unit tests for mmlib.molecule.Molecule.UpdateNonbondedParams method."""
+
+  def testChangedEpsilon(self):
+    """Asserts vdw tables follow an assigned epsilon only after update."""
+    mol = molecule.Molecule(self.infile_name)
+    t_0 = mol.attype_id[0]
+    lj_a = numpy.copy(mol.lj_a)
+    mol.atoms[0].eps = 4.0 * mol.atoms[0].eps
+    self.assertTrue(numpy.array_equal(mol.lj_a, lj_a))
+
+    mol.UpdateNonbondedParams()
+    self.assertEqual(len(mol.lj_a), len(lj_a) + 1)
+    self.assertAlmostEqual(mol.lj_a[mol.attype_id[0], mol.attype_id[0]]
+                           / lj_a[t_0, t_0], 4.0)
+    self.assertNotEqual(mol.attype_id[0], mol.attype_id[1])
+
+  @unittest.skipUnless(energy_jax.JAX, 'jax is not installed')
+  def testAutodiffParams(self):
+    """Asserts autodiff gradient reuses parameters until update."""
+    mol = molecule.Molecule(self.infile_name)
+    mol.GetGradient('autodiff')
+    jax_params = mol._jax_params
+    mol.GetGradient('autodiff')
+    self.assertIs(mol._jax_params, jax_params)
+
+    mol.atoms[0].charge = 0.5
+    mol.UpdateNonbondedParams()
+    mol.GetGradient('autodiff')
+    g_autodiff = numpy.copy(mol.g_total)
+    mol.GetGradient('analytic')
+    test.assertListAlmostEqual(self, g_autodiff, mol.g_total)
+
+
+class TestSetGradType(_MoleculeTestCase):
+  """Unit tests for mmlib.molecule.Molecule.SetGradType method."""
+
+  def testUnexpectedType(self):
+    """Asserts ValueError and unchanged type for unexpected gradient type."""
+    mol = molecule.Molecule(self.infile_name)
+    self.assertRaises(ValueError, mol.SetGradType, 'symbolic')
+    self.assertEqual(mol.grad_type, 'analytic')
+
+  def testGetGradientRebinds(self):
+    """Asserts gradient type passed to GetGradient sticks to molecule."""
+    mol = molecule.Molecule(self.infile_name)
+    with mock.patch.object(mol, 'GetNumericalGradient') as get_numerical:
+      mol.GetGradient('numerical')
+      self.assertEqual(mol.grad_type, 'numerical')
+      mol.GetGradient()
+    self.assertEqual(get_numerical.call_count, 2)
+    self.assertEqual(mol.grad_type, 'numerical')
+
+  def testAutodiffCutoff(self):
+    """Asserts ValueError for autodiff gradient with nonbonded cutoff."""
+    mol = molecule.Molecule(self.infile_name)
+    mol.rcut = 5.0
+    self.assertRaises(ValueError, mol.SetGradType, 'autodiff')
+    self.assertEqual(mol.grad_type, 'analytic')
+    self.assertRaises(ValueError, mol.GetAutodiffGradient)
+
+
+class TestUpdateNeighborList(_MoleculeTestCase):
+  """Unit tests for mmlib.molecule.Molecule.UpdateNeighborList method."""
+
+  def setUp(self):
+    _MoleculeTestCase.setUp(self)
+    self.mol = molecule.Molecule(self.infile_name)
+    self.mol.rcut = 5.0
+    self.mol.UpdateNeighborList()
+    self.nl_coords = self.mol.nl_coords
+
+  def testSmallDisplacement(self):
+    """Asserts list kept while atoms move less than half the buffer."""
+    self.mol.coords[0][0] += 0.49 * self.mol.rbuf
+    self.mol.UpdateNeighborList()
+    self.assertIs(self.mol.nl_coords, self.nl_coords)
+
+  def testLargeDisplacement(self):
+    """Asserts list rebuilt after an atom moves over half the buffer."""
+    self.mol.coords[0][0] += 0.51 * self.mol.rbuf
+    self.mol.UpdateNeighborList()
+    self.assertIsNot(self.mol.nl_coords, self.nl_coords)
+    self.assertTrue(numpy.array_equal(self.mol.nl_coords, self.mol.coords))
+
+  def testChangedCutoff(self):
+    """Asserts list rebuilt with new radius after cutoff change."""
+    self.mol.rcut = 6.0
+    self.mol.UpdateNeighborList()
+    self.assertIsNot(self.mol.nl_coords, self.nl_coords)
+    self.assertEqual(self.mol.nl_radius, 6.0 + self.mol.rbuf)
+
+  def testChangedBuffer(self):
+    """Asserts list rebuilt with new radius after buffer change."""
+    self.mol.rbuf = 1.0
+    self.mol.UpdateNeighborList()
+    self.assertIsNot(self.mol.nl_coords, self.nl_coords)
+    self.assertEqual(self.mol.nl_radius, 5.0 + 1.0)
+
+
+class TestHighPrecision(_MoleculeTestCase):
+  """Unit tests for mmlib.molecule.Molecule single precision data."""
+
+  def _AssertSinglePrecision(self, rcut=None):
+    """Asserts single precision energy and gradient near double precision."""
+    results = []
+    for high_precision in (True, False):
+      mol = molecule.Molecule(self.infile_name, high_precision=high_precision)
+      mol.rcut = rcut
+      mol.GetEnergy('nokinetic')
+      mol.GetGradient('analytic')
+      results.append((mol.e_total, numpy.copy(mol.g_total)))
+    (e_double, g_double), (e_single, g_single) = results
+    self.assertLess(abs(e_single - e_double), _SINGLE_E_TOL)
+    self.assertLess(numpy.max(numpy.abs(g_single - g_double)), _SINGLE_G_TOL)
+
+  def testNumpy(self):
+    """Asserts single precision results near double with numpy kernels."""
+    with mock.patch.object(nonbonded, 'NUMBA', False):
+      self._AssertSinglePrecision()
+
+  @unittest.skipUnless(nonbonded.NUMBA, 'numba is not installed')
+  def testNumba(self):
+    """Asserts single precision results near double with numba kernels."""
+    self._AssertSinglePrecision()
+
+  def testCutoff(self):
+    """Asserts single precision results near double with a cutoff."""
+    self._AssertSinglePrecision(rcut=5.0)
 
 
 def suite():
-  """Builds a test suite of all unit test in _test module."""
+  """Builds a test suite of all unit tests in molecule_test module."""
   test_classes = (
-    Test)
+      TestUpdateNonbondedParams,
+      TestSetGradType,
+      TestUpdateNeighborList,
+      TestHighPrecision)
 
   suite = unittest.TestSuite()
   for test_class in test_classes:
@@ -0,0 +1,530 @@
+"""Compiled kernels for molecular mechanics non-bonded interactions.
+
+Includes numba JIT-compiled functions for van der waals and electrostatic
+energies and energy gradients between all non-bonded atom pairs of a system.
+Gradient kernels also sum pair energies, so that both are available from one
+pass over atom pairs.
+Pairs are computed in cache-sized tiles of atoms, with rows of tiles
+parallelized over threads.
+
+numba is optional. If it is not installed, NUMBA is False and callers should
+use the NumPy array functions in mmlib.energy and mmlib.gradient instead.
+"""
+
+import math
+import numpy
+
+from mmlib import constants as const
+
+try:
+  import numba
+except ImportError:
+  numba = None
+
+# Whether compiled non-bonded kernels are available.
+NUMBA = numba is not None
+
+# Atoms per tile of the pair matrix. Packed coordinates and charges, and types
+# of two tiles (~5 kB) stay in L1 cache while their pairs are computed.
+_TILE = 64
+
+# Atom pairs per parallel task of neighbor list kernels.
+_PAIR_CHUNK = 4096
+
+_prange = numba.prange if NUMBA else range
+_GetNumThreads = numba.get_num_threads if NUMBA else lambda: 1
+_GetThreadId = numba.get_thread_id if NUMBA else lambda: 0
+
+def _Jit(function, parallel=True):
+  """Compile function with numba, in parallel mode by default, if available."""
+  if not NUMBA:
+    return function
+  return numba.njit(parallel=parallel, fastmath=True, cache=True)(function)
+
+
+def _JitSerial(function):
+  """Compile function with numba, without parallel loops, if available."""
+  return _Jit(function, parallel=False)
+
+
+@_JitSerial
+def _GetTileRows(task, n_atoms):
+  """First atoms of the two rows of tiles handled by one parallel task.
+
+  Rows of the upper triangle of tiles shrink with increasing first atom, so
+  each task pairs a long row with a short one to balance threads. The second
+  row is empty if it is the same as the first.
+  """
+  n_tiles = (n_atoms + _TILE - 1) // _TILE
+  row_1 = task * _TILE
+  row_2 = (n_tiles - 1 - task) * _TILE
+  if row_2 <= row_1:
+    row_2 = n_atoms
+  return row_1, row_2
+
+
+@_JitSerial
+def _ETileRow(i_start, xyzq, attype_id, lj_a, lj_b, nonint_indptr, nonint_idx):
+  """Sum pair energies of atoms i in one row of tiles with all atoms j > i."""
+  n_atoms = xyzq.shape[0]
+  i_end = min(i_start + _TILE, n_atoms)
+  # Next exclusion of each atom i with atom j > i, advanced alongside j.
+  k_next = numpy.empty(_TILE, dtype=numpy.int64)
+  for i in range(i_start, i_end):
+    k = nonint_indptr[i]
+    while k < nonint_indptr[i+1] and nonint_idx[k] <= i:
+      k += 1
+    k_next[i - i_start] = k
+  e_vdw, e_elst = 0.0, 0.0
+  for j_start in range(i_start, n_atoms, _TILE):
+    j_end = min(j_start + _TILE, n_atoms)
+    for i in range(i_start, i_end):
+      x_i, y_i, z_i, q_i = xyzq[i, 0], xyzq[i, 1], xyzq[i, 2], xyzq[i, 3]
+      t_i = attype_id[i]
+      k = k_next[i - i_start]
+      k_end = nonint_indptr[i+1]
+      for j in range(max(i + 1, j_start), j_end):
+        if k < k_end and nonint_idx[k] == j:
+          k += 1
+          continue
+        dx = x_i - xyzq[j, 0]
+        dy = y_i - xyzq[j, 1]
+        dz = z_i - xyzq[j, 2]
+        inv_r2 = 1.0 / (dx*dx + dy*dy + dz*dz)
+        t_j = attype_id[j]
+        inv_r6 = inv_r2 * inv_r2 * inv_r2
+        e_vdw += (lj_a[t_i, t_j]*inv_r6 - lj_b[t_i, t_j]) * inv_r6
+        e_elst += q_i * xyzq[j, 3] * math.sqrt(inv_r2)
+      k_next[i - i_start] = k
+  return e_vdw, e_elst
+
+
+@_Jit
+def _ENonbondedKernel(xyzq, attype_id, lj_a, lj_b, nonint_indptr, nonint_idx):
+  """Sum van der waals and unscaled coulomb energy over all atom pairs.
+
+  Each pair i < j is visited once, in tiles of atoms i and j. Each parallel
+  task handles two rows of tiles and stores its own energy sums.
+  """
+  n_atoms = xyzq.shape[0]
+  n_tasks = (n_atoms + 2*_TILE - 1) // (2*_TILE)
+  e_vdw_t = numpy.zeros(n_tasks)
+  e_elst_t = numpy.zeros(n_tasks)
+  for task in _prange(n_tasks):
+    for i_start in _GetTileRows(task, n_atoms):
+      if i_start < n_atoms:
+        e_vdw, e_elst = _ETileRow(i_start, xyzq, attype_id, lj_a, lj_b,
+                                  nonint_indptr, nonint_idx)
+        e_vdw_t[task] += e_vdw
+        e_elst_t[task] += e_elst
+  return e_vdw_t.sum(), e_elst_t.sum()
+
+
+@_JitSerial
+def _EGTileRow(i_start, xyzq, attype_id, lj_a, lj_b, nonint_indptr,
+               nonint_idx, elst_scale, g_vdw, g_elst):
+  """Add pair gradients and sum pair energies of atoms i in one row of tiles.
+
+  Pairs are formed with all atoms j > i. Each pair gradient is added to atom i
+  and subtracted from atom j. Gradients of atoms j are summed in a tile-sized
+  buffer, and added to 'g_vdw' and 'g_elst' once per tile.
+  """
+  n_atoms = xyzq.shape[0]
+  i_end = min(i_start + _TILE, n_atoms)
+  k_next = numpy.empty(_TILE, dtype=numpy.int64)
+  for i in range(i_start, i_end):
+    k = nonint_indptr[i]
+    while k < nonint_indptr[i+1] and nonint_idx[k] <= i:
+      k += 1
+    k_next[i - i_start] = k
+  g_j = numpy.empty((_TILE, 2*const.NUMDIM))
+  e_vdw, e_elst = 0.0, 0.0
+  for j_start in range(i_start, n_atoms, _TILE):
+    j_end = min(j_start + _TILE, n_atoms)
+    g_j[:] = 0.0
+    for i in range(i_start, i_end):
+      x_i, y_i, z_i, q_i = xyzq[i, 0], xyzq[i, 1], xyzq[i, 2], xyzq[i, 3]
+      t_i = attype_id[i]
+      gx_vdw, gy_vdw, gz_vdw = 0.0, 0.0, 0.0
+      gx_elst, gy_elst, gz_elst = 0.0, 0.0, 0.0
+      k = k_next[i - i_start]
+      k_end = nonint_indptr[i+1]
+      for j in range(max(i + 1, j_start), j_end):
+        if k < k_end and nonint_idx[k] == j:
+          k += 1
+          continue
+        dx = x_i - xyzq[j, 0]
+        dy = y_i - xyzq[j, 1]
+        dz = z_i - xyzq[j, 2]
+        inv_r2 = 1.0 / (dx*dx + dy*dy + dz*dz)
+        t_j = attype_id[j]
+        inv_r6 = inv_r2 * inv_r2 * inv_r2
+        lj_a_ij, lj_b_ij = lj_a[t_i, t_j], lj_b[t_i, t_j]
+        qq_r = q_i * xyzq[j, 3] * math.sqrt(inv_r2)
+        e_vdw += (lj_a_ij*inv_r6 - lj_b_ij) * inv_r6
+        e_elst += qq_r
+        # Gradient magnitudes divided by r_ij, to scale (unnormalized) dx.
+        g_vdw_ij = (6.0*lj_b_ij - 12.0*lj_a_ij*inv_r6) * inv_r6 * inv_r2
+        g_elst_ij = -elst_scale * qq_r * inv_r2
+        gx_vdw += g_vdw_ij * dx
+        gy_vdw += g_vdw_ij * dy
+        gz_vdw += g_vdw_ij * dz
+        gx_elst += g_elst_ij * dx
+        gy_elst += g_elst_ij * dy
+        gz_elst += g_elst_ij * dz
+        jj = j - j_start
+        g_j[jj, 0] -= g_vdw_ij * dx
+        g_j[jj, 1] -= g_vdw_ij * dy
+        g_j[jj, 2] -= g_vdw_ij * dz
+        g_j[jj, 3] -= g_elst_ij * dx
+        g_j[jj, 4] -= g_elst_ij * dy
+        g_j[jj, 5] -= g_elst_ij * dz
+      k_next[i - i_start] = k
+      g_vdw[i, 0] += gx_vdw
+      g_vdw[i, 1] += gy_vdw
+      g_vdw[i, 2] += gz_vdw
+      g_elst[i, 0] += gx_elst
+      g_elst[i, 1] += gy_elst
+      g_elst[i, 2] += gz_elst
+    for j in range(j_start, j_end):
+      for dim in range(const.NUMDIM):
+        g_vdw[j, dim] += g_j[j - j_start, dim]
+        g_elst[j, dim] += g_j[j - j_start, const.NUMDIM + dim]
+  return e_vdw, e_elst
+
+
+@_Jit
+def _EGNonbondedKernel(xyzq, attype_id, lj_a, lj_b, nonint_indptr,
+                       nonint_idx, elst_scale, n_threads, g_vdw, g_elst):
+  """Fill van der waals and coulomb energy gradients of all atoms.
+
+  Each pair i < j is visited once, in tiles of atoms i and j. Pair gradients
+  are added to both atoms, so each of 'n_threads' threads accumulates into its
+  own gradient buffers, which are summed at the end. Returns van der waals
+  and unscaled coulomb energy sums, like _ENonbondedKernel.
+  """
+  n_atoms = xyzq.shape[0]
+  n_tasks = (n_atoms + 2*_TILE - 1) // (2*_TILE)
+  e_vdw_t = numpy.zeros(n_tasks)
+  e_elst_t = numpy.zeros(n_tasks)
+  g_vdw_t = numpy.zeros((n_threads, n_atoms, const.NUMDIM))
+  g_elst_t = numpy.zeros((n_threads, n_atoms, const.NUMDIM))
+  for task in _prange(n_tasks):
+    thread = _GetThreadId()
+    for i_start in _GetTileRows(task, n_atoms):
+      if i_start < n_atoms:
+        e_vdw, e_elst = _EGTileRow(
+            i_start, xyzq, attype_id, lj_a, lj_b, nonint_indptr, nonint_idx,
+            elst_scale, g_vdw_t[thread], g_elst_t[thread])
+        e_vdw_t[task] += e_vdw
+        e_elst_t[task] += e_elst
+  for i in _prange(n_atoms):
+    for dim in range(const.NUMDIM):
+      g_vdw[i, dim] = g_vdw_t[:, i, dim].sum()
+      g_elst[i, dim] = g_elst_t[:, i, dim].sum()
+  return e_vdw_t.sum(), e_elst_t.sum()
+
+
+@_Jit
+def _ENonbondedPairsKernel(xyzq, attype_id, lj_a, lj_b, pairs, r2_cut):
+  """Sum van der waals and unscaled coulomb energy over listed atom pairs.
+
+  Listed pairs beyond the cutoff are skipped. Each parallel task handles one
+  chunk of pairs and stores its own energy sums.
+  """
+  n_pairs = pairs.shape[0]
+  n_tasks = (n_pairs + _PAIR_CHUNK - 1) // _PAIR_CHUNK
+  e_vdw_t = numpy.zeros(n_tasks)
+  e_elst_t = numpy.zeros(n_tasks)
+  for task in _prange(n_tasks):
+    e_vdw, e_elst = 0.0, 0.0
+    for p in range(task*_PAIR_CHUNK, min((task + 1)*_PAIR_CHUNK, n_pairs)):
+      i, j = pairs[p, 0], pairs[p, 1]
+      dx = xyzq[i, 0] - xyzq[j, 0]
+      dy = xyzq[i, 1] - xyzq[j, 1]
+      dz = xyzq[i, 2] - xyzq[j, 2]
+      r2 = dx*dx + dy*dy + dz*dz
+      if r2 >= r2_cut:
+        continue
+      inv_r2 = 1.0 / r2
+      t_i, t_j = attype_id[i], attype_id[j]
+      inv_r6 = inv_r2 * inv_r2 * inv_r2
+      e_vdw += (lj_a[t_i, t_j]*inv_r6 - lj_b[t_i, t_j]) * inv_r6
+      e_elst += xyzq[i, 3] * xyzq[j, 3] * math.sqrt(inv_r2)
+    e_vdw_t[task] = e_vdw
+    e_elst_t[task] = e_elst
+  return e_vdw_t.sum(), e_elst_t.sum()
+
+
+@_Jit
+def _EGNonbondedPairsKernel(xyzq, attype_id, lj_a, lj_b, pairs, r2_cut,
+                            elst_scale, n_threads, g_vdw, g_elst):
+  """Fill van der waals and coulomb energy gradients over listed atom pairs.
+
+  Listed pairs beyond the cutoff are skipped. Each parallel task handles one
+  chunk of pairs, and adds pair gradients to both atoms in the gradient
+  buffers of its thread, which are summed at the end. Returns van der waals
+  and unscaled coulomb energy sums, like _ENonbondedPairsKernel.
+  """
+  n_atoms = xyzq.shape[0]
+  n_pairs = pairs.shape[0]
+  n_tasks = (n_pairs + _PAIR_CHUNK - 1) // _PAIR_CHUNK
+  e_vdw_t = numpy.zeros(n_tasks)
+  e_elst_t = numpy.zeros(n_tasks)
+  g_vdw_t = numpy.zeros((n_threads, n_atoms, const.NUMDIM))
+  g_elst_t = numpy.zeros((n_threads, n_atoms, const.NUMDIM))
+  for task in _prange(n_tasks):
+    thread = _GetThreadId()
+    g_vdw_p = g_vdw_t[thread]
+    g_elst_p = g_elst_t[thread]
+    e_vdw, e_elst = 0.0, 0.0
+    for p in range(task*_PAIR_CHUNK, min((task + 1)*_PAIR_CHUNK, n_pairs)):
+      i, j = pairs[p, 0], pairs[p, 1]
+      dx = xyzq[i, 0] - xyzq[j, 0]
+      dy = xyzq[i, 1] - xyzq[j, 1]
+      dz = xyzq[i, 2] - xyzq[j, 2]
+      r2 = dx*dx + dy*dy + dz*dz
+      if r2 >= r2_cut:
+        continue
+      inv_r2 = 1.0 / r2
+      t_i, t_j = attype_id[i], attype_id[j]
+      inv_r6 = inv_r2 * inv_r2 * inv_r2
+      lj_a_ij, lj_b_ij = lj_a[t_i, t_j], lj_b[t_i, t_j]
+      qq_r = xyzq[i, 3] * xyzq[j, 3] * math.sqrt(inv_r2)
+      e_vdw += (lj_a_ij*inv_r6 - lj_b_ij) * inv_r6
+      e_elst += qq_r
+      g_vdw_ij = (6.0*lj_b_ij - 12.0*lj_a_ij*inv_r6) * inv_r6 * inv_r2
+      g_elst_ij = -elst_scale * qq_r * inv_r2
+      g_vdw_p[i, 0] += g_vdw_ij * dx
+      g_vdw_p[i, 1] += g_vdw_ij * dy
+      g_vdw_p[i, 2] += g_vdw_ij * dz
+      g_vdw_p[j, 0] -= g_vdw_ij * dx
+      g_vdw_p[j, 1] -= g_vdw_ij * dy
+      g_vdw_p[j, 2] -= g_vdw_ij * dz
+      g_elst_p[i, 0] += g_elst_ij * dx
+      g_elst_p[i, 1] += g_elst_ij * dy
+      g_elst_p[i, 2] += g_elst_ij * dz
+      g_elst_p[j, 0] -= g_elst_ij * dx
+      g_elst_p[j, 1] -= g_elst_ij * dy
+      g_elst_p[j, 2] -= g_elst_ij * dz
+    e_vdw_t[task] = e_vdw
+    e_elst_t[task] = e_elst
+  for i in _prange(n_atoms):
+    for dim in range(const.NUMDIM):
+      g_vdw[i, dim] = g_vdw_t[:, i, dim].sum()
+      g_elst[i, dim] = g_elst_t[:, i, dim].sum()
+  return e_vdw_t.sum(), e_elst_t.sum()
+
+
+def _PackXyzq(coords, charge, xyzq=None):
+  """Copy coordinates and charges into rows of an Nx4 array.
+
+  The pair loops read the coordinates and charge of each atom j together, so
+  kernels take them packed into one (x, y, z, q) record per atom.
+
+  Args:
+    coords (float**): Nx3 array of atomic coordinates [Angstrom].
+    charge (float*): Array of atomic partial charges [e].
+    xyzq (float**): Nx4 array to fill, or None to allocate one.
+
+  Returns:
+    xyzq (float**): Nx4 array of atomic coordinates [Angstrom] and partial
+        charges [e].
+  """
+  if xyzq is None:
+    xyzq = numpy.empty((len(coords), const.NUMDIM + 1), dtype=coords.dtype)
+  xyzq[:, :const.NUMDIM] = coords
+  xyzq[:, const.NUMDIM] = charge
+  return xyzq
+
+
+def GetENonbonded(coords, charge, attype_id, lj_a, lj_b, nonint_indptr,
+                  nonint_idx, dielectric, xyzq=None):
+  """Calculate non-bonded interaction energy between all atom pairs.
+
+  Compiled equivalent of mmlib.energy.GetENonbonded, with vdw parameters given
+  as tabulated pair coefficients of atomic vdw types, and excluded pairs given
+  as sorted per-atom index lists instead of a boolean matrix.
+
+  Args:
+    coords (float**): Nx3 array of atomic coordinates [Angstrom].
+    charge (float*): Array of atomic partial charges [e].
+    attype_id (int*): Array of atomic vdw type indices.
+    lj_a (float**): TxT array of repulsive vdw coefficients [kcal*A^12/mol]
+        for each pair of vdw types.
+    lj_b (float**): TxT array of attractive vdw coefficients [kcal*A^6/mol]
+        for each pair of vdw types.
+    nonint_indptr (int*): Array of N+1 offsets of each atom's row in
+        'nonint_idx'.
+    nonint_idx (int*): Concatenated sorted arrays of atomic indices without
+        nonbonded interactions with each atom (including itself).
+    dielectric (float): Dielectric constant of molecule.
+    xyzq (float**): Optional Nx4 array reused to pack 'coords' and 'charge'
+        for kernels, to save an allocation per call.
+
+  Returns:
+    e_vdw (float): Van der waals energy [kcal/mol] of molecule.
+    e_elst (float): Electrostatic energy [kcal/mol] of molecule.
+  """
+  e_vdw, e_elst = _ENonbondedKernel(
+      _PackXyzq(coords, charge, xyzq), attype_id, lj_a, lj_b, nonint_indptr,
+      nonint_idx)
+  return e_vdw, const.CEU2KCAL * e_elst / dielectric
+
+
+def GetGNonbonded(g_vdw, g_elst, coords, charge, attype_id, lj_a, lj_b,
+                  nonint_indptr, nonint_idx, dielectric, xyzq=None):
+  """Calculate non-bonded energy gradients between all nonbonded atom pairs.
+
+  Compiled equivalent of mmlib.gradient.GetGNonbonded, with vdw parameters
+  given as tabulated pair coefficients of atomic vdw types, and excluded pairs
+  given as sorted per-atom index lists instead of a boolean matrix.
+
+  Args:
+    g_vdw (float**): Nx3 array of molecule's van der waals gradients.
+    g_elst (float**): Nx3 array of molecule's electrostatic gradients.
+    coords (float**): Nx3 array of atomic coordinates [Angstrom].
+    charge (float*): Array of atomic partial charges [e].
+    attype_id (int*): Array of atomic vdw type indices.
+    lj_a (float**): TxT array of repulsive vdw coefficients [kcal*A^12/mol]
+        for each pair of vdw types.
+    lj_b (float**): TxT array of attractive vdw coefficients [kcal*A^6/mol]
+        for each pair of vdw types.
+    nonint_indptr (int*): Array of N+1 offsets of each atom's row in
+        'nonint_idx'.
+    nonint_idx (int*): Concatenated sorted arrays of atomic indices without
+        nonbonded interactions with each atom (including itself).
+    dielectric (float): Dielectric constant of molecule.
+    xyzq (float**): Optional Nx4 array reused to pack 'coords' and 'charge'
+        for kernels, to save an allocation per call.
+  """
+  GetEGNonbonded(g_vdw, g_elst, coords, charge, attype_id, lj_a, lj_b,
+                 nonint_indptr, nonint_idx, dielectric, xyzq)
+
+
+def GetEGNonbonded(g_vdw, g_elst, coords, charge, attype_id, lj_a, lj_b,
+                   nonint_indptr, nonint_idx, dielectric, xyzq=None):
+  """Calculate non-bonded energy and gradients between all atom pairs.
+
+  Combines GetENonbonded and GetGNonbonded, with each pair distance computed
+  once for both pair energies and gradients.
+
+  Args:
+    g_vdw (float**): Nx3 array of molecule's van der waals gradients.
+    g_elst (float**): Nx3 array of molecule's electrostatic gradients.
+    coords (float**): Nx3 array of atomic coordinates [Angstrom].
+    charge (float*): Array of atomic partial charges [e].
+    attype_id (int*): Array of atomic vdw type indices.
+    lj_a (float**): TxT array of repulsive vdw coefficients [kcal*A^12/mol]
+        for each pair of vdw types.
+    lj_b (float**): TxT array of attractive vdw coefficients [kcal*A^6/mol]
+        for each pair of vdw types.
+    nonint_indptr (int*): Array of N+1 offsets of each atom's row in
+        'nonint_idx'.
+    nonint_idx (int*): Concatenated sorted arrays of atomic indices without
+        nonbonded interactions with each atom (including itself).
+    dielectric (float): Dielectric constant of molecule.
+    xyzq (float**): Optional Nx4 array reused to pack 'coords' and 'charge'
+        for kernels, to save an allocation per call.
+
+  Returns:
+    e_vdw (float): Van der waals energy [kcal/mol] of molecule.
+    e_elst (float): Electrostatic energy [kcal/mol] of molecule.
+  """
+  elst_scale = const.CEU2KCAL / dielectric
+  e_vdw, e_elst = _EGNonbondedKernel(
+      _PackXyzq(coords, charge, xyzq), attype_id, lj_a, lj_b, nonint_indptr,
+      nonint_idx, elst_scale, _GetNumThreads(), g_vdw, g_elst)
+  return e_vdw, elst_scale * e_elst
+
+
+def GetENonbondedPairs(coords, charge, attype_id, lj_a, lj_b, pairs, rcut,
+                       dielectric, xyzq=None):
+  """Calculate non-bonded interaction energy of atom pairs within a cutoff.
+
+  Compiled equivalent of mmlib.energy.GetENonbondedPairs.
+
+  Args:
+    coords (float**): Nx3 array of atomic coordinates [Angstrom].
+    charge (float*): Array of atomic partial charges [e].
+    attype_id (int*): Array of atomic vdw type indices.
+    lj_a (float**): TxT array of repulsive vdw coefficients [kcal*A^12/mol]
+        for each pair of vdw types.
+    lj_b (float**): TxT array of attractive vdw coefficients [kcal*A^6/mol]
+        for each pair of vdw types.
+    pairs (int**): Mx2 array of atomic indices of interacting atom pairs,
+        including all pairs within 'rcut'.
+    rcut (float): Cutoff distance [Angstrom] of nonbonded interactions.
+    dielectric (float): Dielectric constant of molecule.
+    xyzq (float**): Optional Nx4 array reused to pack 'coords' and 'charge'
+        for kernels, to save an allocation per call.
+
+  Returns:
+    e_vdw (float): Van der waals energy [kcal/mol] of molecule.
+    e_elst (float): Electrostatic energy [kcal/mol] of molecule.
+  """
+  e_vdw, e_elst = _ENonbondedPairsKernel(
+      _PackXyzq(coords, charge, xyzq), attype_id, lj_a, lj_b, pairs, rcut**2)
+  return e_vdw, const.CEU2KCAL * e_elst / dielectric
+
+
+def GetGNonbondedPairs(g_vdw, g_elst, coords, charge, attype_id, lj_a, lj_b,
+                       pairs, rcut, dielectric, xyzq=None):
+  """Calculate non-bonded energy gradients of atom pairs within a cutoff.
+
+  Compiled equivalent of mmlib.gradient.GetGNonbondedPairs.
+
+  Args:
+    g_vdw (float**): Nx3 array of molecule's van der waals gradients.
+    g_elst (float**): Nx3 array of molecule's electrostatic gradients.
+    coords (float**): Nx3 array of atomic coordinates [Angstrom].
+    charge (float*): Array of atomic partial charges [e].
+    attype_id (int*): Array of atomic vdw type indices.
+    lj_a (float**): TxT array of repulsive vdw coefficients [kcal*A^12/mol]
+        for each pair of vdw types.
+    lj_b (float**): TxT array of attractive vdw coefficients [kcal*A^6/mol]
+        for each pair of vdw types.
+    pairs (int**): Mx2 array of atomic indices of interacting atom pairs,
+        including all pairs within 'rcut'.
+    rcut (float): Cutoff distance [Angstrom] of nonbonded interactions.
+    dielectric (float): Dielectric constant of molecule.
+    xyzq (float**): Optional Nx4 array reused to pack 'coords' and 'charge'
+        for kernels, to save an allocation per call.
+  """
+  GetEGNonbondedPairs(g_vdw, g_elst, coords, charge, attype_id, lj_a, lj_b,
+                      pairs, rcut, dielectric, xyzq)
+
+
+def GetEGNonbondedPairs(g_vdw, g_elst, coords, charge, attype_id, lj_a, lj_b,
+                        pairs, rcut, dielectric, xyzq=None):
+  """Calculate non-bonded energy and gradients of atom pairs within a cutoff.
+
+  Combines GetENonbondedPairs and GetGNonbondedPairs, with each pair distance
+  computed once for both pair energies and gradients.
+
+  Args:
+    g_vdw (float**): Nx3 array of molecule's van der waals gradients.
+    g_elst (float**): Nx3 array of molecule's electrostatic gradients.
+    coords (float**): Nx3 array of atomic coordinates [Angstrom].
+    charge (float*): Array of atomic partial charges [e].
+    attype_id (int*): Array of atomic vdw type indices.
+    lj_a (float**): TxT array of repulsive vdw coefficients [kcal*A^12/mol]
+        for each pair of vdw types.
+    lj_b (float**): TxT array of attractive vdw coefficients [kcal*A^6/mol]
+        for each pair of vdw types.
+    pairs (int**): Mx2 array of atomic indices of interacting atom pairs,
+        including all pairs within 'rcut'.
+    rcut (float): Cutoff distance [Angstrom] of nonbonded interactions.
+    dielectric (float): Dielectric constant of molecule.
+    xyzq (float**): Optional Nx4 array reused to pack 'coords' and 'charge'
+        for kernels, to save an allocation per call.
+
+  Returns:
+    e_vdw (float): Van der waals energy [kcal/mol] of molecule.
+    e_elst (float): Electrostatic energy [kcal/mol] of molecule.
+  """
+  elst_scale = const.CEU2KCAL / dielectric
+  e_vdw, e_elst = _EGNonbondedPairsKernel(
+      _PackXyzq(coords, charge, xyzq), attype_id, lj_a, lj_b, pairs, rcut**2,
+      elst_scale, _GetNumThreads(), g_vdw, g_elst)
+  return e_vdw, elst_scale * e_elst
@@ -0,0 +1,266 @@
+"""CUDA kernels for molecular mechanics non-bonded interactions.
+
+Includes a CuPy raw CUDA kernel for van der waals and electrostatic energies
+and energy gradients between all non-bonded atom pairs of a system, for systems
+large enough that the pair loop is limited by CPU memory bandwidth. Each thread
+handles one atom i, and each thread block stages tiles of atom j data in shared
+memory, which all of its threads then read.
+
+cupy is optional. If it is not installed, or finds no CUDA device, CUPY is False
+and callers should use mmlib.nonbonded or the NumPy array functions instead.
+"""
+
+import functools
+import numpy
+
+from mmlib import constants as const
+
+try:
+  import cupy
+except ImportError:
+  cupy = None
+
+def _GetDeviceCount():
+  """Number of visible CUDA devices, zero if no driver is available."""
+  try:
+    return cupy.cuda.runtime.getDeviceCount()
+  except cupy.cuda.runtime.CUDARuntimeError:
+    return 0
+
+
+# Whether GPU non-bonded kernels are available.
+CUPY = cupy is not None and _GetDeviceCount() > 0
+
+# Minimum number of atoms for molecules to use GPU kernels by default.
+GPU_MIN_ATOMS = 5000
+
+# Threads per block, and atoms j per shared memory tile. Power of 2.
+_TILE = 128
+
+_KERNEL_SOURCE = r'''
+extern "C" __global__
+void nonbonded_kernel(
+    const REAL* coords, const REAL* charge, const int* attype_id,
+    const REAL* lj_a, const REAL* lj_b, const int n_types,
+    const long long* nonint_indptr, const long long* nonint_idx,
+    const int n_atoms, const double elst_scale, const int with_gradient,
+    double* e_nonbonded, double* g_vdw, double* g_elst) {
+  __shared__ REAL x_j[TILE], y_j[TILE], z_j[TILE], q_j[TILE];
+  __shared__ int t_j[TILE];
+  __shared__ double e_vdw_sum[TILE], e_elst_sum[TILE];
+
+  const int i = blockIdx.x * TILE + threadIdx.x;
+  const bool active = i < n_atoms;
+  REAL x_i = 0, y_i = 0, z_i = 0, q_i = 0;
+  int t_i = 0;
+  long long k = 0, k_end = 0;
+  if (active) {
+    x_i = coords[3*i]; y_i = coords[3*i+1]; z_i = coords[3*i+2];
+    q_i = charge[i];
+    t_i = attype_id[i] * n_types;
+    k = nonint_indptr[i];
+    k_end = nonint_indptr[i+1];
+  }
+  long long excl = (k < k_end) ? nonint_idx[k] : -1;
+  double e_vdw = 0.0, e_elst = 0.0;
+  double gx_vdw = 0.0, gy_vdw = 0.0, gz_vdw = 0.0;
+  double gx_elst = 0.0, gy_elst = 0.0, gz_elst = 0.0;
+
+  for (int start = 0; start < n_atoms; start += TILE) {
+    const int j_load = start + threadIdx.x;
+    if (j_load < n_atoms) {
+      x_j[threadIdx.x] = coords[3*j_load];
+      y_j[threadIdx.x] = coords[3*j_load+1];
+      z_j[threadIdx.x] = coords[3*j_load+2];
+      q_j[threadIdx.x] = charge[j_load];
+      t_j[threadIdx.x] = attype_id[j_load];
+    }
+    __syncthreads();
+    const int n_tile = min(TILE, n_atoms - start);
+    for (int jj = 0; active && jj < n_tile; ++jj) {
+      // Exclusion row is sorted, so advance it alongside j.
+      if (start + jj == excl) {
+        ++k;
+        excl = (k < k_end) ? nonint_idx[k] : -1;
+        continue;
+      }
+      const REAL dx = x_i - x_j[jj];
+      const REAL dy = y_i - y_j[jj];
+      const REAL dz = z_i - z_j[jj];
+      const REAL inv_r2 = (REAL)1 / (dx*dx + dy*dy + dz*dz);
+      const REAL inv_r6 = inv_r2 * inv_r2 * inv_r2;
+      const REAL a_ij = lj_a[t_i + t_j[jj]];
+      const REAL b_ij = lj_b[t_i + t_j[jj]];
+      const REAL qq_r = q_i * q_j[jj] * sqrt(inv_r2);
+      e_vdw += (a_ij*inv_r6 - b_ij) * inv_r6;
+      e_elst += qq_r;
+      if (with_gradient) {
+        // Gradient magnitudes divided by r_ij, to scale (unnormalized) dx.
+        const REAL g_vdw_ij = ((REAL)6*b_ij - (REAL)12*a_ij*inv_r6)
+                              * inv_r6 * inv_r2;
+        const REAL g_elst_ij = -qq_r * inv_r2;
+        gx_vdw += g_vdw_ij * dx;
+        gy_vdw += g_vdw_ij * dy;
+        gz_vdw += g_vdw_ij * dz;
+        gx_elst += g_elst_ij * dx;
+        gy_elst += g_elst_ij * dy;
+        gz_elst += g_elst_ij * dz;
+      }
+    }
+    __syncthreads();
+  }
+
+  if (active && with_gradient) {
+    g_vdw[3*i] = gx_vdw; g_vdw[3*i+1] = gy_vdw; g_vdw[3*i+2] = gz_vdw;
+    g_elst[3*i] = elst_scale * gx_elst;
+    g_elst[3*i+1] = elst_scale * gy_elst;
+    g_elst[3*i+2] = elst_scale * gz_elst;
+  }
+
+  // Every pair is visited twice, so block sums of row sums are halved.
+  e_vdw_sum[threadIdx.x] = e_vdw;
+  e_elst_sum[threadIdx.x] = e_elst;
+  __syncthreads();
+  for (int stride = TILE / 2; stride > 0; stride >>= 1) {
+    if (threadIdx.x < stride) {
+      e_vdw_sum[threadIdx.x] += e_vdw_sum[threadIdx.x + stride];
+      e_elst_sum[threadIdx.x] += e_elst_sum[threadIdx.x + stride];
+    }
+    __syncthreads();
+  }
+  if (threadIdx.x == 0) {
+    atomicAdd(&e_nonbonded[0], 0.5 * e_vdw_sum[0]);
+    atomicAdd(&e_nonbonded[1], 0.5 * elst_scale * e_elst_sum[0]);
+  }
+}
+'''
+
+
+@functools.lru_cache(maxsize=None)
+def _GetKernel(real):
+  """Compile the non-bonded kernel for a C floating point type name."""
+  return cupy.RawKernel(_KERNEL_SOURCE, 'nonbonded_kernel',
+                        options=('-DREAL=%s' % real, '-DTILE=%i' % _TILE))
+
+
+class NonbondedData:
+  """Device copies of static non-bonded parameters of a molecule.
+
+  Uploaded once and reused by every kernel launch, so that only coordinates
+  are copied to the device for each energy or gradient evaluation.
+
+  Args:
+    charge (float*): Array of atomic partial charges [e].
+    attype_id (int*): Array of atomic vdw type indices.
+    lj_a (float**): TxT array of repulsive vdw coefficients [kcal*A^12/mol]
+        for each pair of vdw types.
+    lj_b (float**): TxT array of attractive vdw coefficients [kcal*A^6/mol]
+        for each pair of vdw types.
+    nonint_indptr (int*): Array of N+1 offsets of each atom's row in
+        'nonint_idx'.
+    nonint_idx (int*): Concatenated sorted arrays of atomic indices without
+        nonbonded interactions with each atom (including itself).
+
+  Attributes:
+    dtype (type): Floating point type of device arrays, from 'charge'.
+    n_atoms (int): Number of atoms.
+    n_types (int): Number of vdw types.
+    {arg} (cupy.ndarray): Device copy of each argument array.
+  """
+  def __init__(self, charge, attype_id, lj_a, lj_b, nonint_indptr,
+               nonint_idx):
+    self.dtype = charge.dtype
+    self.n_atoms = len(charge)
+    self.n_types = len(lj_a)
+    self.charge = cupy.asarray(charge)
+    self.attype_id = cupy.asarray(attype_id, dtype=cupy.int32)
+    self.lj_a = cupy.ascontiguousarray(cupy.asarray(lj_a, dtype=self.dtype))
+    self.lj_b = cupy.ascontiguousarray(cupy.asarray(lj_b, dtype=self.dtype))
+    self.nonint_indptr = cupy.asarray(nonint_indptr, dtype=cupy.int64)
+    self.nonint_idx = cupy.asarray(nonint_idx, dtype=cupy.int64)
+
+
+def _RunKernel(coords, data, dielectric, with_gradient):
+  """Launch the non-bonded kernel on current coordinates.
+
+  Returns:
+    e_nonbonded (float*): Van der waals and electrostatic energy [kcal/mol].
+    g_vdw (cupy.ndarray), g_elst (cupy.ndarray): Nx3 device arrays of van
+        der waals and electrostatic gradients [kcal/(mol*A)], if
+        'with_gradient', or else None.
+  """
+  real = 'float' if data.dtype == numpy.float32 else 'double'
+  coords = cupy.ascontiguousarray(cupy.asarray(coords, dtype=data.dtype))
+  e_nonbonded = cupy.zeros(2)
+  g_shape = (data.n_atoms, const.NUMDIM) if with_gradient else (1, 1)
+  g_vdw = cupy.empty(g_shape)
+  g_elst = cupy.empty(g_shape)
+  n_blocks = (data.n_atoms + _TILE - 1) // _TILE
+  _GetKernel(real)(
+      (n_blocks,), (_TILE,),
+      (coords, data.charge, data.attype_id, data.lj_a, data.lj_b,
+       numpy.int32(data.n_types), data.nonint_indptr, data.nonint_idx,
+       numpy.int32(data.n_atoms), numpy.float64(const.CEU2KCAL / dielectric),
+       numpy.int32(with_gradient), e_nonbonded, g_vdw, g_elst))
+  if not with_gradient:
+    g_vdw = g_elst = None
+  return cupy.asnumpy(e_nonbonded), g_vdw, g_elst
+
+
+def GetENonbonded(coords, data, dielectric):
+  """Calculate non-bonded interaction energy between all atom pairs on GPU.
+
+  GPU equivalent of mmlib.nonbonded.GetENonbonded.
+
+  Args:
+    coords (float**): Nx3 array of atomic coordinates [Angstrom].
+    data (NonbondedData): Device copies of molecule's non-bonded parameters.
+    dielectric (float): Dielectric constant of molecule.
+
+  Returns:
+    e_vdw (float): Van der waals energy [kcal/mol] of molecule.
+    e_elst (float): Electrostatic energy [kcal/mol] of molecule.
+  """
+  e_nonbonded, _, _ = _RunKernel(coords, data, dielectric, False)
+  return float(e_nonbonded[0]), float(e_nonbonded[1])
+
+
+def GetGNonbonded(g_vdw, g_elst, coords, data, dielectric):
+  """Calculate non-bonded energy gradients between all atom pairs on GPU.
+
+  GPU equivalent of mmlib.nonbonded.GetGNonbonded.
+
+  Args:
+    g_vdw (float**): Nx3 array of molecule's van der waals gradients.
+    g_elst (float**): Nx3 array of molecule's electrostatic gradients.
+    coords (float**): Nx3 array of atomic coordinates [Angstrom].
+    data (NonbondedData): Device copies of molecule's non-bonded parameters.
+    dielectric (float): Dielectric constant of molecule.
+  """
+  _, g_vdw_dev, g_elst_dev = _RunKernel(coords, data, dielectric, True)
+  g_vdw[:] = cupy.asnumpy(g_vdw_dev)
+  g_elst[:] = cupy.asnumpy(g_elst_dev)
+
+
+def GetEGNonbonded(g_vdw, g_elst, coords, data, dielectric):
+  """Calculate non-bonded energy and gradients between all atom pairs on GPU.
+
+  GPU equivalent of mmlib.nonbonded.GetEGNonbonded, from a single kernel
+  launch.
+
+  Args:
+    g_vdw (float**): Nx3 array of molecule's van der waals gradients.
+    g_elst (float**): Nx3 array of molecule's electrostatic gradients.
+    coords (float**): Nx3 array of atomic coordinates [Angstrom].
+    data (NonbondedData): Device copies of molecule's non-bonded parameters.
+    dielectric (float): Dielectric constant of molecule.
+
+  Returns:
+    e_vdw (float): Van der waals energy [kcal/mol] of molecule.
+    e_elst (float): Electrostatic energy [kcal/mol] of molecule.
+  """
+  e_nonbonded, g_vdw_dev, g_elst_dev = _RunKernel(coords, data, dielectric,
+                                                  True)
+  g_vdw[:] = cupy.asnumpy(g_vdw_dev)
+  g_elst[:] = cupy.asnumpy(g_elst_dev)
+  return float(e_nonbonded[0]), float(e_nonbonded[1])
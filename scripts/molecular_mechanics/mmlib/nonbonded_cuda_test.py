@@ -0,0 +1,88 @@
+"""Classes and functions for unit testing the mmlib nonbonded_cuda module."""
+
+import numpy
+import unittest
+
+from mmlib import nonbonded
+from mmlib import nonbonded_cuda
+from mmlib import test
+from mmlib import topology
+
+@unittest.skipUnless(nonbonded_cuda.CUPY, 'cupy GPU is not available')
+class _NonbondedCudaTestCase(unittest.TestCase):
+  """Shared random system for mmlib.nonbonded_cuda unit tests.
+
+  Spans several thread blocks, with a partial last block, and excludes
+  consecutive atom pairs to exercise exclusions across tile boundaries.
+  """
+
+  def setUp(self):
+    n_atoms = 300
+    rng = numpy.random.default_rng(0)
+    self.coords = 3.0 * rng.standard_normal((n_atoms, 3))
+    self.charge = rng.uniform(-0.5, 0.5, n_atoms)
+    ro = rng.choice([1.2, 1.5, 1.9], n_atoms)
+    sreps = numpy.sqrt(rng.choice([0.1, 0.2], n_atoms))
+    nonints = set()
+    for i in range(n_atoms - 1):
+      nonints.update([(i, i+1), (i+1, i)])
+    self.attype_id, self.lj_a, self.lj_b = topology.GetVdwTypes(ro, sreps)
+    self.nonint_indptr, self.nonint_idx = topology.GetNonintLists(
+        nonints, n_atoms)
+    self.data = nonbonded_cuda.NonbondedData(
+        self.charge, self.attype_id, self.lj_a, self.lj_b,
+        self.nonint_indptr, self.nonint_idx)
+
+  def _GetListParams(self):
+    return (self.coords, self.charge, self.attype_id, self.lj_a, self.lj_b,
+            self.nonint_indptr, self.nonint_idx, 2.0)
+
+
+class TestGetENonbonded(_NonbondedCudaTestCase):
+  """Unit tests for mmlib.nonbonded_cuda.GetENonbonded method."""
+
+  def testMatchesCpu(self):
+    """Asserts same energy as CPU nonbonded kernel."""
+    e_vdw, e_elst = nonbonded_cuda.GetENonbonded(self.coords, self.data, 2.0)
+    e_vdw_ref, e_elst_ref = nonbonded.GetENonbonded(*self._GetListParams())
+    self.assertAlmostEqual(e_vdw, e_vdw_ref, places=5)
+    self.assertAlmostEqual(e_elst, e_elst_ref, places=5)
+
+
+class TestGetGNonbonded(_NonbondedCudaTestCase):
+  """Unit tests for mmlib.nonbonded_cuda.GetGNonbonded method."""
+
+  def testMatchesCpu(self):
+    """Asserts same gradient as CPU nonbonded kernel."""
+    test.assertGradientsEqual(
+        self, len(self.coords),
+        nonbonded_cuda.GetGNonbonded, (self.coords, self.data, 2.0),
+        nonbonded.GetGNonbonded, self._GetListParams())
+
+
+class TestGetEGNonbonded(_NonbondedCudaTestCase):
+  """Unit tests for mmlib.nonbonded_cuda.GetEGNonbonded method."""
+
+  def testMatchesCpu(self):
+    """Asserts same energy and gradient as CPU nonbonded kernel."""
+    e_vdw, e_elst = test.assertGradientsEqual(
+        self, len(self.coords),
+        nonbonded_cuda.GetEGNonbonded, (self.coords, self.data, 2.0),
+        nonbonded.GetGNonbonded, self._GetListParams())
+    e_vdw_ref, e_elst_ref = nonbonded.GetENonbonded(*self._GetListParams())
+    self.assertAlmostEqual(e_vdw, e_vdw_ref, places=5)
+    self.assertAlmostEqual(e_elst, e_elst_ref, places=5)
+
+
+def suite():
+  """Builds a test suite of all unit tests in nonbonded_cuda_test module."""
+  test_classes = (
+      TestGetENonbonded,
+      TestGetGNonbonded,
+      TestGetEGNonbonded)
+
+  suite = unittest.TestSuite()
+  for test_class in test_classes:
+    tests = unittest.TestLoader().loadTestsFromTestCase(test_class)
+    suite.addTests(tests)
+  return suite
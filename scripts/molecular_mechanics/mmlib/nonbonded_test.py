@@ -0,0 +1,200 @@
+"""Classes and functions for unit testing the mmlib nonbonded module."""
+
+import numpy
+import unittest
+
+from mmlib import energy
+from mmlib import gradient
+from mmlib import nonbonded
+from mmlib import test
+from mmlib import topology
+
+class _NonbondedTestCase(unittest.TestCase):
+  """Shared three-atom system for mmlib.nonbonded unit tests."""
+
+  def setUp(self):
+    self.coords = numpy.array(
+        [[0.0, 0.0, 0.0], [3.0, 0.0, 0.0], [0.0, 4.0, 0.0]])
+    self.charge = numpy.array([0.4, -0.2, -0.2])
+    self.ro = numpy.array([1.5, 1.2, 1.2])
+    self.sreps = numpy.sqrt(numpy.array([0.2, 0.1, 0.1]))
+    self.nonints = set()
+
+  def _GetMaskParams(self):
+    attype_id, lj_a, lj_b = topology.GetVdwTypes(self.ro, self.sreps)
+    nonint_mask = topology.GetNonintMask(self.nonints, len(self.coords))
+    return (self.coords, self.charge, attype_id, lj_a, lj_b, nonint_mask, 2.0)
+
+  def _GetListParams(self):
+    attype_id, lj_a, lj_b = topology.GetVdwTypes(self.ro, self.sreps)
+    nonint_indptr, nonint_idx = topology.GetNonintLists(
+        self.nonints, len(self.coords))
+    return (self.coords, self.charge, attype_id, lj_a, lj_b, nonint_indptr,
+            nonint_idx, 2.0)
+
+  def _GetPairParams(self, rcut):
+    params = self._GetListParams()
+    pairs = topology.GetNeighborPairs(self.coords, rcut, *params[5:7])
+    return params[:5] + (pairs, rcut, 2.0)
+
+
+class _NonbondedTilesTestCase(_NonbondedTestCase):
+  """Shared random system over several tiles for mmlib.nonbonded unit tests."""
+
+  def setUp(self):
+    n_atoms = 3 * nonbonded._TILE + 5
+    rng = numpy.random.default_rng(0)
+    self.coords = 20.0 * rng.random((n_atoms, 3))
+    self.charge = rng.uniform(-0.5, 0.5, n_atoms)
+    self.ro = rng.choice([1.2, 1.5], n_atoms)
+    self.sreps = numpy.sqrt(rng.choice([0.1, 0.2], n_atoms))
+    # Exclusions within a tile and across each tile boundary.
+    self.nonints = set()
+    for i in range(n_atoms - 1):
+      self.nonints.update([(i, i+1), (i+1, i)])
+
+
+class TestGetENonbonded(_NonbondedTestCase):
+  """Unit tests for mmlib.nonbonded.GetENonbonded method."""
+
+  def testAllPairs(self):
+    """Asserts same energy as NumPy arrays when no pairs are excluded."""
+    e_vdw, e_elst = nonbonded.GetENonbonded(*self._GetListParams())
+    e_vdw_ref, e_elst_ref = energy.GetENonbonded(*self._GetMaskParams())
+    self.assertAlmostEqual(e_vdw, e_vdw_ref)
+    self.assertAlmostEqual(e_elst, e_elst_ref)
+
+  def testExcludedPair(self):
+    """Asserts same energy as NumPy arrays with an excluded pair."""
+    self.nonints = set([(0, 1), (1, 0)])
+    e_vdw, e_elst = nonbonded.GetENonbonded(*self._GetListParams())
+    e_vdw_ref, e_elst_ref = energy.GetENonbonded(*self._GetMaskParams())
+    self.assertAlmostEqual(e_vdw, e_vdw_ref)
+    self.assertAlmostEqual(e_elst, e_elst_ref)
+
+  def testPackedBuffer(self):
+    """Asserts same energy with coordinates packed into a given buffer."""
+    xyzq = numpy.zeros((3, 4))
+    e_vdw, e_elst = nonbonded.GetENonbonded(*self._GetListParams(), xyzq=xyzq)
+    e_vdw_ref, e_elst_ref = nonbonded.GetENonbonded(*self._GetListParams())
+    self.assertAlmostEqual(e_vdw, e_vdw_ref)
+    self.assertAlmostEqual(e_elst, e_elst_ref)
+    test.assertListAlmostEqual(self, xyzq[:, 3], self.charge)
+
+
+class TestGetGNonbonded(_NonbondedTestCase):
+  """Unit tests for mmlib.nonbonded.GetGNonbonded method."""
+
+  def testAllPairs(self):
+    """Asserts same gradient as NumPy arrays when no pairs are excluded."""
+    test.assertGradientsEqual(
+        self, len(self.coords),
+        nonbonded.GetGNonbonded, self._GetListParams(),
+        gradient.GetGNonbonded, self._GetMaskParams())
+
+  def testExcludedPair(self):
+    """Asserts same gradient as NumPy arrays with an excluded pair."""
+    self.nonints = set([(0, 2), (2, 0)])
+    test.assertGradientsEqual(
+        self, len(self.coords),
+        nonbonded.GetGNonbonded, self._GetListParams(),
+        gradient.GetGNonbonded, self._GetMaskParams())
+
+
+class TestNonbondedTiles(_NonbondedTilesTestCase):
+  """Unit tests for mmlib.nonbonded kernels over several tiles of atoms."""
+
+  def testEnergy(self):
+    """Asserts same energy as NumPy arrays."""
+    e_vdw, e_elst = nonbonded.GetENonbonded(*self._GetListParams())
+    e_vdw_ref, e_elst_ref = energy.GetENonbonded(*self._GetMaskParams())
+    self.assertAlmostEqual(e_vdw / e_vdw_ref, 1.0)
+    self.assertAlmostEqual(e_elst / e_elst_ref, 1.0)
+
+  def testGradient(self):
+    """Asserts same gradient as NumPy arrays."""
+    test.assertGradientsEqual(
+        self, len(self.coords),
+        nonbonded.GetGNonbonded, self._GetListParams(),
+        gradient.GetGNonbonded, self._GetMaskParams())
+
+
+class TestNonbondedPairs(_NonbondedTilesTestCase):
+  """Unit tests for mmlib.nonbonded kernels over neighbor list pairs."""
+
+  def testEnergyAllPairs(self):
+    """Asserts same energy as all pairs with cutoff beyond all atoms."""
+    e_vdw, e_elst = nonbonded.GetENonbondedPairs(*self._GetPairParams(100.0))
+    e_vdw_ref, e_elst_ref = nonbonded.GetENonbonded(*self._GetListParams())
+    self.assertAlmostEqual(e_vdw / e_vdw_ref, 1.0)
+    self.assertAlmostEqual(e_elst / e_elst_ref, 1.0)
+
+  def testEnergyCutoff(self):
+    """Asserts same truncated energy as NumPy arrays."""
+    params = self._GetPairParams(6.0)
+    e_vdw, e_elst = nonbonded.GetENonbondedPairs(*params)
+    e_vdw_ref, e_elst_ref = energy.GetENonbondedPairs(*params)
+    self.assertAlmostEqual(e_vdw / e_vdw_ref, 1.0)
+    self.assertAlmostEqual(e_elst / e_elst_ref, 1.0)
+
+  def testGradientCutoff(self):
+    """Asserts same truncated gradient as NumPy arrays."""
+    params = self._GetPairParams(6.0)
+    test.assertGradientsEqual(
+        self, len(self.coords),
+        nonbonded.GetGNonbondedPairs, params,
+        gradient.GetGNonbondedPairs, params)
+
+
+class TestGetEGNonbonded(_NonbondedTilesTestCase):
+  """Unit tests for fused non-bonded energy and gradient methods."""
+
+  def _AssertFusedMatches(self, get_eg, eg_params, get_e, get_g, params):
+    e_vdw, e_elst = test.assertGradientsEqual(
+        self, len(self.coords), get_eg, eg_params, get_g, params)
+    e_vdw_ref, e_elst_ref = get_e(*params)
+    self.assertAlmostEqual(e_vdw / e_vdw_ref, 1.0)
+    self.assertAlmostEqual(e_elst / e_elst_ref, 1.0)
+
+  def testCompiled(self):
+    """Asserts compiled kernel matches separate NumPy arrays methods."""
+    self._AssertFusedMatches(
+        nonbonded.GetEGNonbonded, self._GetListParams(),
+        energy.GetENonbonded, gradient.GetGNonbonded, self._GetMaskParams())
+
+  def testArrays(self):
+    """Asserts NumPy arrays method matches separate NumPy arrays methods."""
+    params = self._GetMaskParams()
+    self._AssertFusedMatches(
+        gradient.GetEGNonbonded, params,
+        energy.GetENonbonded, gradient.GetGNonbonded, params)
+
+  def testCompiledPairs(self):
+    """Asserts compiled cutoff kernel matches separate NumPy methods."""
+    params = self._GetPairParams(6.0)
+    self._AssertFusedMatches(
+        nonbonded.GetEGNonbondedPairs, params,
+        energy.GetENonbondedPairs, gradient.GetGNonbondedPairs, params)
+
+  def testArraysPairs(self):
+    """Asserts NumPy cutoff method matches separate NumPy methods."""
+    params = self._GetPairParams(6.0)
+    self._AssertFusedMatches(
+        gradient.GetEGNonbondedPairs, params,
+        energy.GetENonbondedPairs, gradient.GetGNonbondedPairs, params)
+
+
+def suite():
+  """Builds a test suite of all unit tests in nonbonded_test module."""
+  test_classes = (
+      TestGetENonbonded,
+      TestGetGNonbonded,
+      TestNonbondedTiles,
+      TestNonbondedPairs,
+      TestGetEGNonbonded)
+
+  suite = unittest.TestSuite()
+  for test_class in test_classes:
+    tests = unittest.TestLoader().loadTestsFromTestCase(test_class)
+    suite.addTests(tests)
+  return suite
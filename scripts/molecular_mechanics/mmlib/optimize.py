@@ -41,13 +41,9 @@ class Trajectory:
   def AppendStep(self, mol):
     """Append current molecule data to Trajectory object."""
     self.n_steps += 1
-    self.coords.append(numpy.zeros((self.n_atoms, const.NUMDIM)))
-    self.grad.append(numpy.zeros((self.n_atoms, const.NUMDIM)))
+    self.coords.append(numpy.copy(mol.coords))
+    self.grad.append(numpy.copy(mol.g_total))
     self.energy.append(mol.e_total)
-    for i in range(self.n_atoms):
-      for j in range(const.NUMDIM):
-        self.coords[-1][i][j] = mol.atoms[i].coords[j]
-        self.grad[-1][i][j] = mol.g_total[i][j]
 
 
 class Optimization:
@@ -116,7 +112,7 @@ class Optimization:
   def __init__(self, infile_name):
     self.infile = os.path.realpath(infile_name)
     self.indir = os.path.dirname(self.infile)
-    self.name = '.'.join(self.infile.split('/')[-1].split('.')[:-1])
+    self.name = os.path.splitext(os.path.basename(self.infile))[0]
     self.opt_type = 'sd'
     self.opt_str = 'default'
     self.mol = []
@@ -306,17 +302,12 @@ class Optimization:
       disp_mag (float): Magnitude of displacement [Angstrom].
       disp_vector (float**): Displacement direction vector.
     """
-    for i in range(self.mol.n_atoms):
-      for j in range(const.NUMDIM):
-        self.mol.atoms[i].coords[j] += disp_mag * disp_vector[i][j]
+    self.mol.coords += disp_mag * disp_vector
     self.mol.UpdateInternals()
 
   def _CopyCoords(self):
     """Create a copy of current molecular coordinates."""
-    self.ccoords = numpy.zeros((self.mol.n_atoms, const.NUMDIM))
-    for i in range(self.mol.n_atoms):
-      for j in range(const.NUMDIM):
-        self.ccoords[i][j] = self.mol.atoms[i].coords[j]
+    self.ccoords = numpy.copy(self.mol.coords)
   
   def GetDispDeriv(self, disp_mag, disp_vector):
     """Numerical energy derivative in direction of displacement."""
@@ -351,9 +342,7 @@ class Optimization:
 
   def _UpdateCoords(self, new_coords):
     """Update atomic coordinates to values in a given vector."""
-    for i in range(self.mol.n_atoms):
-      for j in range(const.NUMDIM):
-        self.mol.atoms[i].coords[j] = new_coords[i][j]
+    self.mol.coords[:] = new_coords
 
   def PrintEnergyHeader(self):
       """Print header of convergence output columns to file."""
@@ -4,6 +4,8 @@ Includes parameters for atomic mass, atomic covalent radii, atomic van der
 waals, mm bonds, mm angles, mm torsions, and mm outofplanes.
 """
 
+import functools
+
 # relative atomic masses of elements (in atomic mass units [g/mol]) from
 # "CRC Handbook" 84th ed, ed Lide, pgs 1-12 - 1-14
 _ATOMIC_MASSES = {
@@ -281,6 +283,7 @@ _OUTOFPLANE_1234_PARAMETERS = {
     ('NA', 'CW', 'CC', 'CT'): 1.1, ('NA', 'NC', 'CA', 'N2'): 1.1,
     ('NB', 'CW', 'CC', 'CT'): 1.1}
 
+@functools.lru_cache(maxsize=128)
 def GetElement(at_type):
   """Infer atomic element from atom type.
 
@@ -300,6 +303,7 @@ def GetElement(at_type):
     return at_type[0:2].capitalize()
 
 
+@functools.lru_cache(maxsize=128)
 def GetMass(element):
   """Find the mass of an atom of a given element (periodic table avg).
   
@@ -318,6 +322,7 @@ def GetMass(element):
     raise ValueError('No atomic mass found for element: %s' % (element))
 
 
+@functools.lru_cache(maxsize=128)
 def GetCovRad(element):
   """Find the covalent radius of an atom of a given element.
   
@@ -209,17 +209,16 @@ class MolecularDynamics(Simulation):
     """
     self._OpenOutputFiles()
     self._InitializeVels()
-    self.mol.GetEnergy()
-    self.mol.GetGradient()
+    self.mol.GetEnergyAndGradient()
     self._UpdateAccs()
     self._CheckPrint(0.0, print_all=True)
     self._UpdateVels(0.5*self.timestep)
     while self.time < self.tottime:
       self._UpdateCoords(self.timestep)
-      self.mol.GetGradient()
+      self.mol.GetEnergyAndGradient('nokinetic')
       self._UpdateAccs()
       self._UpdateVels(self.timestep)
-      self.mol.GetEnergy('leapfrog')
+      self.mol.GetEKinetic('leapfrog')
       if self.time < self.eqtime:
         self._EquilibrateTemp()
       self._CheckPrint(self.timestep)
@@ -239,16 +238,15 @@ class MolecularDynamics(Simulation):
       self.etemp = self.temperature
       numpy.random.seed(self.random_seed)
       sigma_base = math.sqrt(2.0 * const.RGAS * self.temperature / const.NUMDIM)
-      for atom in self.mol.atoms:
-        sigma = sigma_base * atom.mass**(-0.5)
-        atom.vels = numpy.random.normal(0.0, sigma, const.NUMDIM)
+      sigma = sigma_base * self.mol.mass[:, numpy.newaxis]**(-0.5)
+      self.mol.vels[:] = numpy.random.normal(
+          0.0, sigma, (self.mol.n_atoms, const.NUMDIM))
 
       self.mol.GetEnergy()
       self.mol.GetTemperature()
 
       vscale = math.sqrt(self.temperature / self.mol.temperature)
-      for atom in self.mol.atoms:
-        atom.vels *= vscale
+      self.mol.vels *= vscale
 
   def _EquilibrateTemp(self):
     """Adjust velocities to equilibrate energy to set temperature.
@@ -261,9 +259,7 @@ class MolecularDynamics(Simulation):
     tweight = 10.0 * self.timestep
     self.etemp = (self.etemp + tweight * self.mol.temperature)/(1.0 + tweight)
     velscale = 1.0 + tscale * (math.sqrt(self.temperature / self.etemp) - 1.0)
-    for i in range(self.mol.n_atoms):
-      for j in range(const.NUMDIM):
-        self.mol.atoms[i].vels[j] *= velscale
+    self.mol.vels *= velscale
 
   def _UpdateAccs(self):
     """Update accelerations of atoms [Angstrom/(ps^2)].
@@ -271,12 +267,9 @@ class MolecularDynamics(Simulation):
     Force is the negative gradient of the potential energy. Find
     accelerations by dividing the forces by the atomic masses.
     """
-    for i in range(self.mol.n_atoms):
-      mass = self.mol.atoms[i].mass
-      for j in range(const.NUMDIM):
-        self.mol.atoms[i].paccs[j] = self.mol.atoms[i].accs[j]
-        self.mol.atoms[i].accs[j] = (
-            -const.ACCCONV * self.mol.g_total[i][j] / mass)
+    self.mol.paccs[:] = self.mol.accs
+    numpy.divide(-const.ACCCONV * self.mol.g_total,
+                 self.mol.mass[:, numpy.newaxis], out=self.mol.accs)
 
   def _UpdateVels(self, dt):
     """Update velocities of atoms [Angstrom/ps].
@@ -287,10 +280,8 @@ class MolecularDynamics(Simulation):
     Args:
       dt (float): time propogation increment [ps].
     """
-    for i in range(self.mol.n_atoms):
-      for j in range(const.NUMDIM):
-        self.mol.atoms[i].pvels[j] = self.mol.atoms[i].vels[j]
-        self.mol.atoms[i].vels[j] += self.mol.atoms[i].accs[j] * dt
+    self.mol.pvels[:] = self.mol.vels
+    self.mol.vels += self.mol.accs * dt
 
   def _UpdateCoords(self, dt):
     """Update coordinates of atoms [Angstrom].
@@ -301,9 +292,7 @@ class MolecularDynamics(Simulation):
     Args:
       dt (float): time propogation increment [ps].
     """
-    for i in range(self.mol.n_atoms):
-      for j in range(const.NUMDIM):
-        self.mol.atoms[i].coords[j] += self.mol.atoms[i].vels[j] * dt
+    self.mol.coords += self.mol.vels * dt
     self.mol.UpdateInternals()
 
   def _CheckPrint(self, timestep, print_all=False):
@@ -439,9 +428,7 @@ class MonteCarlo(Simulation):
 
   def _ZeroVels(self):
     """Set all 3N atomic velocity components to zero."""
-    for i in range(self.mol.n_atoms):
-      for j in range(const.NUMDIM):
-        self.mol.atoms[i].vels[j] = 0.0
+    self.mol.vels.fill(0.0)
 
   def _DispCoords(self, disp_vector):
     """Displace all 3N atomic coordinates by specified vector.
@@ -449,9 +436,7 @@ class MonteCarlo(Simulation):
     Args:
       disp_vector (float**): Nx3 atomic displacement array [Angstrom].
     """
-    for i in range(self.mol.n_atoms):
-      for j in range(const.NUMDIM):
-        self.mol.atoms[i].coords[j] += disp_vector[i][j]
+    self.mol.coords += disp_vector
     self.mol.UpdateInternals()
 
   def _ChangeDisp(self):
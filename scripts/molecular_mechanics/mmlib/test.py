@@ -6,22 +6,39 @@ WARNING: Incomplete. Work in progress. Subject to change at any time.
 import numpy
 import unittest
 
+from mmlib import energy_jax_test
 from mmlib import energy_test
 from mmlib import fileio_test
 from mmlib import geomcalc_test
+from mmlib import gradient_test
+from mmlib import molecule_test
+from mmlib import nonbonded_cuda_test
+from mmlib import nonbonded_test
 from mmlib import param_test
+from mmlib import topology_test
 
 # Message to print at conclusion of test suite.
 _SUCCESS_MESSAGE = '\nAll tests succeeded. mmlib is ready for use.'
 _FAILURE_MESSAGE = '\nSome tests failed. Results may not be reliable.'
 
+# Four-atom chain with all bonded terms away from singular geometries, shared
+# by finite difference checks of analytic and autodiff gradients.
+CHAIN_COORDS = numpy.array([[0.1, 1.0, 0.2], [0.0, 0.0, 0.0],
+                            [1.5, 0.0, 0.1], [2.1, 1.1, 0.9]])
+
 def RunTests():
   """Executes test suites for all mmlib modules."""
   test_suites = [
       fileio_test.suite(),
       geomcalc_test.suite(),
       energy_test.suite(),
-      param_test.suite()]
+      energy_jax_test.suite(),
+      gradient_test.suite(),
+      molecule_test.suite(),
+      nonbonded_test.suite(),
+      nonbonded_cuda_test.suite(),
+      param_test.suite(),
+      topology_test.suite()]
 
   combo_suite = unittest.TestSuite(test_suites)
   result = unittest.TextTestRunner().run(combo_suite)
@@ -48,18 +65,56 @@ def assertListAlmostEqual(test_case, test_vector, reference_vector):
     else:
       test_case.assertAlmostEqual(test_value, reference_value, places=6)
 
+
+def assertGradientsEqual(test_case, n_atoms, get_g, params, get_g_ref,
+                         params_ref):
+  """Supplemental function for near equality of nonbonded gradient methods.
+
+  Args:
+    test_case (unittest.TestCase): Unit test class instance.
+    n_atoms (int): Number of atoms.
+    get_g (function): Nonbonded gradient method to test, which fills vdw and
+        electrostatic gradient arrays given as its first two arguments.
+    params (type*): Remaining arguments of 'get_g'.
+    get_g_ref (function): Reference nonbonded gradient method.
+    params_ref (type*): Remaining arguments of 'get_g_ref'.
+
+  Returns:
+    out (type): Return value of 'get_g', e.g. energies of fused methods.
+  """
+  g_vdw, g_elst, g_vdw_ref, g_elst_ref = numpy.zeros((4, n_atoms, 3))
+  out = get_g(g_vdw, g_elst, *params)
+  get_g_ref(g_vdw_ref, g_elst_ref, *params_ref)
+  assertListAlmostEqual(test_case, g_vdw, g_vdw_ref)
+  assertListAlmostEqual(test_case, g_elst, g_elst_ref)
+  return out
+
+
+def _GetPublicAttributes(test_object):
+  """Names of public non-method attributes (including properties) of object.
+
+  Args:
+    test_object (type): Object of type with attributes.
+
+  Returns:
+    attributes (str*): Sorted array of attribute names.
+  """
+  return [attribute for attribute in dir(test_object)
+          if not attribute.startswith('_')
+          and not callable(getattr(test_object, attribute))]
+
 def assertObjectEqual(test_case, test_object, reference_object):
-  """Supplemental function for equality of all object attributes.
+  """Supplemental function for equality of all public object attributes.
 
   Args:
     test_case (unittest.TestCase): Unit test class instance.
     test_object (type): Object of type with attributes to test.
     reference_object (type): Reference to assert equality of test_object.
   """
-  test_case.assertEqual(test_object.__dict__.keys(),
-                        reference_object.__dict__.keys())
+  attributes = _GetPublicAttributes(test_object)
+  test_case.assertEqual(attributes, _GetPublicAttributes(reference_object))
 
-  for attribute in test_object.__dict__:
+  for attribute in attributes:
     test_value = getattr(test_object, attribute)
     reference_value = getattr(reference_object, attribute)
     
@@ -6,38 +6,123 @@ threshold of the sum of interatomic covalent radii.
 """
 
 import itertools
-import math
+import numpy
 
 from mmlib import constants as const
 from mmlib import geomcalc
 from mmlib import molecule
 from mmlib import param
 
-def GetBondGraph(atoms):
+try:
+  from scipy import spatial
+except ImportError:
+  spatial = None
+
+# Number of atoms per block of rows in dense search for nearby atom pairs.
+_BOND_SEARCH_ROWS = 256
+
+# Minimum number of atoms for k-d tree search for nearby atom pairs.
+_KDTREE_MIN_ATOMS = 10000
+
+def _GetPairsWithin(coords, r_max):
+  """Find all atom pairs closer than a distance.
+
+  Compares squared distances for blocks of '_BOND_SEARCH_ROWS' atoms against
+  all atoms at once. For large systems, if scipy is available, uses a k-d tree
+  search instead.
+
+  Args:
+    coords (float**): Nx3 array of atomic coordinates [Angstrom].
+    r_max (float): Maximum pair distance [Angstrom].
+
+  Returns:
+    pairs (int**): Mx2 array of atomic indices (i < j) of atom pairs within
+        'r_max', sorted by i and then j.
+  """
+  n_atoms = len(coords)
+  if spatial is not None and n_atoms > _KDTREE_MIN_ATOMS:
+    pairs = spatial.cKDTree(coords).query_pairs(r_max, output_type='ndarray')
+    return pairs[numpy.lexsort((pairs[:, 1], pairs[:, 0]))]
+
+  blocks = []
+  for start in range(0, n_atoms, _BOND_SEARCH_ROWS):
+    stop = min(start + _BOND_SEARCH_ROWS, n_atoms)
+    dr_ij = coords[start:stop, numpy.newaxis, :] - coords[numpy.newaxis, :, :]
+    r2_ij = numpy.sum(dr_ij**2, axis=2)
+    # Keep only pairs with j > i from each row.
+    within = numpy.triu(r2_ij < r_max**2, k=start+1)
+    i, j = numpy.nonzero(within)
+    blocks.append(numpy.column_stack((i + start, j)))
+  return numpy.concatenate(blocks) if blocks else numpy.zeros((0, 2), int)
+
+
+def GetBondPairs(coords, covrad):
+  """Find atom pairs within a threshold of the sum of their covalent radii.
+
+  Args:
+    coords (float**): Nx3 array of atomic coordinates [Angstrom].
+    covrad (float*): Array of atomic covalent radii [Angstrom].
+
+  Returns:
+    pairs (int**): Mx2 array of atomic indices (i < j) of bonded atom pairs,
+        sorted by i and then j.
+    r_ij (float*): Array of distances [Angstrom] of bonded atom pairs.
+  """
+  if not len(coords):
+    return numpy.zeros((0, 2), int), numpy.zeros(0)
+  max_threshold = 2.0 * const.BONDTHRESHOLD * numpy.max(covrad)
+  pairs = _GetPairsWithin(coords, max_threshold)
+
+  r2_ij = numpy.sum((coords[pairs[:, 1]] - coords[pairs[:, 0]])**2, axis=1)
+  threshold = const.BONDTHRESHOLD * (covrad[pairs[:, 0]] + covrad[pairs[:, 1]])
+  bonded = r2_ij < threshold**2
+  return pairs[bonded], numpy.sqrt(r2_ij[bonded])
+
+
+def GetNeighborPairs(coords, r_list, nonint_indptr, nonint_idx):
+  """Build Verlet list of interacting atom pairs within a distance.
+
+  Args:
+    coords (float**): Nx3 array of atomic coordinates [Angstrom].
+    r_list (float): Neighbor list radius [Angstrom], a cutoff distance plus
+        a buffer for atomic displacements between list updates.
+    nonint_indptr (int*): Array of N+1 offsets of each atom's row in
+        'nonint_idx'.
+    nonint_idx (int*): Concatenated sorted arrays of atomic indices without
+        nonbonded interactions with each atom.
+
+  Returns:
+    pairs (int**): Mx2 array of atomic indices (i < j) of atom pairs with
+        nonbonded interactions within 'r_list', sorted by i and then j.
+  """
+  n_atoms = len(coords)
+  pairs = _GetPairsWithin(coords, r_list)
+  nonint_rows = numpy.repeat(numpy.arange(n_atoms), numpy.diff(nonint_indptr))
+  excluded = numpy.isin(pairs[:, 0] * n_atoms + pairs[:, 1],
+                        nonint_rows * n_atoms + nonint_idx)
+  return numpy.ascontiguousarray(pairs[~excluded])
+
+
+def GetBondGraph(coords, covrad):
   """Build graph of which atoms are covalently bonded and bond lengths.
   
-  Search all atom pairs to find those within a threshold of the sum of the
-  interatomic covalent radii. Append those found to the bond graph dictionary of
-  each Atom object within the Molecule object.
+  Find all atom pairs within a threshold of the sum of the interatomic covalent
+  radii, and add them to the bond graph dictionary.
   
   First atomic index is the array index. Second atomic index is a dictionary
   key. The value is the bond length [Angstrom] of the bond.
   
   Args:
-    atoms (mmlib.molecule.Atom*): Array of Atom objects with coordinate and MM
-        parameter data.
+    coords (float**): Nx3 array of atomic coordinates [Angstrom].
+    covrad (float*): Array of atomic covalent radii [Angstrom].
 
   Returns:
     bond_graph (int:(int:float)): Dictionary of bond connectivity.
   """
-  bond_graph = {i:{} for i in range(len(atoms))}
-  for i, j in itertools.combinations(range(len(atoms)), 2):
-    at1, at2 = atoms[i], atoms[j]
-    threshold = const.BONDTHRESHOLD * (at1.covrad + at2.covrad)
-    r2_12 = geomcalc.GetR2ij(at1.coords, at2.coords)
-    if r2_12 < threshold**2:
-      r_12 = math.sqrt(r2_12)
-      bond_graph[i][j] = bond_graph[j][i] = r_12
+  bond_graph = {i:{} for i in range(len(coords))}
+  pairs, r_ij = GetBondPairs(coords, covrad)
+  for (i, j), r_12 in zip(pairs.tolist(), r_ij.tolist()):
+    bond_graph[i][j] = bond_graph[j][i] = r_12
   return bond_graph
 
 
@@ -215,73 +300,178 @@ def GetNonints(bonds, angles, torsions):
   return nonints
 
 
-def UpdateBonds(bonds, atoms, bond_graph):
-  """Update all bond lengths [Angstrom] within a molecule object.
-  
+def GetNonintPairs(nonints, n_atoms):
+  """Gather atomic pairs without nonbonded interactions into a sorted array.
+
   Args:
-    bonds (mmlib.molecule.Bond*): Array of molecule's Bond objects.
-    atoms (mmlib.molecule.Atom*): Array of molecule's Atom objects.
-    bond_graph (int:(int:float)): Dictionary of bond connectivity.
+    nonints (set(int, int)): Set of atomic index pairs of non-interacting
+        nonbonded atom pairs.
+    n_atoms (int): Number of atoms in molecule.
+
+  Returns:
+    pairs (int**): Mx2 array of all pairs in 'nonints' and all self pairs
+        (i, i), sorted by first and then second atomic index.
   """
-  for bond in bonds:
-    c1 = atoms[bond.at1].coords
-    c2 = atoms[bond.at2].coords
-    bond.r_ij = geomcalc.GetRij(c1, c2)
-    bond_graph[bond.at1][bond.at2] = bond.r_ij
-    bond_graph[bond.at2][bond.at1] = bond.r_ij
+  pairs = numpy.fromiter(itertools.chain.from_iterable(nonints),
+                         dtype=numpy.int64, count=2*len(nonints))
+  self_pairs = numpy.repeat(numpy.arange(n_atoms, dtype=numpy.int64), 2)
+  pairs = numpy.concatenate((pairs, self_pairs)).reshape(-1, 2)
+  return pairs[numpy.lexsort((pairs[:, 1], pairs[:, 0]))]
 
 
-def UpdateAngles(angles, atoms, bond_graph):
-  """Update all bond angles [degrees] within a molecule object.
-  
+def GetNonintMask(nonints, n_atoms):
+  """Build boolean matrix of atomic pairs without nonbonded interactions.
+
+  Marks all pairs in 'nonints' and all self pairs (i, i), so that nonbonded
+  energy and gradient arrays can skip them with a single mask.
+
   Args:
-    angles (mmlib.molecule.Angle*): Array of molecule's Angle objects.
-    atoms (mmlib.molecule.Atom*): Array of molecule's Atom objects.
-    bond_graph (int:(int:float)): Dictionary of bond connectivity.
+    nonints (set(int, int)): Set of atomic index pairs of non-interacting
+        nonbonded atom pairs.
+    n_atoms (int): Number of atoms in molecule.
+
+  Returns:
+    nonint_mask (bool**): NxN array, True for pairs without nonbonded
+        interactions.
   """
-  for angle in angles:
-    r12 = bond_graph[angle.at1][angle.at2]
-    r23 = bond_graph[angle.at2][angle.at3]
-    c1 = atoms[angle.at1].coords
-    c2 = atoms[angle.at2].coords
-    c3 = atoms[angle.at3].coords
-    angle.a_ijk = geomcalc.GetAijk(c1, c2, c3, r12, r23)
+  pairs = GetNonintPairs(nonints, n_atoms)
+  nonint_mask = numpy.zeros((n_atoms, n_atoms), dtype=bool)
+  nonint_mask[pairs[:, 0], pairs[:, 1]] = True
+  return nonint_mask
 
 
-def UpdateTorsions(torsions, atoms, bond_graph):
-  """Update all torsion angles [degrees] within a molecule object.
-  
+def GetNonintLists(nonints, n_atoms):
+  """Build sorted per-atom arrays of atoms without nonbonded interactions.
+
+  Stores the rows of the non-interaction matrix in compressed sparse row form,
+  with each atom's own index included in its row, so that compiled kernels can
+  skip excluded pairs while looping over all atoms in order.
+
   Args:
-    torsions (mmlib.molecule.Torsion*): Array of molecule's Torsion objects.
-    atoms (mmlib.molecule.Atom*): Array of molecule's Atom objects.
-    bond_graph (int:(int:float)): Dictionary of bond connectivity.
+    nonints (set(int, int)): Set of atomic index pairs of non-interacting
+        nonbonded atom pairs.
+    n_atoms (int): Number of atoms in molecule.
+
+  Returns:
+    nonint_indptr (int*): Array of N+1 offsets of each atom's row in
+        'nonint_idx'.
+    nonint_idx (int*): Concatenated sorted arrays of atomic indices without
+        nonbonded interactions with each atom.
   """
-  for torsion in torsions:
-    r12 = bond_graph[torsion.at1][torsion.at2]
-    r23 = bond_graph[torsion.at2][torsion.at3]
-    r34 = bond_graph[torsion.at3][torsion.at4]
-    c1 = atoms[torsion.at1].coords
-    c2 = atoms[torsion.at2].coords
-    c3 = atoms[torsion.at3].coords
-    c4 = atoms[torsion.at4].coords
-    torsion.t_ijkl = geomcalc.GetTijkl(c1, c2, c3, c4, r12, r23, r34)
-
-
-def UpdateOutofplanes(outofplanes, atoms, bond_graph):
-  """Update all outofplane angles [degrees] within a molecule object.
-  
+  pairs = GetNonintPairs(nonints, n_atoms)
+  nonint_indptr = numpy.zeros(n_atoms + 1, dtype=numpy.int64)
+  numpy.cumsum(numpy.bincount(pairs[:, 0], minlength=n_atoms),
+               out=nonint_indptr[1:])
+  nonint_idx = numpy.ascontiguousarray(pairs[:, 1])
+  return nonint_indptr, nonint_idx
+
+
+def GetVdwTypes(ro, sreps):
+  """Group atoms by vdw parameters and tabulate pair vdw coefficients.
+
+  Atoms with identical vdw parameters share a vdw type, so the combined pair
+  parameters need only be computed once for each pair of types, as
+  lj_a[t_i][t_j] / r_ij^12 - lj_b[t_i][t_j] / r_ij^6.
+
   Args:
-    outofplanes (mmlib.molecule.Outofplane*): Array of molecule's Outofplane
-        objects.
-    atoms (mmlib.molecule.Atom*): Array of molecule's Atom objects.
-    bond_graph (int:(int:float)): Dictionary of bond connectivity.
+    ro (float*): Array of atomic vdw radii [Angstrom].
+    sreps (float*): Array of square roots of atomic vdw epsilons
+        [(kcal/mol)^0.5].
+
+  Returns:
+    attype_id (int*): Array of atomic vdw type indices.
+    lj_a (float**): TxT array of repulsive vdw coefficients
+        [kcal*A^12/mol] for each pair of vdw types.
+    lj_b (float**): TxT array of attractive vdw coefficients
+        [kcal*A^6/mol] for each pair of vdw types.
+  """
+  vdw_params = numpy.column_stack((ro, sreps))
+  type_params, attype_id = numpy.unique(
+      vdw_params, axis=0, return_inverse=True)
+  attype_id = attype_id.reshape(-1).astype(numpy.int32)
+  eps_ij = numpy.outer(type_params[:, 1], type_params[:, 1])
+  ro6_ij = numpy.add.outer(type_params[:, 0], type_params[:, 0])**6
+  lj_a = eps_ij * ro6_ij**2
+  lj_b = 2.0 * eps_ij * ro6_ij
+  return attype_id, lj_a, lj_b
+
+
+def _GetIndexArray(objects, attrs):
+  """Gather atomic indices of bonded objects into an integer array.
+
+  Args:
+    objects (object*): Array of Bond, Angle, Torsion, or Outofplane objects.
+    attrs (str*): Names of atomic index attributes of objects.
+
+  Returns:
+    idx (int**): MxK array of K atomic indices of M objects.
+  """
+  idx = [[getattr(obj, attr) for attr in attrs] for obj in objects]
+  return numpy.array(idx, dtype=numpy.int64).reshape(len(objects), len(attrs))
+
+
+def _GetParamArray(objects, attr):
+  """Gather a parameter of bonded objects into a float array."""
+  return numpy.array([getattr(obj, attr) for obj in objects], dtype=float)
+
+
+def GetBondArrays(bonds):
+  """Gather atomic indices and parameters of bonds into arrays.
+
+  Args:
+    bonds (mmlib.molecule.Bond*): Array of Bond objects.
+
+  Returns:
+    bond_idx (int**): Mx2 array of bonded atomic indices.
+    k_b (float*): Array of bond spring constants [kcal/(mol*A^2)].
+    r_eq (float*): Array of equilibrium bond lengths [Angstrom].
+  """
+  return (_GetIndexArray(bonds, ('at1', 'at2')),
+          _GetParamArray(bonds, 'k_b'), _GetParamArray(bonds, 'r_eq'))
+
+
+def GetAngleArrays(angles):
+  """Gather atomic indices and parameters of bond angles into arrays.
+
+  Args:
+    angles (mmlib.molecule.Angle*): Array of Angle objects.
+
+  Returns:
+    angle_idx (int**): Mx3 array of angle atomic indices.
+    k_a (float*): Array of angle spring constants [kcal/(mol*rad^2)].
+    a_eq (float*): Array of equilibrium bond angles [degrees].
+  """
+  return (_GetIndexArray(angles, ('at1', 'at2', 'at3')),
+          _GetParamArray(angles, 'k_a'), _GetParamArray(angles, 'a_eq'))
+
+
+def GetTorsionArrays(torsions):
+  """Gather atomic indices and parameters of torsions into arrays.
+
+  Args:
+    torsions (mmlib.molecule.Torsion*): Array of Torsion objects.
+
+  Returns:
+    torsion_idx (int**): Mx4 array of torsion atomic indices.
+    v_n (float*): Array of torsion half-barrier heights [kcal/mol].
+    gam (float*): Array of torsion barrier offsets [degrees].
+    n (float*): Array of torsion barrier frequencies.
+    paths (float*): Array of unique paths through torsions.
+  """
+  return (_GetIndexArray(torsions, ('at1', 'at2', 'at3', 'at4')),
+          _GetParamArray(torsions, 'v_n'), _GetParamArray(torsions, 'gam'),
+          _GetParamArray(torsions, 'n'), _GetParamArray(torsions, 'paths'))
+
+
+def GetOutofplaneArrays(outofplanes):
+  """Gather atomic indices and parameters of outofplanes into arrays.
+
+  Args:
+    outofplanes (mmlib.molecule.Outofplane*): Array of Outofplane objects.
+
+  Returns:
+    outofplane_idx (int**): Mx4 array of outofplane atomic indices.
+    v_n (float*): Array of outofplane half-barrier heights [kcal/mol].
   """
-  for outofplane in outofplanes:
-    r31 = bond_graph[outofplane.at3][outofplane.at1]
-    r32 = bond_graph[outofplane.at3][outofplane.at2]
-    r34 = bond_graph[outofplane.at3][outofplane.at4]
-    c1 = atoms[outofplane.at1].coords
-    c2 = atoms[outofplane.at2].coords
-    c3 = atoms[outofplane.at3].coords
-    c4 = atoms[outofplane.at4].coords
-    outofplane.o_ijkl = geomcalc.GetOijkl(c1, c2, c3, c4, r31, r32, r34)
+  return (_GetIndexArray(outofplanes, ('at1', 'at2', 'at3', 'at4')),
+          _GetParamArray(outofplanes, 'v_n'))
@@ -1,15 +1,154 @@
-"""Classes and functions for unit tetsing the mmlib molecule module."""
+"""Classes and functions for unit testing the mmlib topology module."""
 
+import numpy
 import unittest
+from unittest import mock
 
-class Test(unittest.TestCase):
-  """Unit tests for mmlib. method."""
+from mmlib import energy
+from mmlib import topology
+
+class TestGetBondGraph(unittest.TestCase):
+  """Unit tests for mmlib.topology.GetBondGraph method."""
+
+  def setUp(self):
+    self.coords = numpy.array([[0.0, 0.0, 0.0], [0.0, 0.0, 0.96],
+                               [0.93, 0.0, -0.24], [3.0, 0.0, 0.0]])
+    self.covrad = numpy.array([0.73, 0.32, 0.32, 0.32])
+
+  def testNoAtoms(self):
+    """Asserts empty bond graph for no atoms."""
+    bond_graph = topology.GetBondGraph(numpy.zeros((0, 3)), numpy.zeros(0))
+    self.assertEqual(bond_graph, {})
+
+  def testBondedPairs(self):
+    """Asserts bonds only between atoms within bond threshold."""
+    bond_graph = topology.GetBondGraph(self.coords, self.covrad)
+    self.assertEqual(sorted(bond_graph[0]), [1, 2])
+    self.assertEqual(list(bond_graph[1]), [0])
+    self.assertEqual(list(bond_graph[2]), [0])
+    self.assertEqual(bond_graph[3], {})
+    self.assertAlmostEqual(bond_graph[0][1], 0.96)
+    self.assertAlmostEqual(bond_graph[2][0], (0.93**2 + 0.24**2)**0.5)
+
+  def testBlockedSearch(self):
+    """Asserts same bond graph when atoms span several search blocks."""
+    ref_graph = topology.GetBondGraph(self.coords, self.covrad)
+    rows = topology._BOND_SEARCH_ROWS
+    try:
+      topology._BOND_SEARCH_ROWS = 3
+      test_graph = topology.GetBondGraph(self.coords, self.covrad)
+    finally:
+      topology._BOND_SEARCH_ROWS = rows
+    self.assertEqual(test_graph, ref_graph)
+
+
+class TestGetNonintPairs(unittest.TestCase):
+  """Unit tests for mmlib.topology.GetNonintPairs method."""
+
+  def testNoNonints(self):
+    """Asserts only self pairs without non-interacting pairs."""
+    pairs = topology.GetNonintPairs(set(), 3)
+    self.assertEqual(pairs.tolist(), [[0, 0], [1, 1], [2, 2]])
+
+  def testSortedPairs(self):
+    """Asserts non-interacting and self pairs sorted by atomic indices."""
+    nonints = set([(2, 0), (0, 2), (1, 2), (2, 1)])
+    pairs = topology.GetNonintPairs(nonints, 3)
+    self.assertEqual(pairs.tolist(), [[0, 0], [0, 2], [1, 1], [1, 2], [2, 0],
+                                      [2, 1], [2, 2]])
+
+
+class TestGetNeighborPairs(unittest.TestCase):
+  """Unit tests for mmlib.topology.GetNeighborPairs method."""
+
+  def setUp(self):
+    self.coords = numpy.array([[0.0, 0.0, 0.0], [1.0, 0.0, 0.0],
+                               [0.0, 2.0, 0.0], [5.0, 0.0, 0.0]])
+
+  def testPairsWithinRadius(self):
+    """Asserts sorted pairs only between atoms within list radius."""
+    nonint_indptr, nonint_idx = topology.GetNonintLists(set(), 4)
+    pairs = topology.GetNeighborPairs(self.coords, 2.5, nonint_indptr,
+                                      nonint_idx)
+    self.assertEqual(pairs.tolist(), [[0, 1], [0, 2], [1, 2]])
+
+  def testExcludedPairs(self):
+    """Asserts no pairs between non-interacting atoms."""
+    nonints = set([(0, 1), (1, 0)])
+    nonint_indptr, nonint_idx = topology.GetNonintLists(nonints, 4)
+    pairs = topology.GetNeighborPairs(self.coords, 2.5, nonint_indptr,
+                                      nonint_idx)
+    self.assertEqual(pairs.tolist(), [[0, 2], [1, 2]])
+
+  @unittest.skipIf(topology.spatial is None, 'scipy is not installed')
+  def testKDTreeSearch(self):
+    """Asserts same pairs from k-d tree search as from dense search."""
+    n_atoms = 2 * topology._BOND_SEARCH_ROWS + 7
+    coords = 10.0 * numpy.random.RandomState(0).rand(n_atoms, 3)
+    nonint_indptr, nonint_idx = topology.GetNonintLists(set(), n_atoms)
+    dense_pairs = topology.GetNeighborPairs(coords, 2.0, nonint_indptr,
+                                            nonint_idx)
+    with mock.patch.object(topology, '_KDTREE_MIN_ATOMS', 0):
+      tree_pairs = topology.GetNeighborPairs(coords, 2.0, nonint_indptr,
+                                             nonint_idx)
+    self.assertGreater(len(dense_pairs), 0)
+    self.assertEqual(tree_pairs.tolist(), dense_pairs.tolist())
+
+
+class TestGetNonintLists(unittest.TestCase):
+  """Unit tests for mmlib.topology.GetNonintLists method."""
+
+  def testSortedRows(self):
+    """Asserts sorted rows of excluded atoms, including self pairs."""
+    nonints = set([(0, 2), (2, 0), (1, 2), (2, 1)])
+    nonint_indptr, nonint_idx = topology.GetNonintLists(nonints, 4)
+    self.assertEqual(list(nonint_indptr), [0, 2, 4, 7, 8])
+    self.assertEqual(list(nonint_idx), [0, 2, 1, 2, 0, 1, 2, 3])
+
+
+class TestGetNonintMask(unittest.TestCase):
+  """Unit tests for mmlib.topology.GetNonintMask method."""
+
+  def testSymmetricMask(self):
+    """Asserts mask marks non-interacting pairs and self pairs."""
+    nonint_mask = topology.GetNonintMask(set([(0, 2), (2, 0)]), 3)
+    self.assertEqual(nonint_mask.tolist(), [[True, False, True],
+                                            [False, True, False],
+                                            [True, False, True]])
+
+
+class TestGetVdwTypes(unittest.TestCase):
+  """Unit tests for mmlib.topology.GetVdwTypes method."""
+
+  def testSharedTypes(self):
+    """Asserts atoms with identical vdw parameters share a vdw type."""
+    ro = numpy.array([1.2, 1.5, 1.2])
+    sreps = numpy.array([0.5, 0.4, 0.5])
+    attype_id, lj_a, lj_b = topology.GetVdwTypes(ro, sreps)
+    self.assertEqual(attype_id[0], attype_id[2])
+    self.assertNotEqual(attype_id[0], attype_id[1])
+    self.assertEqual(lj_a.shape, (2, 2))
+
+  def testPairCoefficients(self):
+    """Asserts pair coefficients reproduce pair vdw energy."""
+    ro = numpy.array([1.2, 1.5])
+    sreps = numpy.array([0.5, 0.4])
+    attype_id, lj_a, lj_b = topology.GetVdwTypes(ro, sreps)
+    t_i, t_j = attype_id
+    r_ij = 3.1
+    self.assertAlmostEqual(lj_a[t_i][t_j]/r_ij**12 - lj_b[t_i][t_j]/r_ij**6,
+                           energy.GetEVdwIJ(r_ij, 0.2, 2.7))
 
 
 def suite():
-  """Builds a test suite of all unit test in _test module."""
+  """Builds a test suite of all unit tests in topology_test module."""
   test_classes = (
-    Test)
+      TestGetBondGraph,
+      TestGetNonintPairs,
+      TestGetNeighborPairs,
+      TestGetNonintLists,
+      TestGetNonintMask,
+      TestGetVdwTypes)
 
   suite = unittest.TestSuite()
   for test_class in test_classes: